@@ -0,0 +1,56 @@
+"""
+Benchmark extract_mcqs over the raw-output fixtures.
+
+The fixtures are synthetic: hand-written to cover the output formats the parser handles
+(preambles, numbering variants, markdown, truncation), not captured model output.
+
+Run from the MCQ service root:
+    python -m benchmarks.bench_extract_mcqs --repeat 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.text_extraction import extract_mcqs
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "synthetic_mcq_outputs.json")
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_benchmark(corpus, repeat):
+    """Parse every corpus entry `repeat` times; return timing and correctness stats."""
+    mismatches = [c["name"] for c in corpus if extract_mcqs(c["prompt"], c["raw_output"]) != c["expected"]]
+
+    total_lines = sum(len(c["raw_output"].splitlines()) for c in corpus) * repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for case in corpus:
+            extract_mcqs(case["prompt"], case["raw_output"])
+    elapsed = time.perf_counter() - started
+
+    parses = len(corpus) * repeat
+    return {
+        "parses": parses,
+        "seconds": round(elapsed, 4),
+        "us_per_parse": round(elapsed / parses * 1e6, 2),
+        "lines_per_sec": round(total_lines / elapsed),
+        "mismatches": mismatches,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the MCQ output parser.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    result = run_benchmark(load_corpus(), args.repeat)
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if result["mismatches"] else 0)
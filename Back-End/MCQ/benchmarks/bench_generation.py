@@ -0,0 +1,337 @@
+"""
+Offline throughput benchmark for MCQ generation.
+
+Everything external is replaced by deterministic stand-ins, so runs are repeatable
+and need no GPU, model files, API keys or MongoDB:
+    llm        replays the synthetic, hand-written outputs in
+               tests/fixtures/synthetic_mcq_outputs.json as a token stream
+               (one llama context, so calls are serialized like the real model)
+    encoder    hashed unit vectors instead of SentenceTransformer
+    Gemini     answers the verifier and the fallback from the same fixtures
+    MongoDB    mongomock, seeded with benchmark users
+Latencies of the stand-ins are configurable to model the real services.
+
+Run from the MCQ service root, with requirements-dev.txt installed:
+    python -m benchmarks.bench_generation --workload quiz --concurrency 1 2 4 --output bench.json
+    python -m benchmarks.bench_generation --compare bench.json   # exit 1 on regression
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import mongomock
+import numpy as np
+import pandas as pd
+from bson import ObjectId
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+#  The app modules read these at import; the values are never used against real services
+os.environ.setdefault("MONGO_URI", "mongodb://benchmark.invalid")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+#  In-memory Mongo must be in place before database.database creates its client
+with patch("pymongo.MongoClient", mongomock.MongoClient):
+    from database import database
+
+import faiss
+import utils.generate_question as gq
+import utils.verification as verification
+import routes.adaptive_quiz_routes as adaptive_routes
+from utils.model_loader import registry, current_rss_mb
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "synthetic_mcq_outputs.json")
+BANK_PATH = os.path.join(os.path.dirname(__file__), "..", "dataset", "merged_mcq_dataset.csv")
+EMBEDDING_DIM = 384
+WORKLOADS = ("generate_mcq", "quiz")
+# Relative change beyond which --compare reports a regression
+DEFAULT_TOLERANCE = 0.10
+
+
+class StubEncoder:
+    """Deterministic stand-in for SentenceTransformer: one unit vector per distinct text."""
+
+    def __init__(self, dim=EMBEDDING_DIM, latency=0.0):
+        self.dim = dim
+        self.latency = latency
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        if self.latency:
+            time.sleep(self.latency * len(texts))
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.sha1(str(text).encode("utf-8")).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dim)
+            vectors[row] = vector / np.linalg.norm(vector)
+        return vectors
+
+
+class ReplayLLM:
+    """
+    Replays the synthetic raw-output fixtures round-robin. Each replay gets a unique suffix on its
+    question texts, so repeated replays are not rejected as duplicates of earlier ones.
+    """
+
+    def __init__(self, corpus, prompt_latency=0.0, token_latency=0.0):
+        self.corpus = corpus
+        self.prompt_latency = prompt_latency
+        self.token_latency = token_latency
+        self._serial = itertools.count()
+        self._lock = threading.Lock()  # one llama context: calls run one at a time
+
+    def tokenize(self, text):
+        return [0] * max(1, len(text) // 4)
+
+    def next_output(self):
+        serial = next(self._serial)
+        case = self.corpus[serial % len(self.corpus)]
+        raw = case["raw_output"]
+        for mcq in case["expected"]:
+            question = mcq.get("question", "")
+            if question:
+                raw = raw.replace(question, f"{question} (set {serial})", 1)
+        return raw
+
+    def _tokens(self):
+        with self._lock:
+            raw = self.next_output()
+            if self.prompt_latency:
+                time.sleep(self.prompt_latency)
+            for token in re.findall(r"\S+\s*|\s+", raw):
+                if self.token_latency:
+                    time.sleep(self.token_latency)
+                yield token
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        if stream:
+            return ({"choices": [{"text": token}]} for token in self._tokens())
+        return {"choices": [{"text": "".join(self._tokens())}]}
+
+
+class FakeGemini:
+    """Answers verification prompts with a hash-chosen letter and fallback prompts with a replay."""
+
+    def __init__(self, llm, latency=0.0):
+        self.llm = llm
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        if "Just reply with a single letter" in prompt:
+            text = "ABCDE"[hashlib.sha1(prompt.encode("utf-8")).digest()[0] % 5]
+        else:
+            text = self.llm.next_output()
+        return type("FakeResponse", (), {"text": text})()
+
+
+def load_corpus(path=FIXTURES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_question_bank(encoder, path=BANK_PATH, size=None, clusters=10):
+    """The question dataset and a FAISS index over its stub embeddings."""
+    bank = pd.read_csv(path, encoding="latin1").dropna(subset=["Question Text"])
+    if size:
+        bank = bank.head(size)
+    bank = bank.reset_index(drop=True)
+    bank["Cluster"] = bank.index % clusters
+    index = faiss.IndexFlatL2(encoder.dim)
+    index.add(encoder.encode(bank["Question Text"].tolist()))
+    return bank, index
+
+
+def seed_users(count):
+    user_ids = [str(ObjectId()) for _ in range(count)]
+    database.users_collection.insert_many([
+        {"_id": ObjectId(user_id), "username": f"bench{i}", "performance": {"total_quizzes": 0, "last_10_quizzes": []}}
+        for i, user_id in enumerate(user_ids)
+    ])
+    return user_ids
+
+
+def install_stubs(args):
+    """Swap the models, Gemini and the background verifier; returns the patches to stop later."""
+    corpus = load_corpus()
+    encoder = StubEncoder(latency=args.encode_latency)
+    llm = ReplayLLM(corpus, prompt_latency=args.prompt_latency, token_latency=args.token_latency)
+    gemini = FakeGemini(llm, latency=args.gemini_latency)
+    bank, index = load_question_bank(encoder, size=args.bank_size)
+
+    registry.provide("embedding_model", encoder)
+    registry.provide("llm", llm)
+    registry.provide("question_index", index)
+    registry.provide("question_dataset", bank)
+
+    patches = [
+        patch.object(verification, "model", gemini),
+        patch.object(gq, "generate_mcq_with_gemini", lambda prompt: gemini.generate_content(prompt).text),
+        #  The real background verifier sleeps between Gemini calls; it is not part of request latency
+        patch.object(adaptive_routes, "verify_quiz_answers_async", lambda quiz_id: None),
+    ]
+    for p in patches:
+        p.start()
+    return patches
+
+
+def counter_total(metric, **fixed):
+    """Sum of a counter over every label combination matching `fixed`."""
+    return sum(value for labels, value in metric.samples() if all(labels[k] == v for k, v in fixed.items()))
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def run_level(workload, concurrency, requests, user_ids, question_count):
+    """Run `requests` generation tasks on `concurrency` threads; return one result row."""
+    generator = "standard" if workload == "generate_mcq" else "adaptive"
+    calls = itertools.count()
+    real_generator = adaptive_routes.generate_mcq_based_on_performance
+
+    def counted_generator(*args, **kwargs):
+        next(calls)
+        return real_generator(*args, **kwargs)
+
+    def task(i):
+        user_id = user_ids[i % len(user_ids)]
+        started = time.perf_counter()
+        if workload == "generate_mcq":
+            next(calls)
+            questions = len(gq.generate_mcq("medium", user_id))
+        else:
+            user = database.users_collection.find_one({"_id": ObjectId(user_id)})
+            questions = adaptive_routes.generate_next_quiz(user_id, question_count, user)["total_questions"]
+        return time.perf_counter() - started, questions
+
+    attempts_before = counter_total(gq.generation_attempts_total, generator=generator)
+    accepted_before = counter_total(gq.questions_accepted_total)
+    with patch.object(adaptive_routes, "generate_mcq_based_on_performance", counted_generator):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(task, range(requests)))
+        wall = time.perf_counter() - started
+
+    latencies = [seconds for seconds, _ in outcomes]
+    questions = sum(count for _, count in outcomes)
+    accepted = counter_total(gq.questions_accepted_total) - accepted_before
+    attempts = counter_total(gq.generation_attempts_total, generator=generator) - attempts_before
+    retries = attempts - next(calls)  # every generator call makes at least one attempt
+    return {
+        "workload": workload,
+        "concurrency": concurrency,
+        "requests": requests,
+        "questions": questions,
+        "accepted_generated": accepted,
+        "questions_per_sec": round(questions / wall, 3) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1e3, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1e3, 2),
+        "retries_per_accepted": round(retries / accepted, 3) if accepted else None,
+        "peak_rss_mb": round(peak_rss_mb() or 0, 1),
+        "wall_seconds": round(wall, 3),
+    }
+
+
+def peak_rss_mb():
+    try:
+        import resource  # Not available on Windows
+    except ImportError:
+        return current_rss_mb()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Rows present in both runs, with relative changes; `regressed` marks throughput or p95 drops."""
+    previous = {(r["workload"], r["concurrency"]): r for r in baseline["results"]}
+    rows = []
+    for row in current["results"]:
+        before = previous.get((row["workload"], row["concurrency"]))
+        if not before:
+            continue
+        qps_change = (row["questions_per_sec"] - before["questions_per_sec"]) / (before["questions_per_sec"] or 1)
+        p95_change = (row["p95_ms"] - before["p95_ms"]) / (before["p95_ms"] or 1)
+        rows.append({
+            "workload": row["workload"],
+            "concurrency": row["concurrency"],
+            "questions_per_sec_change": round(qps_change, 4),
+            "p95_change": round(p95_change, 4),
+            "regressed": qps_change < -tolerance or p95_change > tolerance,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MCQ generation with stub models.")
+    parser.add_argument("--workload", choices=WORKLOADS + ("all",), default="all")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--requests", type=int, default=16, help="Tasks per concurrency level")
+    parser.add_argument("--question-count", type=int, default=10, help="Questions per adaptive quiz")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--bank-size", type=int, default=None, help="Rows of the question bank to index")
+    parser.add_argument("--prompt-latency", type=float, default=0.0, help="Stub llm seconds per prompt")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Stub llm seconds per token")
+    parser.add_argument("--encode-latency", type=float, default=0.0, help="Stub encoder seconds per text")
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="Fake Gemini seconds per call")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    install_stubs(args)
+    user_ids = seed_users(args.users)
+    workloads = WORKLOADS if args.workload == "all" else (args.workload,)
+
+    results = [
+        run_level(workload, concurrency, args.requests, user_ids, args.question_count)
+        for workload in workloads
+        for concurrency in args.concurrency
+    ]
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": results,
+    }
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            rows = compare(report, json.load(f), args.tolerance)
+        print(json.dumps(rows, indent=2))
+        return 1 if any(row["regressed"] for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
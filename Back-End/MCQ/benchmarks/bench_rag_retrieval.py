@@ -0,0 +1,92 @@
+"""
+Recall versus latency of the RAG index types against the exact flat baseline.
+
+Queries are perturbed copies of the stored passage vectors, so no encoder model is
+needed; --scale grows the corpus with synthetic neighbours to preview larger syllabi.
+
+Run from the MCQ service root:
+    python -m benchmarks.bench_rag_retrieval --queries 200 --scale 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+import faiss
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.embedding_pipeline import RAG_INDEX_PATH
+from utils.explanation.rag_index import build_index, index_vectors
+
+CONFIGS = (
+    [("flat", {})]
+    + [("hnsw", {"ef_search": ef}) for ef in (16, 32, 64, 128)]
+    + [("ivf", {"nprobe": nprobe}) for nprobe in (1, 2, 4, 8, 16)]
+)
+
+
+def _normalize(matrix):
+    return (matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)).astype(np.float32)
+
+
+def load_vectors(path=RAG_INDEX_PATH, scale=1, noise=0.05, seed=0):
+    vectors = index_vectors(faiss.read_index(path))
+    if scale > 1:
+        rng = np.random.default_rng(seed)
+        copies = [vectors] + [
+            _normalize(vectors + rng.normal(scale=noise, size=vectors.shape)) for _ in range(scale - 1)
+        ]
+        vectors = np.vstack(copies)
+    return vectors
+
+
+def make_queries(vectors, count, noise=0.1, seed=1):
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(vectors), count, replace=count > len(vectors))
+    return _normalize(vectors[picks] + rng.normal(scale=noise, size=(count, vectors.shape[1])))
+
+
+def run_benchmark(vectors, queries, top_k=3):
+    """Recall@k against exact search, per-query and batched latency for every config."""
+    exact = build_index(vectors, "flat")
+    _, truth = exact.search(queries, top_k)
+
+    results = []
+    for index_type, params in CONFIGS:
+        started = time.perf_counter()
+        index = build_index(vectors, index_type, **params)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for query in queries:
+            index.search(query[None, :], top_k)
+        single = (time.perf_counter() - started) / len(queries)
+
+        started = time.perf_counter()
+        _, found = index.search(queries, top_k)
+        batched = time.perf_counter() - started
+
+        recall = np.mean([len(set(f) & set(t)) / top_k for f, t in zip(found, truth)])
+        results.append({
+            "index": index_type,
+            **params,
+            f"recall@{top_k}": round(float(recall), 4),
+            "us_per_query": round(single * 1e6, 1),
+            "us_per_query_batched": round(batched / len(queries) * 1e6, 1),
+            "build_ms": round(build_seconds * 1e3, 1),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark RAG index types.")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the corpus with synthetic neighbours")
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_vectors(scale=args.scale)
+    print(f"{len(corpus)} passages, {args.queries} queries")
+    print(json.dumps(run_benchmark(corpus, make_queries(corpus, args.queries), args.top_k), indent=2))
@@ -0,0 +1,31 @@
+"""
+Async MongoDB access for cheap, read-heavy routes.
+
+Uses PyMongo's native asyncio client, so `async def` handlers await their reads on the
+event loop instead of holding a threadpool slot; the threadpool stays free for model
+work. Pool settings come from the same MONGO_* variables as the sync client.
+"""
+from pymongo import AsyncMongoClient
+from database.database import MONGO_URI, DATABASE_NAME, MONGO_POOL_OPTIONS
+
+_client = None
+
+
+def get_async_client():
+    """The shared async client, created on first use inside the running event loop."""
+    global _client
+    if _client is None:
+        _client = AsyncMongoClient(MONGO_URI, serverSelectionTimeoutMS=5000, **MONGO_POOL_OPTIONS)
+    return _client
+
+
+def async_collection(name):
+    """Async handle on a collection of the application database."""
+    return get_async_client().get_database(DATABASE_NAME)[name]
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -13,16 +13,31 @@ MONGO_URI = os.getenv("MONGO_URI")
 if not MONGO_URI:
     raise ValueError("MONGO_URI is not set in the .env file!")
 
+DATABASE_NAME = "mcq_quiz_platform"
+
+# Connection pool settings, shared with the async client; unset variables keep the driver defaults
+POOL_ENV_VARS = {
+    "maxPoolSize": "MONGO_MAX_POOL_SIZE",
+    "minPoolSize": "MONGO_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGO_MAX_IDLE_TIME_MS",
+    "waitQueueTimeoutMS": "MONGO_WAIT_QUEUE_TIMEOUT_MS",
+}
+MONGO_POOL_OPTIONS = {option: int(os.environ[var]) for option, var in POOL_ENV_VARS.items() if os.getenv(var)}
+
 # Connect to MongoDB Atlas with retry mechanism
 while True:
     try:
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-        db = client.get_database("mcq_quiz_platform")  # Update database name if needed
+        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000, **MONGO_POOL_OPTIONS)
+        db = client.get_database(DATABASE_NAME)  # Update database name if needed
         users_collection = db["users"]
         quizzes_collection = db["quizzes"]
         responses_collection = db["user_responses"]
         unit_quizzes = db["unit_quizzes"]
         unit_quiz_responses = db["unit_quiz_responses"]
+        fallback_questions = db["fallback_questions"]
+        unit_seen_questions = db["unit_seen_questions"]
+        explanation_cache_collection = db["explanation_cache"]
+        questions_collection = db["questions"]
         print(" Connected to MongoDB Atlas")
         break
     except ConnectionFailure as e:
@@ -0,0 +1,178 @@
+import logging
+import time
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Collection that records which index migration version has been applied
+MIGRATIONS_COLLECTION = "schema_migrations"
+MIGRATION_ID = "mcq_indexes"
+
+# Ordered list of index migrations. Append new versions, never edit applied ones.
+# Each index is (collection name, key spec, create_index options).
+INDEX_MIGRATIONS = [
+    {
+        "version": 1,
+        "description": "Indexes for hot quiz, response, unit quiz and user lookups",
+        "indexes": [
+            ("quizzes", [("quiz_id", ASCENDING)], {"name": "quiz_id_1"}),
+            (
+                "quizzes",
+                [("user_id", ASCENDING), ("created_at", DESCENDING)],
+                {"name": "user_id_1_created_at_-1"},
+            ),
+            (
+                "user_responses",
+                [("user_id", ASCENDING), ("quiz_id", ASCENDING), ("attempt_number", ASCENDING)],
+                {"name": "user_id_1_quiz_id_1_attempt_number_1"},
+            ),
+            (
+                "unit_quiz_responses",
+                [("user_id", ASCENDING), ("unit_name", ASCENDING)],
+                {"name": "user_id_1_unit_name_1"},
+            ),
+            (
+                "users",
+                [("performance.total_quizzes", ASCENDING)],
+                {"name": "performance.total_quizzes_1"},
+            ),
+        ],
+    },
+    {
+        "version": 2,
+        "description": "Serve recent-submission lookups for the IRT difficulty distribution",
+        "indexes": [
+            (
+                "user_responses",
+                [("user_id", ASCENDING), ("submitted_at", DESCENDING)],
+                {"name": "user_id_1_submitted_at_-1"},
+            ),
+        ],
+    },
+    {
+        "version": 3,
+        "description": "Fallback question pool keyed by content hash, sampled by difficulty/cluster",
+        "indexes": [
+            (
+                "fallback_questions",
+                [("question_hash", ASCENDING)],
+                {"name": "question_hash_1", "unique": True},
+            ),
+            (
+                "fallback_questions",
+                [("difficulty", ASCENDING), ("rand", ASCENDING)],
+                {"name": "difficulty_1_rand_1"},
+            ),
+            (
+                "fallback_questions",
+                [("difficulty", ASCENDING), ("cluster", ASCENDING), ("rand", ASCENDING)],
+                {"name": "difficulty_1_cluster_1_rand_1"},
+            ),
+        ],
+    },
+    {
+        "version": 4,
+        "description": "One seen-question id set per user and unit",
+        "indexes": [
+            (
+                "unit_seen_questions",
+                [("user_id", ASCENDING), ("unit_name", ASCENDING)],
+                {"name": "user_id_1_unit_name_1", "unique": True},
+            ),
+        ],
+    },
+    {
+        "version": 5,
+        "description": "Expire cached explanations (documents are keyed by content hash in _id)",
+        "indexes": [
+            (
+                "explanation_cache",
+                [("expires_at", ASCENDING)],
+                {"name": "expires_at_1", "expireAfterSeconds": 0},
+            ),
+        ],
+    },
+]
+
+LATEST_INDEX_VERSION = INDEX_MIGRATIONS[-1]["version"]
+
+
+def get_applied_index_version(db):
+    """Return the index migration version recorded in the database (0 if none)."""
+    record = db[MIGRATIONS_COLLECTION].find_one({"_id": MIGRATION_ID})
+    return record.get("version", 0) if record else 0
+
+
+def apply_index_migrations(db, force=False):
+    """
+    Create any indexes from migrations newer than the applied version.
+    Safe to call on every startup: `create_index` is a no-op for existing indexes,
+    and builds are requested in the background so collections stay writable.
+    Returns the version the database is at afterwards.
+    """
+    applied_version = 0 if force else get_applied_index_version(db)
+    pending = [m for m in INDEX_MIGRATIONS if m["version"] > applied_version]
+
+    if not pending:
+        logging.info(f"🗂 Index migrations up to date (version {applied_version}).")
+        return applied_version
+
+    for migration in pending:
+        logging.info(
+            f"🗂 Applying index migration {migration['version']}: {migration['description']}"
+        )
+        started = time.time()
+        for collection_name, keys, options in migration["indexes"]:
+            db[collection_name].create_index(keys, background=True, **options)
+
+        db[MIGRATIONS_COLLECTION].update_one(
+            {"_id": MIGRATION_ID},
+            {"$set": {"version": migration["version"], "applied_at": time.time()}},
+            upsert=True,
+        )
+        logging.info(
+            f"✅ Index migration {migration['version']} applied in {time.time() - started:.2f}s"
+        )
+
+    return pending[-1]["version"]
+
+
+def report_index_usage(db):
+    """
+    Collect `$indexStats` for every collection managed by the migrations.
+    Returns {collection: [{"name", "key", "ops", "since"}]} and logs a summary line per index.
+    """
+    collections = sorted({name for m in INDEX_MIGRATIONS for name, _, _ in m["indexes"]})
+    usage = {}
+
+    for collection_name in collections:
+        try:
+            stats = list(db[collection_name].aggregate([{"$indexStats": {}}]))
+        except PyMongoError as e:
+            logging.warning(f"⚠ Could not read index stats for {collection_name}: {e}")
+            continue
+
+        usage[collection_name] = [
+            {
+                "name": s["name"],
+                "key": dict(s.get("key", {})),
+                "ops": s.get("accesses", {}).get("ops", 0),
+                "since": s.get("accesses", {}).get("since"),
+            }
+            for s in stats
+        ]
+        for s in usage[collection_name]:
+            logging.info(f"📈 Index usage {collection_name}.{s['name']}: {s['ops']} ops")
+
+    return usage
+
+
+def bootstrap_indexes(db):
+    """Startup hook: apply pending migrations and log index usage without raising."""
+    try:
+        apply_index_migrations(db)
+        report_index_usage(db)
+    except PyMongoError as e:
+        logging.error(f" Index bootstrap failed: {e}")
@@ -1,11 +1,36 @@
+"""
+Tags every question in merged_mcq_dataset.csv with its closest syllabus unit.
+
+Questions are encoded in batches (reusing cached embeddings from the unit
+embedding artifact), unit topics are encoded once, and a single (questions x topics)
+similarity matrix is reduced with a per-unit segment max.
+
+Run from the MCQ service root:
+    python dataset/unit-wise-dataset/tag_questions_with_units.py                # retag all rows
+    python dataset/unit-wise-dataset/tag_questions_with_units.py --incremental  # tag new rows only
+"""
+import os
+import sys
+import argparse
+import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer, util
 
-# Step 1: Load dataset
-dataset_path = "dataset/merged_mcq_dataset.csv"
-df = pd.read_csv(dataset_path, encoding="latin1").fillna("")
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT)
+
+from utils.embedding_pipeline import (
+    QUESTION_DATASET_PATH,
+    UNIT_DATASET_PATH,
+    UNIT_EMBEDDING_ARTIFACT,
+    encode_incremental,
+    encode_texts,
+    load_model,
+)
+from utils.embedding_store import save_embedding_artifact
+
+UNASSIGNED = "Unassigned"
 
-# Step 2: Define unit-topic mappings
+# Unit-topic mappings
 unit_topics = {
     "Unit 01": [
         "Introduction to Biology", "nature and scope", "organizational patterns", "challenges faced"
@@ -44,34 +69,68 @@ unit_topics = {
     ]
 }
 
-# Step 3: Load model and encode topics
-print("Loading sentence transformer model...")
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
-print("Encoding unit topics...")
-unit_embeddings = {
-    unit: model.encode(topics, convert_to_tensor=True) for unit, topics in unit_topics.items()
-}
+def encode_unit_topics(model, topics_by_unit=unit_topics):
+    """All unit topics as one normalized matrix, plus the start row of each unit's block."""
+    units = list(topics_by_unit)
+    topics = [topic for unit in units for topic in topics_by_unit[unit]]
+    offsets = np.cumsum([0] + [len(topics_by_unit[unit]) for unit in units[:-1]])
+    return encode_texts(model, topics, normalize=True), offsets, units
+
+
+def assign_units(question_matrix, topic_matrix, offsets, units):
+    """
+    Closest unit per question: max cosine similarity over each unit's topics
+    (np.maximum.reduceat over the topic axis), then argmax over units.
+    """
+    if len(question_matrix) == 0:
+        return np.array([], dtype=object)
+    scores = question_matrix @ topic_matrix.T
+    unit_scores = np.maximum.reduceat(scores, offsets, axis=1)
+    best = unit_scores.argmax(axis=1)
+    labels = np.asarray(units, dtype=object)[best]
+    labels[unit_scores[np.arange(len(best)), best] <= 0] = UNASSIGNED
+    return labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tag MCQ questions with syllabus units.")
+    parser.add_argument("--incremental", action="store_true", help="Keep existing tags; tag only new questions")
+    parser.add_argument("--full", action="store_true", help="Re-encode every question instead of reusing cached embeddings")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args(argv)
+    os.chdir(ROOT)
+
+    df = pd.read_csv(QUESTION_DATASET_PATH, encoding="latin1").fillna("")
+    texts = df["Question Text"].tolist()
+
+    print("Loading sentence transformer model...")
+    model = load_model()
+
+    print("Encoding questions...")
+    question_matrix, row_ids, _ = encode_incremental(
+        model, texts, UNIT_EMBEDDING_ARTIFACT, normalize=True,
+        batch_size=args.batch_size, processes=args.processes, full=args.full,
+    )
+
+    to_tag = np.ones(len(df), dtype=bool)
+    df["Assigned_Unit"] = UNASSIGNED
+    if args.incremental and os.path.exists(UNIT_DATASET_PATH):
+        previous = pd.read_csv(UNIT_DATASET_PATH).fillna("")
+        known = dict(zip(previous["Question Text"], previous["Assigned_Unit"]))
+        to_tag = ~df["Question Text"].isin(known).to_numpy()
+        df.loc[~to_tag, "Assigned_Unit"] = df.loc[~to_tag, "Question Text"].map(known)
+
+    print(f"Tagging {int(to_tag.sum())} questions with units...")
+    topic_matrix, offsets, units = encode_unit_topics(model)
+    df.loc[to_tag, "Assigned_Unit"] = assign_units(question_matrix[to_tag], topic_matrix, offsets, units)
+
+    df.to_csv(UNIT_DATASET_PATH, index=False)
+    # Keep the unit quiz embedding artifact in step with the retagged dataset
+    save_embedding_artifact(UNIT_EMBEDDING_ARTIFACT, question_matrix, row_ids, extra={"normalized": True})
+    print(f"✅ Dataset saved with units → {UNIT_DATASET_PATH}")
+
 
-# Step 4: Tag each question
-def assign_unit(question_text):
-    question_embedding = model.encode(question_text, convert_to_tensor=True)
-    max_score = 0
-    selected_unit = "Unassigned"
-    
-    for unit, embeddings in unit_embeddings.items():
-        cosine_scores = util.cos_sim(question_embedding, embeddings)
-        unit_score = cosine_scores.max().item()
-        if unit_score > max_score:
-            max_score = unit_score
-            selected_unit = unit
-    
-    return selected_unit
-
-print("Tagging questions with units...")
-df["Assigned_Unit"] = df["Question Text"].apply(assign_unit)
-
-# Step 5: Save updated dataset
-output_path = "dataset/unit_tagged_mcq_dataset.csv"
-df.to_csv(output_path, index=False)
-print(f"✅ Dataset saved with units → {output_path}")
+if __name__ == "__main__":
+    main(sys.argv[1:])
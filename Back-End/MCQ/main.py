@@ -1,10 +1,20 @@
+import os
+from threading import Thread
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from database.database import db
+from database.async_database import close_async_client
+from database.indexes import bootstrap_indexes
+from utils.fallback_pool import ensure_pool_seeded
 from routes.mcq_routes import router as mcq_router
 from routes.adaptive_quiz_routes import router as adaptive_quiz_router
 from routes.response_routes import router as response_router
 from routes.topic_based_quiz_routes import router as topic_router
 from routes.explanation_routes import router as explanation_router
+from routes.system_routes import router as system_router
+from utils.model_loader import registry
+from utils.metrics import render_prometheus, CONTENT_TYPE_LATEST
 
 app = FastAPI()
 
@@ -29,8 +39,34 @@ app.include_router(
 app.include_router(response_router, prefix="/responses", tags=["User Responses"])
 app.include_router(topic_router, prefix="/topic", tags=["Topic based quiz"])
 app.include_router(explanation_router, prefix="/explanations", tags=["MCQ Explanation"])
+app.include_router(system_router, prefix="/system", tags=["System"])
+
+
+def bootstrap_database():
+    bootstrap_indexes(db)
+    ensure_pool_seeded()
+    #  Models otherwise load on first use or via POST /system/warmup
+    if os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true":
+        registry.warmup()
+
+
+@app.on_event("startup")
+def build_indexes():
+    #  Run index migrations and pool seeding off the startup path so the API is available immediately
+    Thread(target=bootstrap_database, daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def close_database():
+    await close_async_client()
 
 
 @app.get("/")
 def home():
     return {"message": "Welcome to the FastAPI Backend"}
+
+
+#  Prometheus scrape target: generation stage timings, rejection reasons, verifier outcomes
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type=CONTENT_TYPE_LATEST)
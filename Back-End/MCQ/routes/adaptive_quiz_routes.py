@@ -3,8 +3,9 @@ import logging
 import time
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, Depends
-from utils.user_mgmt_methods import get_current_user
-from database.database import users_collection, quizzes_collection
+from utils.user_mgmt_methods import get_registered_user
+from database.database import quizzes_collection
+from utils.question_store import normalize_quiz
 from utils.quiz_generation_methods import fetch_questions_from_db, get_irt_based_difficulty_distribution, get_seen_questions
 from utils.generate_question import generate_mcq_based_on_performance
 import traceback
@@ -20,23 +21,12 @@ router = APIRouter()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 @router.get("/generate_adaptive_mcqs/{user_id}/{question_count}")
-def generate_next_quiz(user_id: str, question_count: int, current_user: str = Depends(get_current_user)):
+def generate_next_quiz(user_id: str, question_count: int, existing_user: dict = Depends(get_registered_user)):
     """Generate a new adaptive quiz based on user's previous performance."""
     try:
         logging.info(f"📝 Starting adaptive quiz generation for user {user_id} with {question_count} questions...")
         sys.stdout.flush()  # Force log flushing
 
-        existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-        if not existing_user:
-            logging.error("User not found")
-            sys.stdout.flush()
-            raise HTTPException(status_code=404, detail="User not found. Please register before generating a quiz.")
-        
-        if current_user != user_id:
-            logging.error("Unauthorized access")
-            sys.stdout.flush()
-            raise HTTPException(status_code=403, detail="Unauthorized access")
-
         difficulty_distribution = get_irt_based_difficulty_distribution(user_id, question_count)
         logging.info(f"📊 Difficulty distribution: {difficulty_distribution}")
         sys.stdout.flush()
@@ -50,6 +40,7 @@ def generate_next_quiz(user_id: str, question_count: int, current_user: str = De
 
         current_quiz_questions = set()
         mcqs = []
+        generated_counts = {}
 
         for difficulty, count in difficulty_distribution.items():
             generated = 0
@@ -92,12 +83,23 @@ def generate_next_quiz(user_id: str, question_count: int, current_user: str = De
                     if generated >= count:
                         break 
 
-        if len(mcqs) < question_count:
-            remaining_needed = question_count - len(mcqs)
-            logging.warning(f"⚠ Not enough questions generated. Fetching {remaining_needed} from DB.")
+            generated_counts[difficulty] = generated
+
+        #  Complete the quiz with on-level questions from the fallback pool
+        for difficulty, count in difficulty_distribution.items():
+            remaining_needed = count - generated_counts.get(difficulty, 0)
+            if remaining_needed <= 0:
+                continue
+            logging.warning(f"⚠ Not enough {difficulty} questions generated. Fetching {remaining_needed} from DB.")
             sys.stdout.flush()
 
-            db_questions = fetch_questions_from_db(remaining_needed)
+            db_questions = fetch_questions_from_db(
+                remaining_needed,
+                difficulty=difficulty,
+                user_id=user_id,
+                exclude_texts=current_quiz_questions,
+            )
+            current_quiz_questions.update(q["question_text"] for q in db_questions)
             mcqs.extend(db_questions)
 
         quiz_id = str(uuid.uuid4())
@@ -111,7 +113,7 @@ def generate_next_quiz(user_id: str, question_count: int, current_user: str = De
 
         logging.info("🛠️ Saving quiz to the database...")
         sys.stdout.flush()
-        quizzes_collection.insert_one(quiz_data)
+        quizzes_collection.insert_one(normalize_quiz(quiz_data))
         Thread(target=verify_quiz_answers_async, args=(quiz_id,)).start()
         
         logging.info(f" Quiz generated successfully! Quiz ID: {quiz_id}")
@@ -1,10 +1,22 @@
 # routes/explanation_routes.py
 
+import json
+import logging
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, List
 from utils.user_mgmt_methods import get_current_user
-from utils.explanation.explanation_helper import explain_mcq, verify_answer_by_generation, is_inappropriate, is_biology_question
+from utils.explanation.explanation_helper import (
+    explain_mcq,
+    verify_answer_by_generation,
+    is_inappropriate,
+    is_biology_question,
+    get_cached_explanation,
+    stream_explanation,
+    explain_mcq_batch,
+)
+from utils.explanation.review_gate import review_stats
 
 router = APIRouter()
 
@@ -12,6 +24,9 @@ class MCQExplainRequest(BaseModel):
     question: str
     options: Dict[str, str]
 
+class MCQExplainBatchRequest(BaseModel):
+    items: List[MCQExplainRequest]
+
 class MCQVerifyRequest(BaseModel):
     question: str
     options: Dict[str, str]
@@ -21,6 +36,10 @@ class MCQVerifyRequest(BaseModel):
 def explain_only(request: MCQExplainRequest):
     if is_inappropriate(request.question):
         raise HTTPException(status_code=400, detail="Question contains inappropriate or harmful content.")
+    #  Cached explanations already passed the biology check
+    cached = get_cached_explanation(request.question, request.options)
+    if cached is not None:
+        return cached
     if not is_biology_question(request.question):
         raise HTTPException(status_code=400, detail="Only biology-related questions are supported.")
     try:
@@ -28,13 +47,71 @@ def explain_only(request: MCQExplainRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/mcq/explain_stream")
+def explain_stream(request: MCQExplainRequest):
+    """Server-sent events: `token` events while the local model writes, then one `final` event."""
+    if is_inappropriate(request.question):
+        raise HTTPException(status_code=400, detail="Question contains inappropriate or harmful content.")
+    cached = get_cached_explanation(request.question, request.options)
+    if cached is None and not is_biology_question(request.question):
+        raise HTTPException(status_code=400, detail="Only biology-related questions are supported.")
+
+    def events():
+        try:
+            for event, payload in stream_explanation(request.question, request.options):
+                yield format_sse(event, {"text": payload} if event == "token" else payload)
+        except Exception as e:
+            logging.error(f" Explanation stream failed: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+MAX_BATCH_ITEMS = 50
+
+@router.post("/mcq/explain_batch")
+def explain_batch(request: MCQExplainBatchRequest):
+    """Explain a quiz review page in one call; each item gets a result or an error."""
+    if len(request.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} questions per batch.")
+
+    results = [None] * len(request.items)
+    to_explain = []
+    for i, item in enumerate(request.items):
+        if is_inappropriate(item.question):
+            results[i] = {"error": "Question contains inappropriate or harmful content."}
+        elif get_cached_explanation(item.question, item.options) is None and not is_biology_question(item.question):
+            results[i] = {"error": "Only biology-related questions are supported."}
+        else:
+            to_explain.append(i)
+
+    try:
+        explained = explain_mcq_batch([(request.items[i].question, request.items[i].options) for i in to_explain])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    for i, result in zip(to_explain, explained):
+        results[i] = result
+    return {"results": results}
+
 @router.post("/mcq/verify_and_explain")
 def verify_and_explain(request: MCQVerifyRequest):
     if is_inappropriate(request.question):
         raise HTTPException(status_code=400, detail="Question contains inappropriate or harmful content.")
-    if not is_biology_question(request.question):
+    is_cached = get_cached_explanation(request.question, request.options) is not None
+    if not is_cached and not is_biology_question(request.question):
         raise HTTPException(status_code=400, detail="Only biology-related questions are supported.")
     try:
         return verify_answer_by_generation(request.question, request.options, request.claimed_answer)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/review_stats")
+def get_review_stats():
+    """Gemini review skip and disagreement rates since process start, for threshold tuning."""
+    return review_stats()
@@ -3,8 +3,10 @@ import logging
 import time
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, Depends
-from utils.user_mgmt_methods import get_current_user
-from database.database import quizzes_collection, users_collection
+from utils.user_mgmt_methods import get_registered_user
+from database.database import quizzes_collection
+from database.async_database import async_collection
+from utils.question_store import normalize_quiz, hydrate_quiz_async
 from utils.generate_question import generate_mcq
 from threading import Thread
 from utils.answer_verifier import verify_quiz_answers_async 
@@ -18,16 +20,9 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 DIFFICULTY_DISTRIBUTION = {"easy": 8, "medium": 6, "hard": 6}
 
 @router.get("/generate_mcqs/{user_id}")
-def generate_quiz(user_id: str, current_user: str = Depends(get_current_user)):
+def generate_quiz(user_id: str, existing_user: dict = Depends(get_registered_user)):
     """Generates exactly 18 MCQs (6 Easy, 6 Medium, 6 Hard), stores in DB, and returns to user."""
     try:
-        existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-        if not existing_user:
-            raise HTTPException(status_code=404, detail="User not found. Please register before generating a quiz.")
-        
-        if current_user != user_id:
-            raise HTTPException(status_code=403, detail="Unauthorized access")
-    
         logging.info(f"📝 Generating quiz for user {user_id}...")
         quiz_id = str(uuid.uuid4())  # Unique quiz session ID
         mcqs = []
@@ -87,7 +82,7 @@ def generate_quiz(user_id: str, current_user: str = Depends(get_current_user)):
             "questions": mcqs,
             "created_at": time.time(),
         }
-        quizzes_collection.insert_one(quiz_data)
+        quizzes_collection.insert_one(normalize_quiz(quiz_data))
         Thread(target=verify_quiz_answers_async, args=(quiz_id,)).start()
 
         return {"quiz_id": quiz_id, "total_questions": len(mcqs), "mcqs": mcqs}
@@ -104,12 +99,15 @@ def generate_quiz(user_id: str, current_user: str = Depends(get_current_user)):
         }
 
 @router.get("/get_quiz/{quiz_id}")
-def get_quiz(quiz_id: str):
+async def get_quiz(quiz_id: str):
     """
     Fetch a quiz along with all its questions from quizzes_collection.
     """
     try:
-        quiz = quizzes_collection.find_one({"quiz_id": quiz_id})
+        quiz = await hydrate_quiz_async(
+            await async_collection("quizzes").find_one({"quiz_id": quiz_id}),
+            async_collection("questions"),
+        )
 
         if not quiz:
             raise HTTPException(status_code=404, detail="Quiz not found.")
@@ -1,18 +1,31 @@
 import time
+import hashlib
 import logging
 import numpy as np
 import matplotlib.pyplot as plt
 import io
 import base64
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import JSONResponse
 from database.database import responses_collection, quizzes_collection, users_collection
+from database.async_database import async_collection
 from bson import ObjectId
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from pymongo.errors import PyMongoError
-from utils.user_mgmt_methods import get_current_user
+from utils.user_mgmt_methods import (
+    get_current_user,
+    get_user_document,
+    get_registered_user,
+    get_user_document_async,
+    load_user,
+    load_user_async,
+    invalidate_user,
+)
 import traceback
 from utils.verification import verify_mcq_with_llm
+from utils.activity import record_activity, streak_summary
+from utils.question_store import hydrate_quiz
 from datetime import datetime, timedelta
 
 router = APIRouter()
@@ -30,6 +43,21 @@ class QuizResponse(BaseModel):
     time_taken: float  #  Change this to an integer (was previously str)
 
 
+#  Bump when the shape of the per-question data frozen on an attempt changes
+ATTEMPT_SNAPSHOT_VERSION = 1
+
+#  Everything the results view needs; attempts are read by (user_id, quiz_id, attempt_number)
+ATTEMPT_RESULT_PROJECTION = {
+    "user_id": 1,
+    "quiz_id": 1,
+    "submitted_at": 1,
+    "attempt_number": 1,
+    "snapshot_version": 1,
+    "responses": 1,
+    "summary": 1,
+}
+
+
 #  Pydantic Model for Submitting Quiz
 class SubmitQuizRequest(BaseModel):
     user_id: str
@@ -39,7 +67,7 @@ class SubmitQuizRequest(BaseModel):
 # Function to Estimate Student Ability
 def estimate_student_ability(user_id):
     """Estimates student ability dynamically using accuracy & response time from the last 10 quizzes."""
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
+    user_data = load_user(user_id)
 
     if (
         not user_data
@@ -172,6 +200,7 @@ def update_user_performance(user_id, responses):
         result = users_collection.update_one(
             {"_id": ObjectId(user_id)}, {"$set": {"performance": performance}}
         )
+        invalidate_user(user_id)
 
         if result.matched_count == 0:
             logging.error(
@@ -207,7 +236,7 @@ def submit_quiz(data: SubmitQuizRequest, current_user: str = Depends(get_current
             f"Received quiz submission: User {user_id}, Quiz {quiz_id}, Responses Count: {len(responses)}"
         )
 
-        existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
+        existing_user = load_user(user_id)
         if not existing_user:
             logging.error(f" User {user_id} not found in the database.")
             raise HTTPException(
@@ -220,7 +249,7 @@ def submit_quiz(data: SubmitQuizRequest, current_user: str = Depends(get_current
             raise HTTPException(status_code=403, detail="Unauthorized access")
 
         # Fetch quiz to validate responses
-        quiz = quizzes_collection.find_one({"quiz_id": quiz_id})
+        quiz = hydrate_quiz(quizzes_collection.find_one({"quiz_id": quiz_id}))
         if not quiz:
             logging.error(f" Quiz {quiz_id} not found in the database.")
             raise HTTPException(status_code=404, detail="Quiz not found.")
@@ -265,6 +294,8 @@ def submit_quiz(data: SubmitQuizRequest, current_user: str = Depends(get_current
             "quiz_id": quiz_id,
             "submitted_at": submitted_at,
             "attempt_number": attempt_number,  #  Track attempt number correctly
+            #  Options and answer keys are frozen here at grading time
+            "snapshot_version": ATTEMPT_SNAPSHOT_VERSION,
             "responses": [],
             "summary": {},
         }
@@ -408,6 +439,13 @@ def submit_quiz(data: SubmitQuizRequest, current_user: str = Depends(get_current
         if attempt_number == 1:
             update_user_performance(user_id, response_data["responses"])
 
+        #  Every submission counts towards the daily activity streak
+        try:
+            record_activity(user_id, submitted_at)
+            invalidate_user(user_id)
+        except PyMongoError as e:
+            logging.error(f" Could not record activity for User {user_id}: {e}")
+
         #  Convert ObjectId to string for API response
         response_data["_id"] = str(inserted_response.inserted_id)
 
@@ -422,22 +460,17 @@ def submit_quiz(data: SubmitQuizRequest, current_user: str = Depends(get_current
 
 #  New API Route to Fetch User Quiz History
 @router.get("/user_quiz_history/{user_id}")
-def get_user_quiz_history(user_id: str, current_user: str = Depends(get_current_user)):
+async def get_user_quiz_history(user_id: str, existing_user: dict = Depends(get_user_document_async)):
     """
     Retrieve all quizzes a user has attempted along with each attempt.
     """
     try:
-        # Step 1: Ensure the user exists
-        existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-        if not existing_user:
-            raise HTTPException(status_code=404, detail="User not found.")
-
-        if current_user != user_id:
-            logging.error(f" Unauthorized access attempt by {current_user}")
-            raise HTTPException(status_code=403, detail="Unauthorized access")
-
-        # Step 2: Fetch all quiz attempts made by the user
-        quiz_attempts = list(responses_collection.find({"user_id": user_id}))
+        # Step 1 (user exists and owns the token) is done by get_user_document_async
+        # Step 2: Fetch all quiz attempts made by the user, without the per-question snapshots
+        quiz_attempts = await async_collection("user_responses").find(
+            {"user_id": user_id},
+            {"quiz_id": 1, "submitted_at": 1, "attempt_number": 1, "summary": 1},
+        ).to_list(None)
 
         if not quiz_attempts:
             return {"message": "No quiz attempts found."}
@@ -468,76 +501,82 @@ def get_user_quiz_history(user_id: str, current_user: str = Depends(get_current_
             status_code=500, detail="An error occurred while retrieving quiz history."
         )
 
+def snapshot_from_quiz(attempt, quiz):
+    """
+    Fill in what an attempt stored without a snapshot is missing (options, difficulty) from the quiz.
+    Answer keys already on the response are the ones it was graded against and are kept.
+    """
+    question_lookup = {q["question_text"]: q for q in quiz["questions"]}
+
+    enriched_responses = []
+    for response in attempt["responses"]:
+        question_text = response["question_text"]
+
+        if question_text in question_lookup:
+            full_question = question_lookup[question_text]
+            response.setdefault("options", {
+                "A": full_question.get("option1", ""),
+                "B": full_question.get("option2", ""),
+                "C": full_question.get("option3", ""),
+                "D": full_question.get("option4", ""),
+                "E": full_question.get("option5", ""),
+            })
+            response.setdefault("difficulty", full_question["difficulty"])
+            response.setdefault("claimed_answer", full_question.get(
+                "claimed_answer", full_question.get("correct_answer")
+            ))
+            response.setdefault("verified_answer", response.get(
+                "correct_answer", full_question.get("verified_answer", full_question["correct_answer"])
+            ))
+            response.setdefault("correct_answer", response["verified_answer"])  # for consistency
+
+        enriched_responses.append(response)
+
+    return enriched_responses
+
+
 #  New API Route to Fetch Attempt Results
 @router.get("/quiz_attempt_results/{user_id}/{quiz_id}/{attempt_number}")
 def get_quiz_attempt_results(
     user_id: str,
     quiz_id: str,
     attempt_number: int,
-    current_user: str = Depends(get_current_user),
+    existing_user: dict = Depends(get_registered_user),
 ):
     """
-    Retrieve a specific quiz attempt's results, including full question details from quizzes_collection.
+    Retrieve a specific quiz attempt's results from the snapshot stored at submission.
     """
     try:
-        existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-        if not existing_user:
-            logging.error(f" User {user_id} not found in the database.")
-            raise HTTPException(
-                status_code=404,
-                detail="User not found. Please register before generating a quiz.",
-            )
-
-        if current_user != user_id:
-            logging.error(f" Unauthorized access attempt by {current_user}")
-            raise HTTPException(status_code=403, detail="Unauthorized access")
-
-        # Step 1: Retrieve the attempt from responses_collection
         attempt = responses_collection.find_one(
-            {"user_id": user_id, "quiz_id": quiz_id, "attempt_number": attempt_number}
+            {"user_id": user_id, "quiz_id": quiz_id, "attempt_number": attempt_number},
+            ATTEMPT_RESULT_PROJECTION,
         )
 
         if not attempt:
             raise HTTPException(status_code=404, detail="Attempt not found.")
 
-        # Step 2: Retrieve the full quiz details from quizzes_collection
-        quiz = quizzes_collection.find_one({"quiz_id": quiz_id})
+        if attempt.get("snapshot_version", 0) < ATTEMPT_SNAPSHOT_VERSION:
+            #  Legacy attempt: join from the quiz once and store the snapshot
+            quiz = hydrate_quiz(quizzes_collection.find_one(
+                {"quiz_id": quiz_id}, {"questions": 1, "question_refs": 1}
+            ))
 
-        if not quiz:
-            raise HTTPException(status_code=404, detail="Quiz not found.")
+            if not quiz:
+                raise HTTPException(status_code=404, detail="Quiz not found.")
 
-        # Step 3: Create a dictionary mapping question_text -> full question details
-        question_lookup = {q["question_text"]: q for q in quiz["questions"]}
-
-        # Step 4: Merge full question details into attempt responses
-        enriched_responses = []
-        for response in attempt["responses"]:
-            question_text = response["question_text"]
-
-            if question_text in question_lookup:
-                full_question = question_lookup[question_text]
-                response["options"] = {
-                    "A": full_question.get("option1", ""),
-                    "B": full_question.get("option2", ""),
-                    "C": full_question.get("option3", ""),
-                    "D": full_question.get("option4", ""),
-                    "E": full_question.get("option5", ""),
-                }
-                response["difficulty"] = full_question["difficulty"]
-                response["claimed_answer"] = full_question.get(
-                    "claimed_answer", full_question.get("correct_answer")
-                )
-                response["verified_answer"] = full_question.get(
-                    "verified_answer", full_question["correct_answer"]
+            attempt["responses"] = snapshot_from_quiz(attempt, quiz)
+            attempt["snapshot_version"] = ATTEMPT_SNAPSHOT_VERSION
+            try:
+                responses_collection.update_one(
+                    {"_id": attempt["_id"]},
+                    {"$set": {
+                        "responses": attempt["responses"],
+                        "snapshot_version": ATTEMPT_SNAPSHOT_VERSION,
+                    }},
                 )
-                response["correct_answer"] = response[
-                    "verified_answer"
-                ]  # for consistency
-
-            enriched_responses.append(response)
+            except PyMongoError as e:
+                logging.warning(f"⚠ Could not store snapshot for attempt {attempt['_id']}: {e}")
 
-        # Step 5: Update attempt data with enriched responses
-        attempt["responses"] = enriched_responses
         attempt["_id"] = str(attempt["_id"])  # Convert ObjectId to string
 
         return attempt
@@ -549,23 +588,15 @@ def get_quiz_attempt_results(
             detail="An error occurred while retrieving attempt results.",
         )
 
-# API Route to Generate Performance Graph
-@router.get("/performance_graph/{user_id}")
-def generate_performance_graph(
-    user_id: str, current_user: str = Depends(get_current_user)
-):
-    """Generates graphs showing user improvement and consistency."""
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user_data:
-        raise HTTPException(status_code=404, detail="User not found.")
+# Dashboard sections: each takes the already-loaded user document, so the
+# individual routes and GET /dashboard/{user_id} share one user read.
+NO_PERFORMANCE_DATA = "No performance data found."
 
-    if current_user != user_id:
-        logging.error(f" Unauthorized access attempt by {current_user}")
-        raise HTTPException(status_code=403, detail="Unauthorized access")
 
+def performance_graph_section(user_data):
+    """Generates graphs showing user improvement and consistency."""
     if (
-        not user_data
-        or "performance" not in user_data
+        "performance" not in user_data
         or "last_10_quizzes" not in user_data["performance"]
     ):
         return {
@@ -590,6 +621,7 @@ def generate_performance_graph(
 
     img = io.BytesIO()
     plt.savefig(img, format="png")
+    plt.close()
     img.seek(0)
     return {
         "quiz_numbers": quiz_numbers,
@@ -598,20 +630,10 @@ def generate_performance_graph(
         "message": "Performance data loaded successfully.",
     }
 
-# API Route to Fetch Progress Insights
-@router.get("/progress_insights/{user_id}")
-def get_progress_insights(user_id: str, current_user: str = Depends(get_current_user)):
-    """Analyzes user progress and provides AI-driven insights."""
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user_data:
-        raise HTTPException(status_code=404, detail="User not found.")
-
-    if not user_data or "performance" not in user_data:
-        raise HTTPException(status_code=404, detail="No performance data found.")
-
-    if current_user != user_id:
-        logging.error(f" Unauthorized access attempt by {current_user}")
-        raise HTTPException(status_code=403, detail="Unauthorized access")
+def progress_insights_section(user_data):
+    """Analyzes user progress and provides AI-driven insights; None without performance data."""
+    if "performance" not in user_data:
+        return None
 
     history = user_data["performance"].get("last_10_quizzes", [])
 
@@ -660,22 +682,10 @@ def get_progress_insights(user_id: str, current_user: str = Depends(get_current_
 
     return insights
 
-# API Route to Compare User Performance
-@router.get("/user_performance_comparison/{user_id}")
-def get_user_performance_comparison(
-    user_id: str, current_user: str = Depends(get_current_user)
-):
-    """Compares user's performance against average stats of all users."""
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user_data:
-        raise HTTPException(status_code=404, detail="User not found.")
-    
-    if current_user != user_id:
-        logging.error(f" Unauthorized access attempt by {current_user}")
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-    
+def performance_comparison_section(user_data):
+    """Compares user's performance against average stats of all users; None without performance data."""
     if "performance" not in user_data:
-        raise HTTPException(status_code=404, detail="No performance data found.")
+        return None
     
     last_quizzes = user_data["performance"].get("last_10_quizzes", [])
     if not last_quizzes:
@@ -712,18 +722,10 @@ def get_user_performance_comparison(
     }
 
 
-@router.get("/engagement_score/{user_id}")
-def get_engagement_score(user_id: str, current_user: str = Depends(get_current_user)):
-    """Calculates how active and engaged the user is."""
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user_data:
-        raise HTTPException(status_code=404, detail="User not found.")
-    if current_user != user_id:
-        logging.error(f" Unauthorized access attempt by {current_user}")
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-
-    if not user_data or "performance" not in user_data:
-        raise HTTPException(status_code=404, detail="No performance data found.")
+def engagement_score_section(user_data):
+    """Calculates how active and engaged the user is; None without performance data."""
+    if "performance" not in user_data:
+        return None
 
     history = user_data["performance"].get("last_10_quizzes", [])
 
@@ -752,20 +754,10 @@ def get_engagement_score(user_id: str, current_user: str = Depends(get_current_u
 
     return {"engagement_score": consistency_score, "category": category}
 
-#  API Route to Fetch Dashboard Data
-@router.get("/dashboard_data/{user_id}")
-def get_dashboard_data(user_id: str, current_user: str = Depends(get_current_user)):
+def dashboard_data_section(user_data):
     """Returns structured performance data for the user dashboard."""
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user_data:
-        raise HTTPException(status_code=404, detail="User not found.")
-
-    if current_user != user_id:
-        logging.error(f" Unauthorized access attempt by {current_user}")
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-
     #  If user has no performance data, return default values
-    if not user_data or "performance" not in user_data:
+    if "performance" not in user_data:
         return {
             "total_quizzes": 0,
             "accuracy_easy": 0,
@@ -797,43 +789,97 @@ def get_dashboard_data(user_id: str, current_user: str = Depends(get_current_use
     }
 
 
+def user_streak_section(user_data):
+    """Current and longest run of consecutive quiz days."""
+    if user_data and user_data.get("activity"):
+        return streak_summary(user_data["activity"])
+
+    #  Users without an activity bitmap yet (see `python -m utils.activity --backfill`)
+    if not user_data or "performance" not in user_data:
+        return {"streak": 0, "longest_streak": 0}
+
+    quizzes = user_data["performance"].get("last_10_quizzes", [])
+    if not quizzes:
+        return {"streak": 0, "longest_streak": 0}
+
+    # Extract and sort unique quiz dates
+    quiz_dates = sorted(
+        set(datetime.fromtimestamp(q["timestamp"]).date() for q in quizzes),
+        reverse=True
+    )
+
+    # Compute current streak
+    today = datetime.utcnow().date()
+    streak = 0
+    for i, date in enumerate(quiz_dates):
+        if i == 0:
+            if date == today:
+                streak += 1
+            elif date == today - timedelta(days=1):
+                streak += 1
+            else:
+                break
+        else:
+            expected = quiz_dates[i - 1] - timedelta(days=1)
+            if date == expected:
+                streak += 1
+            else:
+                break
+
+    # Optional: calculate longest streak
+    longest_streak = 1
+    temp_streak = 1
+    for i in range(1, len(quiz_dates)):
+        if quiz_dates[i] == quiz_dates[i - 1] - timedelta(days=1):
+            temp_streak += 1
+            longest_streak = max(longest_streak, temp_streak)
+        else:
+            temp_streak = 1
+
+    return {"streak": streak, "longest_streak": longest_streak}
+
+
 # Check if the user has any previous quizzes
 @router.get("/users/{user_id}/has_previous_quiz")
-def check_user_quiz_history(user_id: str):
+async def check_user_quiz_history(user_id: str):
     """
     Check if the user has any previous quizzes by searching in the `quizzes` collection.
     Returns True if at least one quiz exists.
     """
     try:
         # Ensure the user exists
-        user = users_collection.find_one({"_id": ObjectId(user_id)})
+        user = await load_user_async(user_id)
         if not user:
             logging.error(f" User not found: {user_id}")
             raise HTTPException(status_code=404, detail="User not found.")
 
-        # Check if the user has any quizzes
-        quiz_count = quizzes_collection.count_documents({"user_id": user_id})
+        # One quiz is enough, served by the user_id/created_at index
+        quiz = await async_collection("quizzes").find_one({"user_id": user_id}, {"_id": 1})
 
-        return {"has_previous_quiz": quiz_count > 0}
+        return {"has_previous_quiz": quiz is not None}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f" Error checking user quiz history: {str(e)}")
-        return HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 # API Route to Fetch Leaderboard
 @router.get("/leaderboard")
-def get_leaderboard():
+async def get_leaderboard():
     """
     Generates a leaderboard of top users based on their latest accuracy.
     """
     try:
-        users = users_collection.find(
-            {"performance.last_10_quizzes": {"$exists": True, "$ne": []}}
+        #  Only the name and the quiz accuracies are needed per user
+        users = async_collection("users").find(
+            {"performance.last_10_quizzes": {"$exists": True, "$ne": []}},
+            {"username": 1, "performance.last_10_quizzes.accuracy": 1},
         )
 
         leaderboard = []
-        for user in users:
+        async for user in users:
             quizzes = user.get("performance", {}).get("last_10_quizzes", [])
             if not quizzes:
                 continue
@@ -858,53 +904,115 @@ def get_leaderboard():
         logging.error(f"Failed to fetch leaderboard: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving leaderboard.")
 
-# API Route to Fetch User Streak
-@router.get("/user_streak/{user_id}")
-def get_user_streak(user_id: str, current_user: str = Depends(get_current_user)):
-    if current_user != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
 
-    user_data = users_collection.find_one({"_id": ObjectId(user_id)})
+DASHBOARD_SECTIONS = {
+    "dashboard_data": dashboard_data_section,
+    "performance_graph": performance_graph_section,
+    "progress_insights": progress_insights_section,
+    "engagement_score": engagement_score_section,
+    "user_streak": user_streak_section,
+    "performance_comparison": performance_comparison_section,
+}
 
-    if not user_data or "performance" not in user_data:
-        return {"streak": 0, "longest_streak": 0}
 
-    quizzes = user_data["performance"].get("last_10_quizzes", [])
-    if not quizzes:
-        return {"streak": 0, "longest_streak": 0}
+#  Depend on every user's results, which the ETag does not track; never answered with a 304
+UNCACHEABLE_SECTIONS = {"performance_comparison"}
 
-    # Extract and sort unique quiz dates
-    quiz_dates = sorted(
-        set(datetime.fromtimestamp(q["timestamp"]).date() for q in quizzes),
-        reverse=True
-    )
 
-    # Compute current streak
-    today = datetime.utcnow().date()
-    streak = 0
-    for i, date in enumerate(quiz_dates):
-        if i == 0:
-            if date == today:
-                streak += 1
-            elif date == today - timedelta(days=1):
-                streak += 1
-            else:
-                break
-        else:
-            expected = quiz_dates[i - 1] - timedelta(days=1)
-            if date == expected:
-                streak += 1
-            else:
-                break
+def dashboard_etag(user_id, user_data, sections):
+    """
+    Changes whenever the user finishes a quiz: first attempts bump total_quizzes and
+    every submission on a new day bumps the activity version (retakes move the streak).
+    The UTC date is included because the streak is relative to today.
+    """
+    total_quizzes = user_data.get("performance", {}).get("total_quizzes", 0)
+    activity_version = (user_data.get("activity") or {}).get("version", 0)
+    key = f"{user_id}:{total_quizzes}:{activity_version}:{datetime.utcnow().date()}:{','.join(sections)}"
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]}"'
 
-    # Optional: calculate longest streak
-    longest_streak = 1
-    temp_streak = 1
-    for i in range(1, len(quiz_dates)):
-        if quiz_dates[i] == quiz_dates[i - 1] - timedelta(days=1):
-            temp_streak += 1
-            longest_streak = max(longest_streak, temp_streak)
-        else:
-            temp_streak = 1
 
-    return {"streak": streak, "longest_streak": longest_streak}
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
+
+
+# API Route to Fetch the whole dashboard (or selected sections) in one request
+@router.get("/dashboard/{user_id}")
+def get_dashboard(
+    user_id: str,
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated sections ({', '.join(DASHBOARD_SECTIONS)}); all if omitted"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    user_data: dict = Depends(get_user_document),
+):
+    sections = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(DASHBOARD_SECTIONS)
+    unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dashboard sections: {', '.join(unknown)}")
+
+    if UNCACHEABLE_SECTIONS.intersection(sections):
+        headers = {"Cache-Control": "private, no-store"}
+    else:
+        etag = dashboard_etag(user_id, user_data, sections)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+    body = {}
+    for name in sections:
+        section = DASHBOARD_SECTIONS[name](user_data)
+        body[name] = section if section is not None else {"message": NO_PERFORMANCE_DATA}
+    return JSONResponse(content=body, headers=headers)
+
+
+# API Route to Generate Performance Graph
+@router.get("/performance_graph/{user_id}")
+def generate_performance_graph(
+    user_id: str, user_data: dict = Depends(get_user_document)
+):
+    return performance_graph_section(user_data)
+
+
+# API Route to Fetch Progress Insights
+@router.get("/progress_insights/{user_id}")
+def get_progress_insights(user_id: str, user_data: dict = Depends(get_user_document)):
+    insights = progress_insights_section(user_data)
+    if insights is None:
+        raise HTTPException(status_code=404, detail=NO_PERFORMANCE_DATA)
+    return insights
+
+
+# API Route to Compare User Performance
+@router.get("/user_performance_comparison/{user_id}")
+def get_user_performance_comparison(
+    user_id: str, user_data: dict = Depends(get_user_document)
+):
+    comparison = performance_comparison_section(user_data)
+    if comparison is None:
+        raise HTTPException(status_code=404, detail=NO_PERFORMANCE_DATA)
+    return comparison
+
+
+@router.get("/engagement_score/{user_id}")
+def get_engagement_score(user_id: str, user_data: dict = Depends(get_user_document)):
+    engagement = engagement_score_section(user_data)
+    if engagement is None:
+        raise HTTPException(status_code=404, detail=NO_PERFORMANCE_DATA)
+    return engagement
+
+
+#  API Route to Fetch Dashboard Data
+@router.get("/dashboard_data/{user_id}")
+def get_dashboard_data(user_id: str, user_data: dict = Depends(get_user_document)):
+    return dashboard_data_section(user_data)
+
+
+# API Route to Fetch User Streak
+@router.get("/user_streak/{user_id}")
+def get_user_streak(user_id: str, current_user: str = Depends(get_current_user)):
+    if current_user != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    return user_streak_section(load_user(user_id))
@@ -0,0 +1,37 @@
+import os
+import hmac
+from fastapi import APIRouter, HTTPException, Query, Request, Header, Depends
+from fastapi.responses import JSONResponse
+from typing import Optional
+from utils.model_loader import registry
+
+router = APIRouter()
+
+# Shared secret for remote warmup calls (deploy hooks); without it only loopback callers may warm up
+WARMUP_TOKEN = os.getenv("WARMUP_TOKEN")
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def require_internal_caller(request: Request, x_warmup_token: Optional[str] = Header(None)):
+    """Allow loopback callers, or callers presenting WARMUP_TOKEN in the X-Warmup-Token header."""
+    if request.client and request.client.host in LOOPBACK_HOSTS:
+        return
+    if WARMUP_TOKEN and x_warmup_token and hmac.compare_digest(x_warmup_token, WARMUP_TOKEN):
+        return
+    raise HTTPException(status_code=403, detail="Warmup is restricted to internal callers.")
+
+
+# Route: Load models and artifacts ahead of the first request
+@router.post("/warmup", dependencies=[Depends(require_internal_caller)])
+def warmup(components: Optional[str] = Query(None, description="Comma-separated component names; all if omitted")):
+    names = [c.strip() for c in components.split(",") if c.strip()] if components else None
+    try:
+        return registry.warmup(names)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+# Route: Readiness probe (503 until every registered component has loaded)
+@router.get("/ready")
+def ready():
+    report = registry.readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
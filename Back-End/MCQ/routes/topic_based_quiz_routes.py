@@ -1,31 +1,35 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from datetime import datetime
+import logging
 import pandas as pd
-import torch
-import os
-import random
 from pydantic import BaseModel
 from typing import List
-from sentence_transformers import util
 from bson import ObjectId
-from database.database import unit_quizzes, unit_quiz_responses, users_collection
+from database.database import unit_quizzes, unit_quiz_responses, unit_seen_questions
 from utils.model_loader import embedding_model
-from utils.user_mgmt_methods import get_current_user
+from utils.user_mgmt_methods import get_current_user, get_user_document, get_registered_user
+from utils.unit_quiz_index import UnitEmbeddingIndex, StratifiedUnitSampler
+from utils.embedding_store import StaleArtifactError, content_hash, load_embedding_artifact
+from utils.embedding_pipeline import UNIT_EMBEDDING_ARTIFACT, unit_row_ids
 
 router = APIRouter()
 
 # Load dataset
 DATASET_PATH = "dataset/unit-wise-dataset/unit_tagged_mcq_dataset.csv"
-EMBEDDING_PATH = "dataset/unit-wise-dataset/unit_question_embeddings.pt"
 unit_df = pd.read_csv(DATASET_PATH).fillna("")
 
-if os.path.exists(EMBEDDING_PATH):
-    embeddings = torch.load(EMBEDDING_PATH, weights_only=False)
-else:
-    embeddings = unit_df["Question Text"].apply(lambda x: embedding_model.encode(x, convert_to_tensor=True))
-    torch.save(embeddings, EMBEDDING_PATH)
-
-unit_df["embedding"] = embeddings
+#  Contiguous, normalized per-unit embedding matrices for similarity fallback.
+#  Built offline (python -m utils.embedding_pipeline units); never encoded at import.
+try:
+    embeddings, _ = load_embedding_artifact(
+        UNIT_EMBEDDING_ARTIFACT, expected_hash=content_hash(unit_row_ids(unit_df))
+    )
+    unit_index = UnitEmbeddingIndex(unit_df, embeddings)
+except (FileNotFoundError, StaleArtifactError) as e:
+    logging.warning(f"⚠️ {e}. Similar-question fallback disabled; run `python -m utils.embedding_pipeline units`.")
+    unit_index = None
+#  Per-unit, per-stratum row ids for single-pass quiz sampling
+unit_sampler = StratifiedUnitSampler(unit_df)
 
 class QuizResponse(BaseModel):
     question_text: str
@@ -48,30 +52,54 @@ def format_question(row):
     correct_label = next((k for k, v in options.items() if v.strip() == correct_text), None)
 
     return {
+        "row_id": int(row.name),
         "question_text": row["Question Text"],
         "options": options,
         "correct_answer": correct_label,
         "difficulty": row.get("Difficulty Level", "medium")
     }
 
-# Helper: Get previously seen questions
-def get_previously_seen_questions(user_id, unit_name):
-    responses = unit_quiz_responses.find({"user_id": user_id, "unit_name": unit_name})
-    return set(q["question_text"] for r in responses for q in r["responses"])
+# Helper: Get previously seen question row ids (one small document per user and unit)
+def get_previously_seen_row_ids(user_id, unit_name):
+    seen_doc = unit_seen_questions.find_one(
+        {"user_id": user_id, "unit_name": unit_name}, {"row_ids": 1, "backfilled": 1, "_id": 0}
+    )
+    seen_row_ids = set((seen_doc or {}).get("row_ids", []))
+    if seen_doc is not None and seen_doc.get("backfilled"):
+        return seen_row_ids
+
+    # Not built from past submissions yet (a submission may have created the document first)
+    responses = unit_quiz_responses.find(
+        {"user_id": user_id, "unit_name": unit_name}, {"responses.question_text": 1, "_id": 0}
+    )
+    seen_texts = {q["question_text"] for r in responses for q in r["responses"]}
+    row_ids = set(unit_sampler.row_ids_for_texts(seen_texts))
+    record_seen_row_ids(user_id, unit_name, row_ids, backfilled=True)
+    return seen_row_ids | row_ids
+
+# Helper: Add row ids to the user's seen set for a unit
+def record_seen_row_ids(user_id, unit_name, row_ids, backfilled=False):
+    fields = {"updated_at": datetime.utcnow()}
+    if backfilled:
+        fields["backfilled"] = True
+    unit_seen_questions.update_one(
+        {"user_id": user_id, "unit_name": unit_name},
+        {
+            "$addToSet": {"row_ids": {"$each": sorted(int(i) for i in row_ids)}},
+            "$set": fields,
+        },
+        upsert=True,
+    )
 
 # Helper: Fallback similar questions
-def get_semantically_similar_questions(target_texts, excluded_units, used_questions, count):
-    candidates = unit_df[~unit_df["Assigned_Unit"].isin(excluded_units)]
-    candidates = candidates[~candidates["Question Text"].isin(used_questions)]
-    if candidates.empty:
+def get_semantically_similar_questions(target_texts, excluded_units, used_row_ids, count):
+    if not target_texts or unit_index is None:
         return []
-    target_embeddings = embedding_model.encode(target_texts, convert_to_tensor=True)
-    results = []
-    for _, row in candidates.iterrows():
-        sim = util.cos_sim(row["embedding"], target_embeddings).max().item()
-        results.append((sim, row))
-    results = sorted(results, key=lambda x: x[0], reverse=True)[:count]
-    return [format_question(row) for _, row in results]
+    target_embeddings = embedding_model.encode(target_texts, convert_to_numpy=True)
+    row_ids = unit_index.most_similar(
+        target_embeddings, count, excluded_units=excluded_units, excluded_row_ids=used_row_ids
+    )
+    return [format_question(unit_df.iloc[row_id]) for row_id in row_ids]
 
 # Route: Generate Quiz
 @router.get("/unit_quiz/generate/{user_id}")
@@ -79,52 +107,29 @@ def generate_unit_quiz(
     user_id: str,
     unit: str = Query(...),
     question_count: int = Query(10, ge=1, le=100),
-    current_user: str = Depends(get_current_user)
+    existing_user: dict = Depends(get_registered_user)
 ):
-    existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not existing_user:
-        raise HTTPException(status_code=404, detail="User not found. Please register before generating a quiz.")
-        
-    if current_user != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-    
-    filtered = unit_df[unit_df["Assigned_Unit"] == unit]
-    if filtered.empty:
+    if not unit_sampler.has_unit(unit):
         raise HTTPException(status_code=404, detail=f"No questions found for {unit}.")
 
-    used_questions = get_previously_seen_questions(current_user, unit)
-    filtered = filtered[~filtered["Question Text"].isin(used_questions)]
-
-    sampled_questions = []
-    seen = set()
-    attempts = 0
-    max_attempts = 100
-    clusters = list(filtered["Cluster"].unique()) if "Cluster" in filtered.columns else [None]
-    random.shuffle(clusters)
-
-    while len(sampled_questions) < question_count and attempts < max_attempts:
-        cluster = random.choice(clusters)
-        cluster_qs = filtered[filtered["Cluster"] == cluster] if cluster else filtered
-        if not cluster_qs.empty:
-            q = cluster_qs.sample(1).iloc[0]
-            q_text = q["Question Text"]
-            if q_text not in seen:
-                sampled_questions.append(format_question(q))
-                seen.add(q_text)
-        attempts += 1
+    used_row_ids = unit_sampler.with_duplicate_texts(
+        get_previously_seen_row_ids(user_id, unit)
+    )
+    row_ids = unit_sampler.sample(unit, question_count, excluded_ids=used_row_ids)
+    sampled_questions = [format_question(unit_df.iloc[row_id]) for row_id in row_ids]
 
     if len(sampled_questions) < question_count:
         needed = question_count - len(sampled_questions)
         fallback_questions = get_semantically_similar_questions(
             [q["question_text"] for q in sampled_questions],
             excluded_units=[unit],
-            used_questions=used_questions.union(seen),
+            used_row_ids=used_row_ids | unit_sampler.with_duplicate_texts(row_ids),
             count=needed
         )
         sampled_questions.extend(fallback_questions)
 
     quiz_entry = {
-        "user_id": current_user,
+        "user_id": user_id,
         "unit_name": unit,
         "questions": sampled_questions,
         "created_at": datetime.utcnow()
@@ -141,22 +146,14 @@ def generate_unit_quiz(
 def submit_unit_quiz(
     user_id: str,
     request: SubmitUnitQuizRequest,
-    current_user: str = Depends(get_current_user)
+    existing_user: dict = Depends(get_registered_user)
 ):
     quiz_id = request.quiz_id
     responses = request.responses
 
-    # 🔐 User Validation
-    existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not existing_user:
-        raise HTTPException(status_code=404, detail="User not found. Please register before generating a quiz.")
-    
-    if current_user != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-
     # 🧠 Fetch the quiz
     quiz = unit_quizzes.find_one({"_id": ObjectId(quiz_id)})
-    if not quiz or quiz.get("user_id") != current_user:
+    if not quiz or quiz.get("user_id") != user_id:
         raise HTTPException(status_code=403, detail="Unauthorized or quiz not found")
 
     questions_lookup = {q["question_text"]: q for q in quiz["questions"]}
@@ -182,9 +179,19 @@ def submit_unit_quiz(
             "is_correct": is_correct
         })
 
+    # 👀 Remember answered questions so later quizzes for this unit skip them
+    answered_row_ids = set()
+    for r in graded:
+        row_id = questions_lookup[r["question_text"]].get("row_id")
+        if row_id is None:
+            answered_row_ids |= unit_sampler.row_ids_for_texts([r["question_text"]])
+        else:
+            answered_row_ids.add(row_id)
+    record_seen_row_ids(user_id, quiz["unit_name"], answered_row_ids)
+
     # 💾 Store result
     unit_quiz_responses.insert_one({
-        "user_id": current_user,
+        "user_id": user_id,
         "quiz_id": quiz_id,
         "unit_name": quiz["unit_name"],
         "responses": graded,
@@ -200,18 +207,11 @@ def submit_unit_quiz(
     }
 
 @router.get("/unit_quiz/status/{user_id}")
-def get_unit_quiz_status(user_id: str, current_user: str = Depends(get_current_user)):
+def get_unit_quiz_status(user_id: str, existing_user: dict = Depends(get_user_document)):
     """
     Returns all quiz attempts per unit the user has completed.
     """
-    existing_user = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not existing_user:
-        raise HTTPException(status_code=404, detail="User not found.")
-        
-    if current_user != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-    
-    attempts = unit_quiz_responses.find({"user_id": current_user}).sort("submitted_at", 1)
+    attempts = unit_quiz_responses.find({"user_id": user_id}).sort("submitted_at", 1)
 
     unit_attempts = {}
     for a in attempts:
@@ -0,0 +1,110 @@
+import sys
+import os
+import mongomock
+from bson import ObjectId
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.activity import (
+    SECONDS_PER_DAY,
+    active_days,
+    apply_days,
+    backfill,
+    record_activity,
+    streak_summary,
+)
+
+DAY = 20000  # Arbitrary UTC day number
+
+
+def new_user(collection):
+    user_id = ObjectId()
+    collection.insert_one({"_id": user_id, "username": "streaky"})
+    return str(user_id)
+
+
+def test_consecutive_days_extend_the_streak_past_ten():
+    activity = None
+    for offset in range(14):
+        activity = apply_days(activity, [DAY + offset])
+    assert activity["current_streak"] == 14 and activity["longest_streak"] == 14
+    assert len(activity["bitmap"]) == 2
+
+
+def test_gap_resets_current_but_keeps_longest():
+    activity = None
+    for day in (DAY, DAY + 1, DAY + 2, DAY + 5):
+        activity = apply_days(activity, [day])
+    assert activity["current_streak"] == 1 and activity["longest_streak"] == 3
+    assert active_days(activity) == [DAY, DAY + 1, DAY + 2, DAY + 5]
+
+
+def test_earlier_day_grows_the_bitmap_backwards_and_recounts():
+    activity = apply_days(apply_days(None, [DAY + 1]), [DAY + 2])
+    activity = apply_days(activity, [DAY])
+    assert activity["origin_day"] <= DAY
+    assert active_days(activity) == [DAY, DAY + 1, DAY + 2]
+    assert activity["current_streak"] == 3 and activity["last_active_day"] == DAY + 2
+
+
+def test_streak_lapses_after_a_missed_day():
+    activity = apply_days(None, [DAY, DAY + 1])
+    assert streak_summary(activity, today=DAY + 2) == {"streak": 2, "longest_streak": 2}
+    assert streak_summary(activity, today=DAY + 3) == {"streak": 0, "longest_streak": 2}
+    assert streak_summary(None) == {"streak": 0, "longest_streak": 0}
+
+
+def test_record_activity_writes_once_per_day():
+    users = mongomock.MongoClient().db.users
+    user_id = new_user(users)
+
+    first = record_activity(user_id, DAY * SECONDS_PER_DAY + 10, collection=users)
+    again = record_activity(user_id, DAY * SECONDS_PER_DAY + 500, collection=users)
+    record_activity(user_id, (DAY + 1) * SECONDS_PER_DAY, collection=users)
+
+    stored = users.find_one({"_id": ObjectId(user_id)})["activity"]
+    assert first["version"] == again["version"] == 1
+    assert stored["version"] == 2 and stored["current_streak"] == 2
+
+
+def test_record_activity_retries_after_a_concurrent_write():
+    users = mongomock.MongoClient().db.users
+    user_id = new_user(users)
+    record_activity(user_id, DAY * SECONDS_PER_DAY, collection=users)
+
+    class RacingCollection:
+        """Lets another writer bump the activity between our read and our write, once."""
+
+        def __init__(self, inner):
+            self.inner = inner
+            self.raced = False
+
+        def find_one(self, *args, **kwargs):
+            doc = self.inner.find_one(*args, **kwargs)
+            if not self.raced:
+                self.raced = True
+                record_activity(user_id, (DAY + 1) * SECONDS_PER_DAY, collection=self.inner)
+            return doc
+
+        def update_one(self, *args, **kwargs):
+            return self.inner.update_one(*args, **kwargs)
+
+    record_activity(user_id, (DAY + 2) * SECONDS_PER_DAY, collection=RacingCollection(users))
+
+    stored = users.find_one({"_id": ObjectId(user_id)})["activity"]
+    assert active_days(stored) == [DAY, DAY + 1, DAY + 2]
+    assert stored["current_streak"] == 3 and stored["version"] == 3
+
+
+def test_backfill_uses_the_full_submission_history():
+    client = mongomock.MongoClient()
+    users, responses = client.db.users, client.db.user_responses
+    user_id = new_user(users)
+    responses.insert_many([
+        {"user_id": user_id, "submitted_at": (DAY + offset) * SECONDS_PER_DAY + 60}
+        for offset in list(range(12)) + [20, 21]
+    ])
+
+    assert backfill(users=users, responses=responses) == 1
+    stored = users.find_one({"_id": ObjectId(user_id)})["activity"]
+    assert stored["longest_streak"] == 12 and stored["current_streak"] == 2
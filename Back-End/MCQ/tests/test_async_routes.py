@@ -0,0 +1,149 @@
+import sys
+import os
+import asyncio
+import mongomock
+from unittest.mock import patch
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import app
+import routes.mcq_routes as mcq_routes
+import routes.response_routes as response_routes
+import utils.user_mgmt_methods as user_mgmt_methods
+from utils.question_store import normalize_quiz, question_cache
+from utils.user_mgmt_methods import get_current_user, get_current_user_async, user_cache
+
+TEST_USER_ID = str(ObjectId())
+client = TestClient(app)
+
+
+class AsyncCursor:
+    """Just enough of the async cursor API over a mongomock cursor."""
+
+    def __init__(self, cursor):
+        self._docs = iter(cursor)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        return [doc async for doc in self]
+
+
+class AsyncCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    async def find_one(self, *args, **kwargs):
+        return self._collection.find_one(*args, **kwargs)
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+
+def setup_module():
+    app.dependency_overrides[get_current_user] = lambda: TEST_USER_ID
+    app.dependency_overrides[get_current_user_async] = lambda: TEST_USER_ID
+
+
+def teardown_module():
+    app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_current_user_async, None)
+    user_cache.clear()
+
+
+def patched_db(db):
+    fake = lambda name: AsyncCollection(db[name])
+    return (
+        patch.object(mcq_routes, "async_collection", fake),
+        patch.object(response_routes, "async_collection", fake),
+        patch.object(user_mgmt_methods, "async_collection", fake),
+    )
+
+
+def test_read_routes_run_on_the_event_loop():
+    for handler in (
+        mcq_routes.get_quiz,
+        response_routes.get_leaderboard,
+        response_routes.check_user_quiz_history,
+        response_routes.get_user_quiz_history,
+        user_mgmt_methods.get_current_user_async,
+        user_mgmt_methods.get_user_document_async,
+    ):
+        assert asyncio.iscoroutinefunction(handler)
+
+
+def test_get_quiz_hydrates_shared_questions_asynchronously():
+    db = mongomock.MongoClient().db
+    question = {"question_text": "What is ATP?", **{f"option{i}": f"opt{i}" for i in range(1, 6)}, "correct_answer": "A"}
+    with patch("utils.question_store.questions_collection", db.questions):
+        db.quizzes.insert_one(normalize_quiz({"quiz_id": "q1", "user_id": TEST_USER_ID, "questions": [question]}))
+    question_cache.clear()
+
+    quiz_patch, response_patch, user_patch = patched_db(db)
+    with quiz_patch, response_patch, user_patch:
+        response = client.get("/mcqs/get_quiz/q1")
+
+    assert response.status_code == 200
+    assert response.json()["questions"] == [question]
+
+
+def test_leaderboard_and_history_use_projections():
+    db = mongomock.MongoClient().db
+    db.users.insert_many([
+        {"_id": ObjectId(TEST_USER_ID), "username": "a", "performance": {"last_10_quizzes": [{"accuracy": 90}, {"accuracy": 40}]}},
+        {"_id": ObjectId(), "username": "b", "performance": {"last_10_quizzes": [{"accuracy": 70}]}},
+        {"_id": ObjectId(), "username": "c", "performance": {"last_10_quizzes": []}},
+    ])
+    db.user_responses.insert_one({
+        "user_id": TEST_USER_ID, "quiz_id": "q1", "submitted_at": 1, "attempt_number": 1,
+        "summary": {"accuracy": 40}, "responses": [{"question_text": "big"}],
+    })
+
+    quiz_patch, response_patch, user_patch = patched_db(db)
+    user_cache.clear()
+    with quiz_patch, response_patch, user_patch, patch.object(user_mgmt_methods, "users_collection") as sync_users:
+        leaderboard = client.get("/responses/leaderboard").json()["leaderboard"]
+        history = client.get(f"/responses/user_quiz_history/{TEST_USER_ID}").json()["quiz_history"]
+
+    assert [(row["name"], row["accuracy"]) for row in leaderboard] == [("b", 70), ("a", 40)]
+    assert history[0]["attempts"][0]["summary"] == {"accuracy": 40}
+    sync_users.find_one.assert_not_called()
+
+
+def test_has_previous_quiz():
+    db = mongomock.MongoClient().db
+    db.users.insert_one({"_id": ObjectId(TEST_USER_ID)})
+
+    quiz_patch, response_patch, user_patch = patched_db(db)
+    user_cache.clear()
+    with quiz_patch, response_patch, user_patch:
+        before = client.get(f"/responses/users/{TEST_USER_ID}/has_previous_quiz").json()
+        db.quizzes.insert_one({"quiz_id": "q1", "user_id": TEST_USER_ID})
+        after = client.get(f"/responses/users/{TEST_USER_ID}/has_previous_quiz").json()
+
+    assert before == {"has_previous_quiz": False}
+    assert after == {"has_previous_quiz": True}
+
+
+def test_has_previous_quiz_rejects_invalid_and_unknown_users():
+    db = mongomock.MongoClient().db
+
+    quiz_patch, response_patch, user_patch = patched_db(db)
+    user_cache.clear()
+    with quiz_patch, response_patch, user_patch:
+        invalid = client.get("/responses/users/not-an-id/has_previous_quiz")
+        unknown = client.get(f"/responses/users/{ObjectId()}/has_previous_quiz")
+
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "Invalid user ID."
+    assert unknown.status_code == 404
+    assert unknown.json()["detail"] == "User not found."
@@ -0,0 +1,126 @@
+import sys
+import os
+import mongomock
+from unittest.mock import patch
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import app
+from routes.response_routes import ATTEMPT_SNAPSHOT_VERSION
+from utils.user_mgmt_methods import get_current_user, user_cache
+
+TEST_USER_ID = str(ObjectId())
+QUIZ_ID = "quiz-snapshot"
+QUESTION = {
+    "question_text": "What is the powerhouse of the cell?",
+    "option1": "Nucleus",
+    "option2": "Ribosome",
+    "option3": "Mitochondria",
+    "option4": "Golgi apparatus",
+    "option5": "Lysosome",
+    "correct_answer": "C",
+    "is_verified": True,
+    "difficulty": "easy",
+}
+
+client = TestClient(app)
+
+
+def setup_module():
+    app.dependency_overrides[get_current_user] = lambda: TEST_USER_ID
+
+
+def teardown_module():
+    app.dependency_overrides.pop(get_current_user, None)
+    user_cache.clear()
+
+
+def fake_db():
+    db = mongomock.MongoClient().db
+    db.users.insert_one({"_id": ObjectId(TEST_USER_ID), "username": "snap"})
+    db.quizzes.insert_one({"quiz_id": QUIZ_ID, "user_id": TEST_USER_ID, "questions": [dict(QUESTION)]})
+    return db
+
+
+def test_results_come_from_the_snapshot_frozen_at_submission():
+    db = fake_db()
+    user_cache.clear()
+    with patch("utils.user_mgmt_methods.users_collection", db.users), \
+         patch("routes.response_routes.users_collection", db.users), \
+         patch("routes.response_routes.record_activity"), \
+         patch("routes.response_routes.quizzes_collection", db.quizzes), \
+         patch("routes.response_routes.responses_collection", db.user_responses):
+        submit = client.post("/responses/submit_quiz/", json={
+            "user_id": TEST_USER_ID,
+            "quiz_id": QUIZ_ID,
+            "responses": [{"question_text": QUESTION["question_text"], "selected_answer": "C", "time_taken": 12}],
+        })
+        assert submit.status_code == 200
+        assert submit.json()["snapshot_version"] == ATTEMPT_SNAPSHOT_VERSION
+
+        #  Re-verifying the key afterwards must not change the graded attempt
+        db.quizzes.update_one({"quiz_id": QUIZ_ID}, {"$set": {"questions.0.correct_answer": "A"}})
+        with patch.object(db.quizzes, "find_one", side_effect=AssertionError("quiz read")):
+            response = client.get(f"/responses/quiz_attempt_results/{TEST_USER_ID}/{QUIZ_ID}/1")
+
+    assert response.status_code == 200
+    result = response.json()["responses"][0]
+    assert result["correct_answer"] == "C" and result["is_correct"] is True
+    assert result["options"]["C"] == "Mitochondria"
+
+
+def test_legacy_attempt_is_joined_once_and_upgraded():
+    db = fake_db()
+    user_cache.clear()
+    db.user_responses.insert_one({
+        "user_id": TEST_USER_ID,
+        "quiz_id": QUIZ_ID,
+        "attempt_number": 1,
+        "submitted_at": 0,
+        "responses": [{"question_text": QUESTION["question_text"], "selected_answer": "C", "is_correct": True}],
+        "summary": {},
+    })
+    with patch("utils.user_mgmt_methods.users_collection", db.users), \
+         patch("routes.response_routes.quizzes_collection", db.quizzes), \
+         patch("routes.response_routes.responses_collection", db.user_responses):
+        response = client.get(f"/responses/quiz_attempt_results/{TEST_USER_ID}/{QUIZ_ID}/1")
+
+    assert response.status_code == 200
+    assert response.json()["responses"][0]["options"]["A"] == "Nucleus"
+    stored = db.user_responses.find_one({"quiz_id": QUIZ_ID})
+    assert stored["snapshot_version"] == ATTEMPT_SNAPSHOT_VERSION
+    assert stored["responses"][0]["difficulty"] == "easy"
+
+
+def test_legacy_attempt_keeps_the_key_it_was_graded_against():
+    db = fake_db()
+    user_cache.clear()
+    #  Graded with key C, then the quiz key was re-verified to A
+    db.quizzes.update_one({"quiz_id": QUIZ_ID}, {"$set": {"questions.0.correct_answer": "A", "questions.0.verified_answer": "A"}})
+    db.user_responses.insert_one({
+        "user_id": TEST_USER_ID,
+        "quiz_id": QUIZ_ID,
+        "attempt_number": 1,
+        "submitted_at": 0,
+        "responses": [{
+            "question_text": QUESTION["question_text"],
+            "selected_answer": "C",
+            "claimed_answer": "C",
+            "verified_answer": "C",
+            "correct_answer": "C",
+            "is_correct": True,
+        }],
+        "summary": {},
+    })
+    with patch("utils.user_mgmt_methods.users_collection", db.users), \
+         patch("routes.response_routes.quizzes_collection", db.quizzes), \
+         patch("routes.response_routes.responses_collection", db.user_responses):
+        response = client.get(f"/responses/quiz_attempt_results/{TEST_USER_ID}/{QUIZ_ID}/1")
+
+    result = response.json()["responses"][0]
+    assert result["correct_answer"] == result["verified_answer"] == "C" and result["is_correct"] is True
+    assert result["options"]["C"] == "Mitochondria"
+    stored = db.user_responses.find_one({"quiz_id": QUIZ_ID})["responses"][0]
+    assert stored["correct_answer"] == "C" and stored["difficulty"] == "easy"
@@ -0,0 +1,103 @@
+import sys
+import os
+import time
+from unittest.mock import patch
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from jose import jwt
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import user_mgmt_methods as auth
+
+USER_ID = str(ObjectId())
+
+
+def make_token(sub=USER_ID, exp_in=3600):
+    return jwt.encode({"sub": sub, "exp": int(time.time()) + exp_in}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    auth.token_cache.clear()
+    auth.user_cache.clear()
+    yield
+    auth.token_cache.clear()
+    auth.user_cache.clear()
+
+
+def test_token_signature_is_checked_once_until_expiry():
+    token = make_token()
+    with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+        assert auth.get_current_user(f"Bearer {token}") == USER_ID
+        assert auth.get_current_user(f"Bearer {token}") == USER_ID
+    assert decode.call_count == 1
+
+
+def test_cached_token_expires_with_its_exp_claim():
+    token = make_token(exp_in=60)
+    auth.get_current_user(f"Bearer {token}")
+    with patch.object(auth.time, "time", return_value=time.time() + 120), \
+            patch.object(auth.jwt, "decode", side_effect=auth.JWTError("expired")):
+        with pytest.raises(HTTPException) as exc:
+            auth.get_current_user(f"Bearer {token}")
+    assert exc.value.status_code == 401
+
+
+def test_invalid_token_is_rejected_and_not_cached():
+    with pytest.raises(HTTPException) as exc:
+        auth.get_current_user("Bearer not-a-jwt")
+    assert exc.value.status_code == 401
+    assert len(auth.token_cache) == 0
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_existing_user_is_read_once_and_returned_as_copy(mock_users):
+    mock_users.find_one.return_value = {"_id": ObjectId(USER_ID), "performance": {"total_quizzes": 3}}
+
+    first = auth.load_user(USER_ID)
+    first["performance"]["total_quizzes"] = 99
+    second = auth.load_user(USER_ID)
+
+    assert mock_users.find_one.call_count == 1
+    assert second["performance"]["total_quizzes"] == 3
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_missing_user_is_not_cached(mock_users):
+    mock_users.find_one.return_value = None
+    assert auth.load_user(USER_ID) is None
+    assert auth.load_user(USER_ID) is None
+    assert mock_users.find_one.call_count == 2
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_invalidate_user_forces_a_fresh_read(mock_users):
+    mock_users.find_one.return_value = {"_id": ObjectId(USER_ID)}
+    auth.load_user(USER_ID)
+    auth.invalidate_user(USER_ID)
+    auth.load_user(USER_ID)
+    assert mock_users.find_one.call_count == 2
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_user_document_dependency_checks_existence_before_ownership(mock_users):
+    mock_users.find_one.return_value = None
+    with pytest.raises(HTTPException) as exc:
+        auth.get_registered_user(USER_ID, current_user="someone-else")
+    assert exc.value.status_code == 404
+    assert "register" in exc.value.detail
+
+    mock_users.find_one.return_value = {"_id": ObjectId(USER_ID)}
+    with pytest.raises(HTTPException) as exc:
+        auth.get_user_document(USER_ID, current_user="someone-else")
+    assert exc.value.status_code == 403
+
+    assert auth.get_user_document(USER_ID, current_user=USER_ID)["_id"] == ObjectId(USER_ID)
+
+
+def test_malformed_user_id_is_a_bad_request():
+    with pytest.raises(HTTPException) as exc:
+        auth.load_user("not-an-object-id")
+    assert exc.value.status_code == 400
@@ -0,0 +1,95 @@
+import sys
+import os
+import re
+import zlib
+import numpy as np
+import faiss
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.explanation.biology_gate as biology_gate
+from utils.explanation.biology_gate import ACCEPT, REJECT, UNCERTAIN, BiologyGate
+
+PASSAGES = [
+    "The mitochondria produce ATP through cellular respiration in the cell. Glucose is oxidised to release energy for the cell.",
+    "Photosynthesis in the chloroplast converts light energy into glucose. Chlorophyll absorbs light in the leaf cells of plants.",
+    "DNA carries genes on chromosomes inside the nucleus of the cell. Mutation changes the sequence of genes in DNA.",
+    "Enzymes are proteins that speed up metabolic reactions in the cell. Temperature and pH change the activity of enzymes.",
+]
+
+
+def bag_of_words(texts, dim=256):
+    """Deterministic hashed bag-of-words encoder standing in for the sentence model."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"[a-z]+", text.lower()):
+            matrix[row, zlib.crc32(word.encode()) % dim] += 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.clip(norms, 1e-12, None)
+
+
+def make_gate(**kwargs):
+    vectors = bag_of_words(PASSAGES)
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+    return BiologyGate(bag_of_words, index, PASSAGES, **kwargs)
+
+
+def test_calibration_produces_ordered_bands():
+    thresholds = make_gate().calibrate()
+    for reject_below, accept_at in thresholds.values():
+        assert reject_below <= accept_at
+
+
+def test_thresholds_drive_classification():
+    gate = make_gate(use_centroid=False)
+    gate.calibrate()
+    gate.thresholds = {"nn": (0.3, 0.5)}
+    assert gate.classify("Which organelle produces ATP through cellular respiration in the cell?") == ACCEPT
+    assert gate.classify("Who won the football match yesterday?") == REJECT
+
+
+def test_uncertain_band_defers_to_remote_check_in_hybrid_mode():
+    gate = make_gate(use_centroid=False)
+    gate.calibrate()
+    gate.thresholds = {"nn": (-1.0, 2.0)}
+    remote = MagicMock(return_value=False)
+
+    assert gate.classify("anything") == UNCERTAIN
+    assert gate.is_biology("anything", remote_check=remote, mode="hybrid") is False
+    remote.assert_called_once()
+    assert gate.is_biology("anything", remote_check=remote, mode="local") is True
+    assert remote.call_count == 1
+
+
+def test_decisive_local_score_skips_remote_check():
+    gate = make_gate(use_centroid=False)
+    gate.calibrate()
+    gate.thresholds = {"nn": (-1.0, -0.5)}
+    remote = MagicMock(return_value=False)
+
+    assert gate.is_biology("Which organelle produces ATP?", remote_check=remote, mode="hybrid") is True
+    remote.assert_not_called()
+
+
+def test_failed_calibration_disables_the_gate_until_the_backoff_expires():
+
+    source = MagicMock(side_effect=FileNotFoundError("syllabus missing"))
+    gate = BiologyGate(bag_of_words, source=source, use_centroid=False)
+    remote = MagicMock(return_value=True)
+
+    with patch.object(biology_gate.time, "monotonic", return_value=1000.0):
+        assert gate.calibrate() is None
+        assert gate.classify("Which organelle produces ATP?") == UNCERTAIN
+        assert gate.is_biology("Which organelle produces ATP?", remote_check=remote, mode="hybrid") is True
+    assert source.call_count == 1
+
+    vectors = bag_of_words(PASSAGES)
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+    source.side_effect = None
+    source.return_value = (index, PASSAGES, vectors)
+    with patch.object(biology_gate.time, "monotonic", return_value=1000.0 + biology_gate.CALIBRATION_RETRY_SECONDS):
+        assert gate.calibrate() is not None
+    assert source.call_count == 2
@@ -0,0 +1,112 @@
+import sys
+import os
+import time
+from unittest.mock import patch
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import app
+from utils.user_mgmt_methods import get_current_user, user_cache
+
+TEST_USER_ID = str(ObjectId())
+USER_DOC = {
+    "_id": ObjectId(TEST_USER_ID),
+    "performance": {
+        "total_quizzes": 2,
+        "accuracy_easy": 80,
+        "consistency_score": 90,
+        "last_10_quizzes": [
+            {"accuracy": 60.0, "total_time": 120, "timestamp": time.time() - 86400},
+            {"accuracy": 80.0, "total_time": 100, "timestamp": time.time()},
+        ],
+    },
+}
+
+client = TestClient(app)
+
+
+def setup_module():
+    app.dependency_overrides[get_current_user] = lambda: TEST_USER_ID
+
+
+def teardown_module():
+    app.dependency_overrides.pop(get_current_user, None)
+    user_cache.clear()
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_dashboard_reads_the_user_once_for_every_section(mock_users):
+    user_cache.clear()
+    mock_users.find_one.return_value = USER_DOC
+
+    response = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=dashboard_data,progress_insights,user_streak,engagement_score")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"dashboard_data", "progress_insights", "user_streak", "engagement_score"}
+    assert body["dashboard_data"]["total_quizzes"] == 2
+    assert body["progress_insights"]["accuracy_improvement"] == 20.0
+    assert body["user_streak"]["longest_streak"] == 2
+    assert mock_users.find_one.call_count == 1
+    assert response.headers["etag"].startswith('W/"')
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_dashboard_etag_revalidates_until_a_quiz_is_taken(mock_users):
+    user_cache.clear()
+    mock_users.find_one.return_value = USER_DOC
+    etag = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=dashboard_data").headers["etag"]
+
+    cached = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=dashboard_data", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+
+    user_cache.clear()
+    mock_users.find_one.return_value = {**USER_DOC, "performance": {**USER_DOC["performance"], "total_quizzes": 3}}
+    fresh = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=dashboard_data", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.headers["etag"] != etag
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_dashboard_etag_changes_when_a_retake_moves_the_streak(mock_users):
+    from utils.activity import apply_days, day_number
+
+    today = day_number()
+    yesterday = apply_days(None, [today - 1])
+    user_cache.clear()
+    mock_users.find_one.return_value = {**USER_DOC, "activity": yesterday}
+    etag = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=user_streak").headers["etag"]
+
+    #  A retake only records activity; total_quizzes stays the same
+    user_cache.clear()
+    mock_users.find_one.return_value = {**USER_DOC, "activity": apply_days(yesterday, [today])}
+    fresh = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=user_streak", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.headers["etag"] != etag
+    assert fresh.json()["user_streak"]["streak"] == 2
+
+
+@patch("routes.response_routes.users_collection")
+@patch("utils.user_mgmt_methods.users_collection")
+def test_dashboard_never_revalidates_the_cross_user_comparison(mock_users, mock_all_users):
+    user_cache.clear()
+    mock_users.find_one.return_value = USER_DOC
+    mock_all_users.find.return_value = [USER_DOC]
+
+    for fields in ("performance_comparison", ""):
+        response = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields={fields}", headers={"If-None-Match": "*"})
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "private, no-store"
+
+
+@patch("utils.user_mgmt_methods.users_collection")
+def test_dashboard_rejects_unknown_sections_and_reports_missing_data(mock_users):
+    user_cache.clear()
+    mock_users.find_one.return_value = {"_id": ObjectId(TEST_USER_ID)}
+
+    assert client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=leaderboard").status_code == 400
+
+    body = client.get(f"/responses/dashboard/{TEST_USER_ID}?fields=engagement_score,dashboard_data").json()
+    assert body["engagement_score"] == {"message": "No performance data found."}
+    assert body["dashboard_data"]["total_quizzes"] == 0
@@ -0,0 +1,67 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.embedding_pipeline as pipeline
+from utils.embedding_store import load_embedding_artifact
+
+
+class CountingModel:
+    """Deterministic stand-in for SentenceTransformer that counts encoded rows."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return np.array([[len(t), t.count("a") + 1, t.count("e") + 1, 1.0] for t in texts])
+
+
+def write_unit_dataset(tmp_path, texts):
+    path = tmp_path / "dataset" / "unit-wise-dataset"
+    path.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "Question Text": texts,
+        "Assigned_Unit": ["Unit 01"] * len(texts),
+    }).to_csv(path / "unit_tagged_mcq_dataset.csv", index=False)
+
+
+def test_rebuild_only_encodes_changed_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model = CountingModel()
+
+    write_unit_dataset(tmp_path, ["alpha", "beta", "gamma"])
+    assert pipeline.build_unit_artifacts(model) == 3
+
+    write_unit_dataset(tmp_path, ["alpha", "beta edited", "gamma", "delta"])
+    assert pipeline.build_unit_artifacts(model) == 2
+    assert model.encoded == 5
+
+    matrix, manifest = load_embedding_artifact(pipeline.UNIT_EMBEDDING_ARTIFACT)
+    assert manifest["shape"] == [4, 4] and manifest["normalized"] is True
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0)
+
+
+def test_full_rebuild_reencodes_everything(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model = CountingModel()
+    write_unit_dataset(tmp_path, ["alpha", "beta"])
+
+    pipeline.build_unit_artifacts(model)
+    assert pipeline.build_unit_artifacts(model, full=True) == 2
+
+
+def test_new_rows_are_assigned_to_saved_centroids(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "dataset").mkdir()
+    centroids = np.array([[0.0, 0.0], [10.0, 10.0]], dtype=np.float32)
+    np.save(pipeline.QUESTION_CENTROIDS_PATH, centroids)
+
+    labels = pipeline.assign_clusters(np.array([[1.0, 1.0], [9.0, 8.0], [6.0, 6.0]]))
+    assert labels.tolist() == [0, 1, 1]
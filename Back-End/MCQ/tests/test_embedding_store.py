@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.embedding_store import (
+    StaleArtifactError,
+    content_hash,
+    load_embedding_artifact,
+    row_hash,
+    save_embedding_artifact,
+)
+
+
+def test_artifact_round_trip_is_memory_mapped(tmp_path):
+    prefix = str(tmp_path / "unit_embeddings")
+    row_ids = [row_hash(t) for t in ["q0", "q1", "q2"]]
+    matrix = np.random.default_rng(0).random((3, 4), dtype=np.float32)
+
+    save_embedding_artifact(prefix, matrix, row_ids)
+    loaded, manifest = load_embedding_artifact(prefix, expected_hash=content_hash(row_ids))
+
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, matrix)
+    assert manifest["ids"] == row_ids and manifest["shape"] == [3, 4]
+
+
+def test_float16_artifact(tmp_path):
+    prefix = str(tmp_path / "half")
+    manifest = save_embedding_artifact(prefix, np.ones((2, 3)), ["a", "b"], dtype="float16")
+    loaded, _ = load_embedding_artifact(prefix)
+    assert manifest["dtype"] == "float16" and loaded.dtype == np.float16
+
+
+def test_stale_or_missing_artifact_raises(tmp_path):
+    prefix = str(tmp_path / "unit_embeddings")
+    with pytest.raises(FileNotFoundError):
+        load_embedding_artifact(prefix)
+
+    save_embedding_artifact(prefix, np.zeros((2, 3)), [row_hash("q0"), row_hash("q1")])
+    with pytest.raises(StaleArtifactError):
+        load_embedding_artifact(prefix, expected_hash=content_hash([row_hash("q0"), row_hash("edited")]))
+
+
+def test_content_hash_depends_on_model():
+    row_ids = [row_hash("q0")]
+    assert content_hash(row_ids, "model-a") != content_hash(row_ids, "model-b")
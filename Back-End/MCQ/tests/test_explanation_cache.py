@@ -0,0 +1,62 @@
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from pymongo.errors import PyMongoError
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.explanation.explanation_cache import ExplanationCache, explanation_key
+
+OPTIONS = {"A": "Mitochondria", "B": "Ribosome", "C": "Nucleus", "D": "Golgi body", "E": "Lysosome"}
+RESULT = {"predicted_answer": "A", "explanation": "Explanation: Mitochondria make ATP."}
+
+
+def test_key_ignores_case_whitespace_and_option_order():
+    reordered = dict(reversed(list(OPTIONS.items())))
+    assert explanation_key("Which organelle  makes ATP?", OPTIONS) == explanation_key(
+        " which organelle makes atp?", reordered
+    )
+    assert explanation_key("Which organelle makes ATP?", OPTIONS) != explanation_key(
+        "Which organelle makes ATP?", {**OPTIONS, "A": "Chloroplast"}
+    )
+
+
+def test_put_then_get_is_served_from_memory():
+    collection = MagicMock()
+    cache = ExplanationCache(collection)
+    key = explanation_key("Which organelle makes ATP?", OPTIONS)
+
+    cache.put(key, "Which organelle makes ATP?", OPTIONS, RESULT, {"source": "llama+gemini_review"})
+    assert cache.get(key) == RESULT
+    collection.find_one.assert_not_called()
+    stored = collection.update_one.call_args[0][1]["$set"]
+    assert stored["provenance"] == {"source": "llama+gemini_review"} and stored["expires_at"] > datetime.utcnow()
+
+
+def test_mongo_hit_populates_memory_tier():
+    collection = MagicMock()
+    collection.find_one.return_value = {**RESULT, "expires_at": datetime.utcnow() + timedelta(days=1)}
+    cache = ExplanationCache(collection)
+
+    assert cache.get("k") == RESULT
+    assert cache.get("k") == RESULT
+    assert collection.find_one.call_count == 1
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ExplanationCache(MagicMock(), max_size=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key, OPTIONS, RESULT, {"source": "test"})
+    assert list(cache._entries) == ["b", "c"]
+
+
+def test_mongo_errors_degrade_to_a_miss():
+    collection = MagicMock()
+    collection.find_one.side_effect = PyMongoError("down")
+    collection.update_one.side_effect = PyMongoError("down")
+    cache = ExplanationCache(collection)
+
+    assert cache.get("missing") is None
+    cache.put("k", "q", OPTIONS, RESULT, {"source": "test"})
+    assert cache.get("k") == RESULT
@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import app
+from utils.explanation.explanation_helper import stream_explanation
+
+client = TestClient(app)
+
+OPTIONS = {"A": "Nucleus", "B": "Ribosome", "C": "Mitochondria", "D": "Golgi body", "E": "Lysosome"}
+QUESTION = "Which organelle is the powerhouse of the cell?"
+STREAM_CHUNKS = ["Answer: ", "C\n", "Explanation: Mitochondria produce ", "most of the cell's ATP."]
+
+
+def fake_stream(*args, **kwargs):
+    assert kwargs.get("stream") is True
+    return iter({"choices": [{"text": text}]} for text in STREAM_CHUNKS)
+
+
+def uncached():
+    cache = MagicMock()
+    cache.get.return_value = None
+    return cache
+
+
+@patch("utils.explanation.explanation_helper.decide_review", return_value="skipped_confident")
+@patch("utils.explanation.explanation_helper.rag.get_context_with_score", return_value=(["Mitochondria make ATP."], 0.8))
+@patch("utils.explanation.explanation_helper.llm", side_effect=fake_stream)
+def test_stream_yields_tokens_then_final(mock_llm, mock_context, mock_decide):
+    cache = uncached()
+    with patch("utils.explanation.explanation_helper.explanation_cache", cache), \
+         patch("utils.explanation.explanation_helper.review_with_gemini") as mock_review:
+        events = list(stream_explanation(QUESTION, OPTIONS))
+
+    assert [text for event, text in events if event == "token"] == STREAM_CHUNKS
+    event, final = events[-1]
+    assert event == "final"
+    assert final["predicted_answer"] == "C" and final["corrected"] is False
+    assert final["review"] == "skipped_confident"
+    mock_review.assert_not_called()
+    cache.put.assert_called_once()
+
+
+@patch("utils.explanation.explanation_helper.decide_review", return_value="sync")
+@patch("utils.explanation.explanation_helper.rag.get_context_with_score", return_value=([], 0.1))
+@patch("utils.explanation.explanation_helper.llm", side_effect=fake_stream)
+def test_stream_final_event_reports_review_correction(mock_llm, mock_context, mock_decide):
+    corrected = {"predicted_answer": "B", "explanation": "Explanation: corrected."}
+    with patch("utils.explanation.explanation_helper.explanation_cache", uncached()), \
+         patch("utils.explanation.explanation_helper.review_with_gemini", return_value=corrected):
+        event, final = list(stream_explanation(QUESTION, OPTIONS))[-1]
+
+    assert final["predicted_answer"] == "B" and final["corrected"] is True
+
+
+@patch("utils.explanation.explanation_helper.decide_review", return_value="async")
+@patch("utils.explanation.explanation_helper.rag.get_context_with_score", return_value=([], 0.1))
+@patch("utils.explanation.explanation_helper.llm", side_effect=fake_stream)
+def test_uncertain_answer_is_returned_now_and_reviewed_in_background(mock_llm, mock_context, mock_decide):
+    executor = MagicMock()
+    with patch("utils.explanation.explanation_helper.explanation_cache", uncached()), \
+         patch("utils.explanation.explanation_helper.review_executor", executor), \
+         patch("utils.explanation.explanation_helper.review_with_gemini") as mock_review:
+        event, final = list(stream_explanation(QUESTION, OPTIONS))[-1]
+
+    assert final["predicted_answer"] == "C" and final["review"] == "async"
+    mock_review.assert_not_called()
+    assert executor.submit.call_args[0][0].__name__ == "review_in_background"
+
+
+@patch("routes.explanation_routes.is_biology_question", return_value=True)
+@patch("routes.explanation_routes.get_cached_explanation", return_value=None)
+@patch("routes.explanation_routes.stream_explanation")
+def test_explain_stream_route_emits_sse(mock_stream, mock_cached, mock_gate):
+    mock_stream.return_value = iter([
+        ("token", "Answer: C"),
+        ("final", {"predicted_answer": "C", "explanation": "Explanation: ATP.", "corrected": False}),
+    ])
+    response = client.post("/explanations/mcq/explain_stream", json={"question": QUESTION, "options": OPTIONS})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [b for b in response.text.split("\n\n") if b]
+    assert blocks[0].startswith("event: token")
+    assert blocks[-1].startswith("event: final")
+    assert json.loads(blocks[-1].split("data: ", 1)[1])["predicted_answer"] == "C"
@@ -77,3 +77,40 @@ def test_generate_mcq_based_on_performance_success(mock_theta, mock_context, moc
         assert "question" in result[0]
         assert result[0]["is_verified"] is True
         assert result[0]["correct_answer"] == "C"
+
+@patch("utils.generate_question.verify_mcq_with_llm", return_value=(True, "C", "C"))
+@patch("utils.generate_question.index.add")
+@patch("utils.generate_question.is_duplicate_faiss", return_value=False)
+@patch("utils.generate_question.embedding_model.encode", return_value=np.array([[0.1]*384], dtype=np.float32))
+@patch("utils.generate_question.retrieve_context_questions", return_value=pd.DataFrame())
+@patch("utils.generate_question.get_mcq_grammar", return_value="GRAMMAR")
+@patch("utils.generate_question.is_constrained_decoding_enabled", return_value=True)
+@patch("utils.generate_question.llm")
+def test_generate_mcq_constrained_mode_passes_grammar(mock_llm, mock_enabled, mock_grammar, mock_context, mock_encode, mock_dup, mock_add, mock_verify):
+    mock_llm.tokenize.return_value = [0] * 50
+    mock_llm.return_value = iter([{"choices": [{"text": FAKE_RAW_OUTPUT}]}])
+    mock_df = pd.DataFrame([{
+        "Question Text": "What is the powerhouse of the cell?",
+        "Correct Answer": "C",
+        "Cluster": 1
+    }])
+    accepted_before = gq.questions_accepted_total.value(mode="constrained")
+
+    with patch.object(gq, "dataset", mock_df):
+        result = generate_mcq("easy", str(ObjectId()), max_retries=1)
+
+    assert mock_llm.call_args.kwargs["grammar"] == "GRAMMAR"
+    assert mock_llm.call_args.kwargs["stream"] is True
+    mock_grammar.assert_called_with(3)
+    assert len(result) == 1
+    assert gq.questions_accepted_total.value(mode="constrained") == accepted_before + 1
+
+
+def test_build_mcq_gbnf_describes_exact_question_count():
+    from utils.mcq_grammar import build_mcq_gbnf
+
+    grammar = build_mcq_gbnf(2)
+    assert grammar.startswith('root ::= question1 "\\n" question2')
+    assert '"Question 2: "' in grammar and '"Question 3: "' not in grammar
+    assert '"E) " text' in grammar
+    assert '"Correct Answer: " [A-E]' in grammar
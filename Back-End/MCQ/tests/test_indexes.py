@@ -0,0 +1,72 @@
+import sys
+import os
+import pytest
+from pymongo import DESCENDING
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.database import db
+from database.indexes import (
+    apply_index_migrations,
+    get_applied_index_version,
+    report_index_usage,
+    LATEST_INDEX_VERSION,
+)
+
+# Hot lookups that must be served by an index: (collection, filter, sort)
+HOT_QUERIES = [
+    ("quizzes", {"quiz_id": "test-quiz"}, None),
+    ("quizzes", {"user_id": "000000000000000000000001"}, [("created_at", DESCENDING)]),
+    (
+        "user_responses",
+        {"user_id": "000000000000000000000001", "quiz_id": "test-quiz", "attempt_number": 1},
+        None,
+    ),
+    ("user_responses", {"user_id": "000000000000000000000001", "quiz_id": "test-quiz"}, None),
+    ("user_responses", {"user_id": "000000000000000000000001"}, [("submitted_at", DESCENDING)]),
+    ("unit_quiz_responses", {"user_id": "000000000000000000000001", "unit_name": "Unit 01"}, None),
+    ("unit_seen_questions", {"user_id": "000000000000000000000001", "unit_name": "Unit 01"}, None),
+    ("users", {"performance.total_quizzes": {"$gt": 0}}, None),
+    ("fallback_questions", {"difficulty": "easy", "rand": {"$gte": 0.5}}, [("rand", 1)]),
+]
+
+
+def collect_stages(plan):
+    """Flatten the stage names of an explain() winning plan."""
+    stages = [plan.get("stage")]
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            stages.extend(collect_stages(plan[child_key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(collect_stages(child))
+    return stages
+
+
+@pytest.fixture(scope="module", autouse=True)
+def migrated_db():
+    apply_index_migrations(db)
+    yield db
+
+
+def test_migrations_record_latest_version():
+    assert get_applied_index_version(db) == LATEST_INDEX_VERSION
+
+
+def test_migrations_are_idempotent():
+    assert apply_index_migrations(db) == LATEST_INDEX_VERSION
+    assert apply_index_migrations(db, force=True) == LATEST_INDEX_VERSION
+
+
+@pytest.mark.parametrize("collection_name, query, sort", HOT_QUERIES)
+def test_hot_queries_do_not_collscan(collection_name, query, sort):
+    cursor = db[collection_name].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    plan = cursor.explain()["queryPlanner"]["winningPlan"]
+    stages = collect_stages(plan)
+    assert "COLLSCAN" not in stages, f"{collection_name} {query} fell back to {stages}"
+
+
+def test_report_index_usage_lists_managed_indexes():
+    usage = report_index_usage(db)
+    assert "quiz_id_1" in {s["name"] for s in usage["quizzes"]}
@@ -1,6 +1,7 @@
 import sys
 import os
 from bson import ObjectId
+from unittest.mock import patch
 
 # Dynamically add the absolute path to project root (MCQ) to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -33,4 +34,38 @@ def test_get_irt_based_difficulty_distribution_low_theta():
 def test_get_irt_based_difficulty_distribution_high_theta():
     distribution = get_irt_based_difficulty_distribution(dummy_user_id, 10)
     assert sum(distribution.values()) == 10
-    assert isinstance(distribution, dict)
\ No newline at end of file
+    assert isinstance(distribution, dict)
+
+
+def test_get_irt_based_difficulty_distribution_uses_response_aggregation():
+    rows = [
+        {"_id": "easy", "total": 9, "correct": 9},
+        {"_id": "medium", "total": 9, "correct": 2},
+        {"_id": "hard", "total": 9, "correct": 1},
+    ]
+    with patch("utils.quiz_generation_methods.responses_collection") as mock_responses:
+        mock_responses.aggregate.return_value = iter(rows)
+        distribution = get_irt_based_difficulty_distribution(dummy_user_id, 10)
+
+    pipeline = mock_responses.aggregate.call_args[0][0]
+    assert pipeline[0] == {"$match": {"user_id": dummy_user_id}}
+    assert [list(stage)[0] for stage in pipeline] == ["$match", "$sort", "$limit", "$project", "$unwind", "$group"]
+    # Strong on easy, weak on medium and hard -> fewer easy questions
+    assert distribution == {"easy": 1, "medium": 4, "hard": 5}
+
+
+def test_fetch_questions_from_db_prefers_level_and_tops_up():
+    from utils.quiz_generation_methods import fetch_questions_from_db
+
+    hard_question = {"question_text": "Hard one?", "difficulty": "hard"}
+    medium_question = {"question_text": "Medium one?", "difficulty": "medium"}
+    with patch("utils.quiz_generation_methods.get_recently_seen_hashes", return_value={"seen"}), \
+         patch("utils.quiz_generation_methods.sample_pool_questions",
+               side_effect=[[hard_question], [medium_question]]) as mock_sample:
+        questions = fetch_questions_from_db(2, difficulty="hard", user_id=dummy_user_id)
+
+    assert questions == [hard_question, medium_question]
+    first_call, second_call = mock_sample.call_args_list
+    assert first_call.kwargs["difficulty"] == "hard"
+    assert "seen" in first_call.kwargs["exclude_hashes"]
+    assert second_call.args[0] == 1
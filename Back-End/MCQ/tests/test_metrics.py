@@ -0,0 +1,93 @@
+import sys
+import os
+import pandas as pd
+import numpy as np
+from unittest.mock import patch
+from bson import ObjectId
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.metrics import Counter, Histogram, render_prometheus, histogram, counter
+import utils.generate_question as gq
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    hist = Histogram("test_latency_seconds", "Test latency", ["stage"], buckets=(0.1, 1, 10))
+    for value in (0.05, 0.5, 0.7, 20):
+        hist.observe(value, stage="llm")
+
+    [(labels, sample)] = hist.samples()
+    assert labels == {"stage": "llm"}
+    assert sample["buckets"] == [(0.1, 1), (1.0, 3), (10.0, 3), (float("inf"), 4)]
+    assert sample["count"] == 4 and abs(sample["sum"] - 21.25) < 1e-9
+
+
+def test_histogram_timer_records_even_when_the_block_raises():
+    hist = Histogram("test_timer_seconds", "Test timer", ["stage"])
+    try:
+        with hist.time(stage="verify"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert hist.count(stage="verify") == 1
+
+
+def test_render_prometheus_text_format():
+    calls = counter("test_render_calls_total", "Calls with a \"quoted\" doc", ["mode"])
+    calls.inc(mode="free")
+    hist = histogram("test_render_seconds", "Render test", ["stage"], buckets=(1,))
+    hist.observe(0.5, stage="extract")
+
+    text = render_prometheus()
+    assert '# HELP test_render_calls_total Calls with a \\"quoted\\" doc' in text
+    assert "# TYPE test_render_calls_total counter" in text
+    assert 'test_render_calls_total{mode="free"} 1' in text
+    assert "# TYPE test_render_seconds histogram" in text
+    assert 'test_render_seconds_bucket{stage="extract",le="1.0"} 1' in text
+    assert 'test_render_seconds_bucket{stage="extract",le="+Inf"} 1' in text
+    assert 'test_render_seconds_count{stage="extract"} 1' in text
+
+
+def test_metric_name_cannot_be_reused_with_another_type():
+    counter("test_clash_total", "Clash")
+    try:
+        histogram("test_clash_total", "Clash")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+@patch("utils.generate_question.verify_mcq_with_llm", return_value=(True, "C", "C"))
+@patch("utils.generate_question.is_duplicate_faiss", return_value=False)
+@patch("utils.generate_question.retrieve_context_questions", return_value=pd.DataFrame())
+@patch("utils.generate_question.is_constrained_decoding_enabled", return_value=False)
+@patch("utils.generate_question.llm")
+def test_generate_mcq_records_stages_and_rejection_reasons(mock_llm, mock_enabled, mock_context, mock_dup, mock_verify):
+    duplicate_options = """
+Question 1: Which organelle makes ATP?
+A) Mitochondria
+B) Mitochondria
+C) Nucleus
+D) Ribosome
+E) Lysosome
+Correct Answer: A
+"""
+    mock_llm.tokenize.return_value = [0] * 50
+    mock_llm.side_effect = lambda *args, **kwargs: iter([
+        {"choices": [{"text": duplicate_options[:40]}]},
+        {"choices": [{"text": duplicate_options[40:]}]},
+    ])
+    mock_df = pd.DataFrame([{"Question Text": "Which organelle makes ATP?", "Correct Answer": "A", "Cluster": 1}])
+    rejected_before = gq.questions_rejected_total.value(generator="standard", reason="duplicate_options")
+    tokens_before = gq.llm_tokens_total.value(mode="free")
+    prompt_evals_before = gq.generation_stage_seconds.count(generator="standard", stage="prompt_eval")
+
+    with patch.object(gq, "dataset", mock_df):
+        result = gq.generate_mcq("easy", str(ObjectId()), max_retries=1)
+
+    assert result == []
+    assert gq.questions_rejected_total.value(generator="standard", reason="duplicate_options") == rejected_before + 1
+    assert gq.llm_tokens_total.value(mode="free") == tokens_before + 2
+    assert gq.generation_stage_seconds.count(generator="standard", stage="prompt_eval") == prompt_evals_before + 1
+    mock_verify.assert_not_called()
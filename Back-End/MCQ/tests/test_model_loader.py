@@ -0,0 +1,103 @@
+import sys
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.model_loader import LazyResource, ModelRegistry
+
+
+class FakeModel:
+    def encode(self, texts):
+        return [len(t) for t in texts]
+
+    def __call__(self, prompt):
+        return {"choices": [{"text": prompt.upper()}]}
+
+
+def test_loads_once_under_concurrent_access():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return FakeModel()
+
+    resource = LazyResource("model", loader)
+    threads = [threading.Thread(target=resource.get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    status = resource.status()
+    assert status["loaded"] and status["seconds"] >= 0.05
+
+
+def test_proxy_forwards_attributes_and_calls_lazily():
+    resource = LazyResource("model", FakeModel)
+    assert not resource.loaded
+    assert resource.encode(["ab", "c"]) == [2, 1]
+    assert resource("hi")["choices"][0]["text"] == "HI"
+    assert resource.loaded
+
+
+def test_attribute_patches_are_applied_and_restored():
+    resource = LazyResource("model", FakeModel)
+    with patch.object(resource, "encode", return_value=[0]):
+        assert resource.encode(["x"]) == [0]
+    assert resource.encode(["x"]) == [1]
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("model file missing")
+        return FakeModel()
+
+    registry = ModelRegistry()
+    resource = registry.register("llm", flaky)
+    report = registry.warmup()
+    assert not report["ready"] and report["components"]["llm"]["error"] == "model file missing"
+
+    assert resource.encode(["a"]) == [1]
+    assert registry.readiness()["ready"]
+
+
+def test_warmup_rejects_unknown_components():
+    registry = ModelRegistry()
+    registry.register("llm", FakeModel)
+    with pytest.raises(KeyError):
+        registry.warmup(["llm", "gpu"])
+
+
+def test_provided_component_skips_the_loader():
+    def never():
+        raise AssertionError("loader should not run")
+
+    registry = ModelRegistry()
+    resource = registry.register("embedding_model", never)
+    registry.provide("embedding_model", FakeModel())
+    assert resource.encode(["abc"]) == [3]
+    assert registry.readiness()["ready"]
+
+
+def test_warmup_route_is_restricted_to_internal_callers():
+    from fastapi.testclient import TestClient
+    from main import app
+    import routes.system_routes as system_routes
+
+    client = TestClient(app)
+    with patch.object(system_routes.registry, "warmup", return_value={"ready": True}) as warmup, \
+         patch.object(system_routes, "WARMUP_TOKEN", "s3cret"):
+        assert client.post("/system/warmup").status_code == 403
+        assert client.post("/system/warmup", headers={"X-Warmup-Token": "wrong"}).status_code == 403
+        assert client.post("/system/warmup", headers={"X-Warmup-Token": "s3cret"}).json() == {"ready": True}
+    assert warmup.call_count == 1
@@ -0,0 +1,89 @@
+import sys
+import os
+import mongomock
+import pytest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.question_store as store
+
+QUESTION = {
+    "question_text": "What is the powerhouse of the cell?",
+    "option1": "Nucleus",
+    "option2": "Ribosome",
+    "option3": "Mitochondria",
+    "option4": "Golgi apparatus",
+    "option5": "Lysosome",
+    "correct_answer": "C",
+    "difficulty": "easy",
+}
+
+
+def fake_db():
+    store.question_cache.clear()
+    return mongomock.MongoClient().db
+
+
+def test_shared_question_is_stored_once_with_per_quiz_overrides():
+    db = fake_db()
+    with patch.object(store, "questions_collection", db.questions):
+        first = store.normalize_quiz({"quiz_id": "q1", "questions": [dict(QUESTION)]})
+        second = store.normalize_quiz({"quiz_id": "q2", "questions": [{**QUESTION, "difficulty": "hard", "source": "fallback_pool"}]})
+
+        assert db.questions.count_documents({}) == 1
+        assert "questions" not in first and "question_text" not in first["question_refs"][0]
+        assert first["question_refs"][0]["question_id"] == second["question_refs"][0]["question_id"]
+
+        hydrated = store.hydrate_quiz(second)
+    assert hydrated["questions"] == [{**QUESTION, "difficulty": "hard", "source": "fallback_pool"}]
+
+
+def test_hydration_batches_misses_and_serves_repeats_from_the_lru():
+    db = fake_db()
+    other = {**QUESTION, "question_text": "Which organelle makes ribosomes?"}
+    with patch.object(store, "questions_collection", db.questions):
+        quiz = store.normalize_quiz({"quiz_id": "q1", "questions": [dict(QUESTION), other]})
+        store.question_cache.clear()  # As if read by another worker
+        with patch.object(db.questions, "find", wraps=db.questions.find) as find:
+            first = store.hydrate_quiz(dict(quiz, question_refs=list(quiz["question_refs"])))
+            again = store.hydrate_quiz(dict(quiz, question_refs=list(quiz["question_refs"])))
+
+    assert find.call_count == 1
+    assert [q["question_text"] for q in first["questions"]] == [QUESTION["question_text"], other["question_text"]]
+    assert first == again
+
+
+def test_legacy_quiz_is_returned_unchanged_and_can_be_migrated():
+    db = fake_db()
+    legacy = {"quiz_id": "old", "questions": [dict(QUESTION)]}
+    db.quizzes.insert_one(dict(legacy))
+    with patch.object(store, "questions_collection", db.questions):
+        assert store.hydrate_quiz(db.quizzes.find_one({}, {"_id": 0})) == legacy
+
+        assert store.migrate_embedded_quizzes(quizzes=db.quizzes) == 1
+        migrated = db.quizzes.find_one({}, {"_id": 0})
+        assert "questions" not in migrated
+        assert store.hydrate_quiz(migrated) == legacy
+
+
+def test_missing_shared_question_fails_instead_of_shortening_the_quiz():
+    import utils.answer_verifier as answer_verifier
+
+    db = fake_db()
+    other = {**QUESTION, "question_text": "Which organelle makes ribosomes?"}
+    with patch.object(store, "questions_collection", db.questions):
+        quiz = store.normalize_quiz({"quiz_id": "q1", "questions": [dict(QUESTION), other]})
+        db.quizzes.insert_one(dict(quiz))
+        db.questions.delete_one({"_id": quiz["question_refs"][0]["question_id"]})
+        store.question_cache.clear()
+
+        with pytest.raises(store.MissingQuestionError):
+            store.hydrate_quiz(db.quizzes.find_one({"quiz_id": "q1"}))
+
+        with patch.object(answer_verifier, "quizzes_collection", db.quizzes), \
+             patch.object(answer_verifier, "verify_mcq_with_llm") as verify:
+            answer_verifier.verify_quiz_answers_async("q1")
+        verify.assert_not_called()
+
+    assert db.quizzes.find_one({"quiz_id": "q1"})["question_refs"] == quiz["question_refs"]
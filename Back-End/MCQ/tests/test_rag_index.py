@@ -0,0 +1,50 @@
+import sys
+import os
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.explanation.rag_index import build_index
+
+
+def unit_vectors(n, dim=32, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf"])
+def test_index_types_agree_with_exact_search(index_type):
+    vectors = unit_vectors(400)
+    queries = vectors[:50]
+    _, exact = build_index(vectors, "flat").search(queries, 3)
+    _, found = build_index(vectors, index_type).search(queries, 3)
+
+    recall = np.mean([len(set(f) & set(e)) / 3 for f, e in zip(found, exact)])
+    assert recall >= 0.95
+    assert (found[:, 0] == np.arange(50)).all()
+
+
+def test_unknown_index_type_raises():
+    with pytest.raises(ValueError):
+        build_index(unit_vectors(10), "annoy")
+
+
+def test_get_context_batch_encodes_once_and_searches_once():
+    from utils.explanation.RAG_biology_helper import RAGBiology
+
+    rag = RAGBiology.__new__(RAGBiology)
+    rag.texts = ["mitochondria make ATP", "chloroplasts capture light", "ribosomes make protein"]
+    rag.model = MagicMock()
+    rag.model.encode.return_value = unit_vectors(2, dim=8, seed=1)
+    rag.index = MagicMock()
+    rag.index.search.return_value = (np.array([[0.9, 0.5], [0.7, 0.2]]), np.array([[0, 2], [1, -1]]))
+
+    contexts = rag.get_context_batch_with_scores(["atp?", "   ", "light?"], top_k=2)
+
+    rag.model.encode.assert_called_once()
+    rag.index.search.assert_called_once()
+    assert contexts[0] == (["mitochondria make ATP", "ribosomes make protein"], 0.9)
+    assert contexts[1] == ([], 0.0)
+    assert contexts[2] == (["chloroplasts capture light"], 0.7)
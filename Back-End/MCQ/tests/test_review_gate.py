@@ -0,0 +1,54 @@
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.explanation.review_gate as review_gate
+from utils.explanation.review_gate import answer_extraction_confidence, decide_review, review_stats
+
+OPTIONS = {"A": "Nucleus", "B": "Ribosome", "C": "Mitochondria", "D": "Golgi body", "E": "Lysosome"}
+QUESTION = "Which organelle is the powerhouse of the cell?"
+
+
+def setup_function():
+    review_gate.review_decisions_total.reset()
+    review_gate.review_disagreements_total.reset()
+
+
+def test_extraction_confidence_levels():
+    assert answer_extraction_confidence("Answer: C\nExplanation: ATP.", OPTIONS) == 1.0
+    assert answer_extraction_confidence("Answer: C\n2. Answer: B", OPTIONS) == 0.5
+    assert answer_extraction_confidence("C\nExplanation: ATP.", OPTIONS) == 0.3
+    assert answer_extraction_confidence("I am not sure.", OPTIONS) == 0.0
+
+
+@patch("utils.explanation.review_gate.lookup_verified_answer_text", return_value="mitochondria ")
+def test_matching_verified_answer_skips_review(mock_lookup):
+    assert decide_review(QUESTION, OPTIONS, "C", "Answer: B", 0.0) == "skipped_verified"
+
+
+@patch("utils.explanation.review_gate.lookup_verified_answer_text", return_value="Ribosome")
+def test_contradicting_verified_answer_reviews_synchronously(mock_lookup):
+    assert decide_review(QUESTION, OPTIONS, "C", "Answer: C", 0.9) == "sync"
+
+
+@patch("utils.explanation.review_gate.lookup_verified_answer_text", return_value=None)
+def test_confidence_gate_without_verified_answer(mock_lookup):
+    assert decide_review(QUESTION, OPTIONS, "C", "Answer: C", 0.9) == "skipped_confident"
+    assert decide_review(QUESTION, OPTIONS, "C", "Answer: C", 0.2) == "async"
+    assert decide_review(QUESTION, OPTIONS, "C", "C", 0.9) == "async"
+
+
+@patch("utils.explanation.review_gate.lookup_verified_answer_text", return_value=None)
+def test_review_stats_rates(mock_lookup):
+    decide_review(QUESTION, OPTIONS, "C", "Answer: C", 0.9)
+    decide_review(QUESTION, OPTIONS, "C", "Answer: C", 0.1)
+    decide_review(QUESTION, OPTIONS, "C", "Answer: C", 0.1)
+    review_gate.record_review_outcome("async", "C", "B")
+    review_gate.record_review_outcome("async", "C", "C")
+
+    stats = review_stats()
+    assert stats["decisions"]["skipped_confident"] == 1 and stats["decisions"]["async"] == 2
+    assert stats["skip_rate"] == round(1 / 3, 4)
+    assert stats["disagreement_rate"] == 0.5
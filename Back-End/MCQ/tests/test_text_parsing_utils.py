@@ -1,5 +1,6 @@
 import sys
 import os
+import json
 import pytest
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -7,6 +8,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.text_extraction import extract_mcqs
 from utils.quiz_generation_methods import clean_correct_answer
 
+#  Hand-written outputs covering the formats extract_mcqs handles. No captured llama
+#  generations are checked in yet, so real-output coverage is still missing.
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "synthetic_mcq_outputs.json")
+with open(FIXTURES_PATH, encoding="utf-8") as f:
+    RAW_OUTPUT_CORPUS = json.load(f)
+
 def test_extract_mcqs_parsing_single_question():
     prompt = "Ignore this prompt."
     raw_output = """
@@ -26,6 +33,17 @@ def test_extract_mcqs_parsing_single_question():
     assert len(parsed[0]["options"]) == 5
 
 
+@pytest.mark.parametrize("case", RAW_OUTPUT_CORPUS, ids=[c["name"] for c in RAW_OUTPUT_CORPUS])
+def test_extract_mcqs_matches_synthetic_corpus(case):
+    assert extract_mcqs(case["prompt"], case["raw_output"]) == case["expected"]
+
+
+def test_extract_mcqs_is_deterministic():
+    case = RAW_OUTPUT_CORPUS[0]
+    first = extract_mcqs(case["prompt"], case["raw_output"])
+    assert all(extract_mcqs(case["prompt"], case["raw_output"]) == first for _ in range(5))
+
+
 @pytest.mark.parametrize("raw_input, expected", [
     ("Correct Answer: A", ["A"]),
     ("Answer: C and D", ["C", "D"]),
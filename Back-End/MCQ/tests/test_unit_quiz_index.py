@@ -0,0 +1,110 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.unit_quiz_index import UnitEmbeddingIndex, StratifiedUnitSampler
+
+unit_df = pd.DataFrame({
+    "Question Text": ["q0", "q1", "q2", "q3", "q4", "q5"],
+    "Assigned_Unit": ["Unit 02", "Unit 01", "Unit 02", "Unit 01", "Unit 03", "Unit 03"],
+})
+embeddings = [
+    np.array([1.0, 0.0, 0.0]),
+    np.array([0.9, 0.1, 0.0]),
+    np.array([0.0, 1.0, 0.0]),
+    np.array([0.0, 0.0, 1.0]),
+    np.array([0.8, 0.0, 0.2]),
+    np.array([0.0, 0.7, 0.7]),
+]
+
+
+def test_unit_blocks_are_contiguous_views():
+    index = UnitEmbeddingIndex(unit_df, embeddings)
+    assert sorted(index.unit_row_ids("Unit 02").tolist()) == [0, 2]
+    assert index.unit_matrix("Unit 01").base is not None
+    assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+
+
+def test_most_similar_ranks_by_cosine_similarity():
+    index = UnitEmbeddingIndex(unit_df, embeddings)
+    assert index.most_similar(np.array([[1.0, 0.0, 0.0]]), 3) == [0, 1, 4]
+
+
+def test_most_similar_skips_excluded_units_and_used_questions():
+    index = UnitEmbeddingIndex(unit_df, embeddings)
+    result = index.most_similar(
+        np.array([[1.0, 0.0, 0.0]]), 10, excluded_units=["Unit 02"], used_texts={"q1"}
+    )
+    assert result[0] == 4
+    assert set(result) == {3, 4, 5}
+
+
+def test_most_similar_without_targets_returns_nothing():
+    index = UnitEmbeddingIndex(unit_df, embeddings)
+    assert index.most_similar(np.empty((0, 3)), 5) == []
+
+
+def make_sampler_df():
+    return pd.DataFrame({
+        "Question Text": [f"q{i}" for i in range(12)] + ["q0"],
+        "Assigned_Unit": ["Unit 01"] * 9 + ["Unit 02"] * 3 + ["Unit 01"],
+        "Difficulty Level": ["easy", "medium", "hard"] * 4 + ["easy"],
+    })
+
+
+def test_sampler_fills_count_in_one_pass_across_strata():
+    sampler = StratifiedUnitSampler(make_sampler_df())
+    row_ids = sampler.sample("Unit 01", 6, rng=np.random.default_rng(7))
+    assert len(row_ids) == 6 and len(set(row_ids)) == 6
+    levels = make_sampler_df()["Difficulty Level"].iloc[row_ids]
+    assert levels.value_counts().to_dict() == {"easy": 2, "medium": 2, "hard": 2}
+
+
+def test_sampler_excludes_seen_ids_and_duplicate_texts():
+    df = make_sampler_df()
+    sampler = StratifiedUnitSampler(df)
+    excluded = sampler.row_ids_for_texts({"q1", "q2"})
+    row_ids = sampler.sample("Unit 01", 20, excluded_ids=excluded, rng=np.random.default_rng(1))
+    texts = df["Question Text"].iloc[row_ids].tolist()
+    assert len(texts) == 7 and len(set(texts)) == 7
+    assert not {"q1", "q2"} & set(texts)
+
+
+def test_sampler_unknown_unit_returns_nothing():
+    sampler = StratifiedUnitSampler(make_sampler_df())
+    assert not sampler.has_unit("Unit 99")
+    assert sampler.sample("Unit 99", 3) == []
+
+
+def test_with_duplicate_texts_expands_and_ignores_stale_ids():
+    sampler = StratifiedUnitSampler(make_sampler_df())
+    assert sampler.with_duplicate_texts({0, 999}) == {0, 12}
+
+
+def test_most_similar_skips_excluded_row_ids():
+    index = UnitEmbeddingIndex(unit_df, embeddings)
+    assert index.most_similar(np.array([[1.0, 0.0, 0.0]]), 2, excluded_row_ids={0}) == [1, 4]
+
+
+def test_seen_set_is_backfilled_even_if_a_submission_created_it_first():
+    import mongomock
+    from unittest.mock import patch
+    import routes.topic_based_quiz_routes as topic_routes
+
+    db = mongomock.MongoClient().db
+    old_text = topic_routes.unit_df.iloc[0]["Question Text"]
+    unit = topic_routes.unit_df.iloc[0]["Assigned_Unit"]
+    db.unit_quiz_responses.insert_one({"user_id": "u1", "unit_name": unit, "responses": [{"question_text": old_text}]})
+
+    with patch.object(topic_routes, "unit_seen_questions", db.unit_seen_questions), \
+         patch.object(topic_routes, "unit_quiz_responses", db.unit_quiz_responses):
+        #  First action after deploy is a submission, which upserts the seen document
+        topic_routes.record_seen_row_ids("u1", unit, [1])
+        seen = topic_routes.get_previously_seen_row_ids("u1", unit)
+        stored = db.unit_seen_questions.find_one({"user_id": "u1"})
+
+    assert {0, 1} <= seen
+    assert stored["backfilled"] is True and {0, 1} <= set(stored["row_ids"])
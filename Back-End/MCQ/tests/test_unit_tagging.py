@@ -0,0 +1,40 @@
+import sys
+import os
+import importlib.util
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'dataset', 'unit-wise-dataset', 'tag_questions_with_units.py')
+spec = importlib.util.spec_from_file_location("tag_questions_with_units", SCRIPT_PATH)
+tagging = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tagging)
+
+
+def test_assign_units_takes_segment_max_per_unit():
+    # Unit A has topics 0-1, unit B has topics 2-4
+    topic_matrix = np.eye(5, dtype=np.float32)
+    offsets = np.array([0, 2])
+    questions = np.array([
+        [0.0, 0.9, 0.1, 0.0, 0.0],   # closest to topic 1 -> A
+        [0.2, 0.0, 0.0, 0.0, 0.8],   # closest to topic 4 -> B
+        [0.0, 0.0, 0.0, 0.0, 0.0],   # no positive similarity
+    ], dtype=np.float32)
+
+    labels = tagging.assign_units(questions, topic_matrix, offsets, ["Unit A", "Unit B"])
+    assert labels.tolist() == ["Unit A", "Unit B", tagging.UNASSIGNED]
+
+
+def test_assign_units_matches_per_question_loop():
+    rng = np.random.default_rng(3)
+    topic_matrix = rng.normal(size=(7, 6)).astype(np.float32)
+    questions = rng.normal(size=(20, 6)).astype(np.float32)
+    offsets, units = np.array([0, 3, 4]), ["U1", "U2", "U3"]
+
+    expected = []
+    for q in questions:
+        scores = [(topic_matrix[s:e] @ q).max() for s, e in zip(offsets, [3, 4, 7])]
+        best = int(np.argmax(scores))
+        expected.append(units[best] if scores[best] > 0 else tagging.UNASSIGNED)
+
+    assert tagging.assign_units(questions, topic_matrix, offsets, units).tolist() == expected
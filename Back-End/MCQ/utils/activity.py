@@ -0,0 +1,178 @@
+# utils/activity.py
+"""
+Per-user daily activity: one bit per UTC day plus stored streak counters.
+
+Stored on the user document as
+    activity: {
+        origin_day      UTC day number (days since 1970-01-01) of bit 0
+        bitmap          Binary, bit i (little-endian within each byte) = active on origin_day + i
+        last_active_day latest day with a bit set
+        current_streak  consecutive active days ending at last_active_day
+        longest_streak  longest run anywhere in the bitmap
+        version         bumped on every write, used for compare-and-set
+    }
+
+A submission sets today's bit and adjusts the counters in O(1); reading a streak is a
+field read. Backfill the bitmap from the full submission history with:
+    python -m utils.activity --backfill
+"""
+import time
+import logging
+import argparse
+from bson import Binary, ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import PyMongoError
+from database.database import users_collection, responses_collection
+
+logger = logging.getLogger("activity")
+logger.setLevel(logging.INFO)
+
+SECONDS_PER_DAY = 86400
+# Compare-and-set attempts before giving up on a concurrently updated user
+MAX_CAS_ATTEMPTS = 5
+
+
+def day_number(timestamp=None):
+    """UTC day number of a Unix timestamp (now by default)."""
+    return int((time.time() if timestamp is None else timestamp) // SECONDS_PER_DAY)
+
+
+def _has_bit(bitmap, i):
+    return 0 <= i < len(bitmap) * 8 and bool(bitmap[i // 8] & (1 << (i % 8)))
+
+
+def _set_days(bitmap, origin_day, days):
+    """Return (bitmap, origin_day) with `days` set, growing the bitmap at either end as needed."""
+    bitmap = bytearray(bitmap)
+    lowest = min(days)
+    if origin_day is None:
+        origin_day = lowest
+    elif lowest < origin_day:
+        #  Keep byte alignment: move the origin back by whole bytes
+        shift_bytes = -(-(origin_day - lowest) // 8)
+        bitmap[:0] = bytes(shift_bytes)
+        origin_day -= shift_bytes * 8
+    for day in days:
+        i = day - origin_day
+        if i // 8 >= len(bitmap):
+            bitmap.extend(bytes(i // 8 + 1 - len(bitmap)))
+        bitmap[i // 8] |= 1 << (i % 8)
+    return bytes(bitmap), origin_day
+
+
+def _scan_streaks(bitmap):
+    """(index of the last set bit, run length ending there, longest run) over the whole bitmap."""
+    last, run, current, longest = -1, 0, 0, 0
+    for i in range(len(bitmap) * 8):
+        if _has_bit(bitmap, i):
+            run += 1
+            last, current = i, run
+            longest = max(longest, run)
+        else:
+            run = 0
+    return last, current, longest
+
+
+def apply_days(activity, days):
+    """New activity state with `days` marked active; O(1) for a day at or after the last one."""
+    activity = activity or {}
+    days = sorted(set(days))
+    if not days:
+        return activity
+
+    last_day = activity.get("last_active_day")
+    bitmap, origin_day = _set_days(bytes(activity.get("bitmap", b"")), activity.get("origin_day"), days)
+    current, longest = activity.get("current_streak", 0), activity.get("longest_streak", 0)
+
+    if last_day is not None and len(days) == 1 and days[0] >= last_day:
+        day = days[0]
+        if day == last_day + 1:
+            current += 1
+        elif day > last_day:
+            current = 1
+        last_day = day
+        longest = max(longest, current)
+    else:
+        #  First activity, backfill or an out-of-order day: recount from the bitmap
+        last, current, longest = _scan_streaks(bitmap)
+        last_day = origin_day + last
+
+    return {
+        "origin_day": origin_day,
+        "bitmap": Binary(bitmap),
+        "last_active_day": last_day,
+        "current_streak": current,
+        "longest_streak": longest,
+        "version": activity.get("version", 0) + 1,
+    }
+
+
+def record_activity(user_id, timestamp=None, days=None, collection=users_collection):
+    """
+    Mark the day of `timestamp` (or every day in `days`) active for the user.
+    The write only succeeds if nobody else changed the activity in between; on a
+    conflict it re-reads and retries. Returns the stored activity, or None.
+    """
+    days = days or [day_number(timestamp)]
+    for _ in range(MAX_CAS_ATTEMPTS):
+        user = collection.find_one({"_id": ObjectId(user_id)}, {"activity": 1})
+        if user is None:
+            return None
+        current = user.get("activity")
+        if current and all(_has_bit(bytes(current["bitmap"]), day - current["origin_day"]) for day in days):
+            return current  # Already active on these days
+        updated = apply_days(current, days)
+        guard = {"activity.version": current["version"]} if current else {"activity": {"$exists": False}}
+        result = collection.update_one({"_id": ObjectId(user_id), **guard}, {"$set": {"activity": updated}})
+        if result.matched_count:
+            return updated
+    logger.warning(f"⚠️ Activity update for user {user_id} lost {MAX_CAS_ATTEMPTS} races; skipped.")
+    return None
+
+
+def streak_summary(activity, today=None):
+    """Current and longest streak; the current one lapses after a full day without activity."""
+    if not activity:
+        return {"streak": 0, "longest_streak": 0}
+    today = day_number() if today is None else today
+    alive = activity.get("last_active_day", -2) >= today - 1
+    return {
+        "streak": activity.get("current_streak", 0) if alive else 0,
+        "longest_streak": activity.get("longest_streak", 0),
+    }
+
+
+def active_days(activity):
+    """Every active UTC day number, oldest first."""
+    if not activity:
+        return []
+    bitmap = bytes(activity.get("bitmap", b""))
+    return [activity["origin_day"] + i for i in range(len(bitmap) * 8) if _has_bit(bitmap, i)]
+
+
+def backfill(users=users_collection, responses=responses_collection):
+    """Rebuild activity bitmaps from every stored quiz submission. Returns users updated."""
+    pipeline = [
+        {"$match": {"submitted_at": {"$exists": True}}},
+        {"$group": {"_id": "$user_id", "submitted_at": {"$push": "$submitted_at"}}},
+    ]
+    updated = 0
+    for row in responses.aggregate(pipeline, allowDiskUse=True):
+        try:
+            days = [day_number(ts) for ts in row["submitted_at"]]
+            if record_activity(row["_id"], days=days, collection=users):
+                updated += 1
+        except (PyMongoError, InvalidId, TypeError) as e:
+            logger.warning(f"⚠️ Skipping activity backfill for user {row['_id']}: {e}")
+    logger.info(f"✅ Backfilled activity for {updated} users.")
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain per-user activity bitmaps.")
+    parser.add_argument("--backfill", action="store_true", help="Rebuild bitmaps from user_responses")
+    args = parser.parse_args()
+    if args.backfill:
+        backfill()
+    else:
+        parser.print_help()
@@ -1,7 +1,9 @@
 import time
 import logging
 from database.database import quizzes_collection
+from utils.question_store import MissingQuestionError, hydrate_quiz, question_refs
 from utils.verification import verify_mcq_with_llm
+from utils.fallback_pool import add_verified_questions
 import os
 import google.generativeai as genai
 
@@ -21,6 +23,13 @@ def verify_quiz_answers_async(quiz_id):
     if not quiz:
         logging.error(f"[VERIFIER] ❌ Quiz {quiz_id} not found.")
         return
+    stored_as_refs = "question_refs" in quiz
+    try:
+        quiz = hydrate_quiz(quiz)
+    except MissingQuestionError as e:
+        #  Writing refs back from a partial quiz would drop the missing questions for good
+        logging.error(f"[VERIFIER] ❌ Quiz {quiz_id} cannot be verified: {e}")
+        return
 
     logging.info(f"[VERIFIER] 🔍 Starting verification for Quiz {quiz_id}")
     updated = False
@@ -64,13 +73,24 @@ def verify_quiz_answers_async(quiz_id):
             time.sleep(4.1)
 
     if updated:
-        quizzes_collection.update_one(
-            {"quiz_id": quiz_id}, {"$set": {"questions": quiz["questions"]}}
+        #  Only the per-quiz answer fields changed; shared question content stays as is
+        update = (
+            {"question_refs": question_refs(quiz["questions"])}
+            if stored_as_refs
+            else {"questions": quiz["questions"]}
         )
+        quizzes_collection.update_one({"quiz_id": quiz_id}, {"$set": update})
         logging.info(f"[VERIFIER] ✅ Quiz {quiz_id} verification completed and saved.")
     else:
         logging.info(f"[VERIFIER] 💤 No changes made. All questions were already verified.")
 
+    #  Verified generated questions become fallback material for later quizzes
+    try:
+        added = add_verified_questions(quiz["questions"])
+        logging.info(f"[VERIFIER] 🌱 Added {added} verified questions to the fallback pool.")
+    except Exception as e:
+        logging.error(f"[VERIFIER] ❌ Could not update fallback pool: {e}")
+
 
 def generate_mcq_with_gemini(prompt: str) -> str:
     try:
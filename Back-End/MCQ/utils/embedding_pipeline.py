@@ -0,0 +1,302 @@
+"""
+Offline embedding builds for the MCQ service.
+
+One CLI builds every embedding-derived artifact. Rows are keyed by a content hash,
+so a rebuild only re-encodes rows that are new or changed; everything else is
+reused from the previous artifact. Each target writes its matrix and derived
+files (FAISS index, clusters, metadata) under a single manifest.
+
+Run from the MCQ service root:
+    python -m utils.embedding_pipeline questions            # question bank + FAISS + clusters
+    python -m utils.embedding_pipeline units                # unit quiz similarity fallback
+    python -m utils.embedding_pipeline rag                  # explanation RAG index
+    python -m utils.embedding_pipeline all --processes 4
+    python -m utils.embedding_pipeline questions --recluster
+    python -m utils.embedding_pipeline questions --benchmark
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from utils.embedding_store import (
+    DEFAULT_MODEL_NAME,
+    artifact_exists,
+    load_embedding_artifact,
+    row_hash,
+    save_embedding_artifact,
+)
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+QUESTION_DATASET_PATH = "dataset/merged_mcq_dataset.csv"
+QUESTION_EMBEDDING_ARTIFACT = "dataset/question_embeddings"
+QUESTION_INDEX_PATH = "dataset/question_embeddings.index"
+QUESTION_CLUSTERS_PATH = "dataset/question_dataset_with_clusters.csv"
+QUESTION_CENTROIDS_PATH = "dataset/question_cluster_centroids.npy"
+NUM_CLUSTERS = 10
+
+UNIT_DATASET_PATH = "dataset/unit-wise-dataset/unit_tagged_mcq_dataset.csv"
+UNIT_EMBEDDING_ARTIFACT = "dataset/unit-wise-dataset/unit_question_embeddings"
+
+RAG_DATASET_PATH = "dataset/explanation/syllubus_dataset.csv"
+RAG_EMBEDDING_ARTIFACT = "dataset/explanation/rag_bio_embeddings"
+RAG_METADATA_PATH = "dataset/explanation/rag_bio_metadata.pkl"
+RAG_INDEX_PATH = "dataset/explanation/rag_bio_index.faiss"
+
+TARGETS = ("questions", "units", "rag")
+
+
+def unit_row_ids(unit_df):
+    """Row ids the unit embedding artifact is keyed by."""
+    return [row_hash(text) for text in unit_df["Question Text"]]
+
+
+def load_model(model_name=DEFAULT_MODEL_NAME):
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.clip(norms, 1e-12, None)
+
+
+def encode_texts(model, texts, batch_size=256, normalize=True, processes=1):
+    """Batched float32 embeddings; fans out to a process pool when `processes` > 1."""
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    if processes > 1 and len(texts) > batch_size:
+        pool = model.start_multi_process_pool(["cpu"] * processes)
+        try:
+            matrix = model.encode_multi_process(texts, pool, batch_size=batch_size)
+        finally:
+            model.stop_multi_process_pool(pool)
+    else:
+        matrix = model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=len(texts) > batch_size,
+        )
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    return _normalize(matrix).astype(np.float32) if normalize else matrix
+
+
+def encode_incremental(model, texts, prefix, normalize=True, batch_size=256, processes=1, full=False,
+                       model_name=DEFAULT_MODEL_NAME):
+    """
+    Return (matrix, row_ids, encoded_count) for `texts`, re-using rows of the artifact
+    at `prefix` whose content hash is unchanged. Rows are only reused when the previous
+    build used the same model and normalization.
+    """
+    row_ids = [row_hash(text) for text in texts]
+    previous, previous_positions = None, {}
+    if not full and artifact_exists(prefix):
+        previous, manifest = load_embedding_artifact(prefix)
+        if manifest.get("model") == model_name and manifest.get("normalized") == normalize:
+            previous_positions = {row_id: i for i, row_id in enumerate(manifest["ids"])}
+        else:
+            previous = None
+
+    missing = [i for i, row_id in enumerate(row_ids) if row_id not in previous_positions]
+    encoded = encode_texts(
+        model, [texts[i] for i in missing], batch_size=batch_size, normalize=normalize, processes=processes
+    )
+
+    dim = previous.shape[1] if previous is not None else encoded.shape[1]
+    matrix = np.empty((len(row_ids), dim), dtype=np.float32)
+    reused = [i for i, row_id in enumerate(row_ids) if row_id in previous_positions]
+    if reused:
+        matrix[reused] = previous[[previous_positions[row_ids[i]] for i in reused]]
+    if missing:
+        matrix[missing] = encoded
+
+    logging.info(f"🧠 {prefix}: {len(missing)} rows encoded, {len(reused)} reused.")
+    return matrix, row_ids, len(missing)
+
+
+def assign_clusters(matrix, recluster=False, num_clusters=NUM_CLUSTERS):
+    """
+    Topic cluster per row. New rows are assigned to the saved centroids; KMeans is
+    only refit on --recluster, when no centroids exist, or when the dimension changed.
+    """
+    centroids = np.load(QUESTION_CENTROIDS_PATH) if os.path.exists(QUESTION_CENTROIDS_PATH) else None
+    if recluster or centroids is None or centroids.shape[1] != matrix.shape[1]:
+        from sklearn.cluster import KMeans
+
+        kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
+        labels = kmeans.fit_predict(matrix)
+        np.save(QUESTION_CENTROIDS_PATH, kmeans.cluster_centers_.astype(np.float32))
+        logging.info(f"🔄 Refit {num_clusters} topic clusters.")
+        return labels
+
+    # Nearest centroid by squared L2 distance, as KMeans.predict would
+    distances = (
+        (matrix ** 2).sum(axis=1, keepdims=True)
+        - 2 * matrix @ centroids.T
+        + (centroids ** 2).sum(axis=1)
+    )
+    return distances.argmin(axis=1)
+
+
+def _write_faiss_index(matrix, path, inner_product):
+    import faiss
+
+    index = faiss.IndexFlatIP(matrix.shape[1]) if inner_product else faiss.IndexFlatL2(matrix.shape[1])
+    index.add(np.ascontiguousarray(matrix, dtype=np.float32))
+    faiss.write_index(index, path)
+
+
+def load_question_dataset():
+    dataset = pd.read_csv(QUESTION_DATASET_PATH, encoding="latin1").fillna("")
+    # Combine question, options, and correct answer for better context representation
+    dataset["Combined"] = (
+        dataset["Question Text"] + " " +
+        dataset["Option 1"] + " " +
+        dataset["Option 2"] + " " +
+        dataset["Option 3"] + " " +
+        dataset["Option 4"] + " " +
+        dataset["Option 5"] + " " +
+        "Correct Answer: " + dataset["Correct Answer"]
+    )
+    return dataset, dataset["Combined"].tolist()
+
+
+def load_unit_dataset():
+    unit_df = pd.read_csv(UNIT_DATASET_PATH).fillna("")
+    return unit_df, unit_df["Question Text"].tolist()
+
+
+def load_rag_dataset():
+    df = pd.read_csv(RAG_DATASET_PATH, encoding="ISO-8859-1")
+    df["Text Content"] = df["Text Content"].fillna("")
+    return df, df["Text Content"].tolist()
+
+
+def build_question_artifacts(model, recluster=False, **encode_options):
+    """Question bank: L2 FAISS index, topic clusters and the clustered dataset CSV."""
+    dataset, texts = load_question_dataset()
+    # Un-normalized, matching the L2 index the retrieval code was tuned against
+    matrix, row_ids, encoded = encode_incremental(
+        model, texts, QUESTION_EMBEDDING_ARTIFACT, normalize=False, **encode_options
+    )
+    dataset["Cluster"] = assign_clusters(matrix, recluster=recluster)
+
+    _write_faiss_index(matrix, QUESTION_INDEX_PATH, inner_product=False)
+    dataset.to_csv(QUESTION_CLUSTERS_PATH, index=False)
+    save_embedding_artifact(
+        QUESTION_EMBEDDING_ARTIFACT,
+        matrix,
+        row_ids,
+        extra={
+            "normalized": False,
+            "artifacts": {
+                "faiss_index": QUESTION_INDEX_PATH,
+                "clusters": QUESTION_CLUSTERS_PATH,
+                "centroids": QUESTION_CENTROIDS_PATH,
+            },
+            "num_clusters": int(dataset["Cluster"].nunique()),
+        },
+    )
+    return encoded
+
+
+def build_unit_artifacts(model, dtype="float32", **encode_options):
+    """Unit-tagged questions for the unit quiz similarity fallback."""
+    _, texts = load_unit_dataset()
+    matrix, row_ids, encoded = encode_incremental(
+        model, texts, UNIT_EMBEDDING_ARTIFACT, normalize=True, **encode_options
+    )
+    save_embedding_artifact(UNIT_EMBEDDING_ARTIFACT, matrix, row_ids, dtype=dtype, extra={"normalized": True})
+    return encoded
+
+
+def build_rag_artifacts(model, **encode_options):
+    """Syllabus passages: inner-product FAISS index plus the passage metadata."""
+    df, texts = load_rag_dataset()
+    matrix, row_ids, encoded = encode_incremental(
+        model, texts, RAG_EMBEDDING_ARTIFACT, normalize=True, **encode_options
+    )
+    _write_faiss_index(matrix, RAG_INDEX_PATH, inner_product=True)
+    df.to_pickle(RAG_METADATA_PATH)
+    save_embedding_artifact(
+        RAG_EMBEDDING_ARTIFACT,
+        matrix,
+        row_ids,
+        extra={
+            "normalized": True,
+            "artifacts": {"faiss_index": RAG_INDEX_PATH, "metadata": RAG_METADATA_PATH},
+        },
+    )
+    return encoded
+
+
+BUILDERS = {
+    "questions": build_question_artifacts,
+    "units": build_unit_artifacts,
+    "rag": build_rag_artifacts,
+}
+LOADERS = {
+    "questions": load_question_dataset,
+    "units": load_unit_dataset,
+    "rag": load_rag_dataset,
+}
+
+
+def run_benchmark(model, target, batch_size=256, processes=1, sample=None):
+    """Encode a target's rows from scratch (nothing is written) and report rows/sec."""
+    _, texts = LOADERS[target]()
+    texts = texts[:sample] if sample else texts
+
+    configs = [("batched", 1)] + ([(f"{processes} processes", processes)] if processes > 1 else [])
+    results = {}
+    for label, process_count in configs:
+        started = time.perf_counter()
+        encode_texts(model, texts, batch_size=batch_size, processes=process_count)
+        elapsed = time.perf_counter() - started
+        results[label] = len(texts) / elapsed
+        print(f"{target:<10} {label:<14} {len(texts):>6} rows  {elapsed:8.2f}s  {results[label]:9.1f} rows/sec")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build MCQ embedding artifacts.")
+    parser.add_argument("target", choices=[*TARGETS, "all"], help="Artifact to build")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, default=1, help="Encoder processes (CPU)")
+    parser.add_argument("--full", action="store_true", help="Re-encode every row instead of reusing unchanged ones")
+    parser.add_argument("--recluster", action="store_true", help="Refit question topic clusters")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32", help="Unit artifact storage")
+    parser.add_argument("--benchmark", action="store_true", help="Report encode rows/sec without writing artifacts")
+    parser.add_argument("--sample", type=int, default=None, help="Benchmark on the first N rows only")
+    args = parser.parse_args(argv)
+
+    targets = TARGETS if args.target == "all" else (args.target,)
+    model = load_model()
+
+    for target in targets:
+        if args.benchmark:
+            run_benchmark(model, target, batch_size=args.batch_size, processes=args.processes, sample=args.sample)
+            continue
+
+        options = {"batch_size": args.batch_size, "processes": args.processes, "full": args.full}
+        if target == "questions":
+            options["recluster"] = args.recluster
+        if target == "units":
+            options["dtype"] = args.dtype
+
+        started = time.time()
+        encoded = BUILDERS[target](model, **options)
+        logging.info(f"✅ {target}: built in {time.time() - started:.1f}s ({encoded} rows encoded).")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+"""
+Embedding artifact format for the MCQ service.
+
+An artifact is two files sharing a path prefix:
+    <prefix>.npy            float32/float16 matrix, one row per item (memory-mapped on load)
+    <prefix>.manifest.json  row ids, model name, dtype, shape and a content hash
+
+Row ids are per-row content hashes, so a loader can check that an artifact still
+matches its dataset, and a builder can reuse rows whose content did not change.
+"""
+import os
+import json
+import time
+import hashlib
+import numpy as np
+
+FORMAT_VERSION = 1
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class StaleArtifactError(ValueError):
+    """Raised when an artifact was built from different content or another model."""
+
+
+def row_hash(text):
+    """Content id for one embedded row."""
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()
+
+
+def content_hash(row_ids, model_name=DEFAULT_MODEL_NAME):
+    """Hash of the model name and the ordered row ids an artifact was built from."""
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for row_id in row_ids:
+        digest.update(b"\n")
+        digest.update(row_id.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def artifact_paths(prefix):
+    return f"{prefix}.npy", f"{prefix}.manifest.json"
+
+
+def artifact_exists(prefix):
+    return all(os.path.exists(path) for path in artifact_paths(prefix))
+
+
+def save_embedding_artifact(prefix, matrix, row_ids, model_name=DEFAULT_MODEL_NAME, dtype="float32", extra=None):
+    """Write matrix + manifest atomically (temp files, then rename). Returns the manifest."""
+    matrix = np.ascontiguousarray(matrix, dtype=dtype)
+    if matrix.ndim != 2 or matrix.shape[0] != len(row_ids):
+        raise ValueError(f"Matrix shape {matrix.shape} does not match {len(row_ids)} row ids")
+
+    npy_path, manifest_path = artifact_paths(prefix)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model": model_name,
+        "dtype": str(matrix.dtype),
+        "shape": list(matrix.shape),
+        "content_hash": content_hash(row_ids, model_name),
+        "ids": list(row_ids),
+        "created_at": time.time(),
+        **(extra or {}),
+    }
+
+    tmp_npy, tmp_manifest = npy_path + ".tmp.npy", manifest_path + ".tmp"
+    np.save(tmp_npy, matrix)
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_npy, npy_path)
+    os.replace(tmp_manifest, manifest_path)
+    return manifest
+
+
+def load_manifest(prefix):
+    _, manifest_path = artifact_paths(prefix)
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_embedding_artifact(prefix, expected_hash=None, mmap=True):
+    """
+    Return (matrix, manifest). The matrix is a read-only memory map unless mmap=False.
+    Raises FileNotFoundError if the artifact is missing and StaleArtifactError if
+    `expected_hash` does not match the manifest.
+    """
+    npy_path, _ = artifact_paths(prefix)
+    if not artifact_exists(prefix):
+        raise FileNotFoundError(f"Embedding artifact not found: {prefix}")
+
+    manifest = load_manifest(prefix)
+    if expected_hash is not None and manifest.get("content_hash") != expected_hash:
+        raise StaleArtifactError(f"Embedding artifact {prefix} is out of date with its dataset")
+
+    matrix = np.load(npy_path, mmap_mode="r" if mmap else None)
+    if list(matrix.shape) != manifest["shape"]:
+        raise StaleArtifactError(f"Embedding artifact {prefix} matrix does not match its manifest")
+    return matrix, manifest
@@ -2,41 +2,27 @@
 
 import os
 import pandas as pd
-import torch
 import faiss
 from utils.model_loader import embedding_model
-
-DATASET_PATH = "dataset/explanation/syllubus_dataset.csv"
-EMBEDDING_PATH = "dataset/explanation/rag_bio_embeddings.pt"
-METADATA_PATH = "dataset/explanation/rag_bio_metadata.pkl"
-FAISS_INDEX_PATH = "dataset/explanation/rag_bio_index.faiss"
+from utils.embedding_pipeline import (
+    RAG_DATASET_PATH as DATASET_PATH,
+    RAG_METADATA_PATH as METADATA_PATH,
+    RAG_INDEX_PATH as FAISS_INDEX_PATH,
+    build_rag_artifacts,
+)
+from utils.explanation.rag_index import build_index, index_settings_from_env, index_vectors
 
 def build_rag_index():
     if not os.path.exists(DATASET_PATH):
         raise FileNotFoundError(f"❌ Dataset not found at {DATASET_PATH}")
 
-    print("🔍 Loading dataset...")
-    df = pd.read_csv(DATASET_PATH, encoding='ISO-8859-1')
-    df["Text Content"] = df["Text Content"].fillna("")
-
-    model = embedding_model
     print("🧠 Encoding textbook content...")
-    texts = df["Text Content"].tolist()
-    embeddings = model.encode(texts, convert_to_tensor=True, normalize_embeddings=True)
-
-    print("💾 Saving embeddings and metadata...")
-    torch.save(embeddings, EMBEDDING_PATH)
-    df.to_pickle(METADATA_PATH)
-
-    emb_np = embeddings.cpu().numpy().astype("float32")
-    index = faiss.IndexFlatIP(emb_np.shape[1])
-    index.add(emb_np)
-    faiss.write_index(index, FAISS_INDEX_PATH)
-
+    #  Incremental: only passages changed since the last build are re-encoded
+    build_rag_artifacts(embedding_model)
     print("✅ RAG index built and saved.")
 
 class RAGBiology:
-    def __init__(self):
+    def __init__(self, index_settings=None):
         if not (os.path.exists(METADATA_PATH) and os.path.exists(FAISS_INDEX_PATH)):
             print("⚠️ Index not found. Rebuilding RAG index...")
             build_rag_index()
@@ -44,26 +30,51 @@ class RAGBiology:
         print("🚀 Loading RAG components...")
         self.model = embedding_model
         self.df = pd.read_pickle(METADATA_PATH)
-        self.index = faiss.read_index(FAISS_INDEX_PATH)
-
-    def get_context(self, query: str, top_k: int = 3, max_total_words: int = 250) -> list:
-        if not query.strip():
-            return []
-
-        query_emb = self.model.encode([query], convert_to_tensor=True, normalize_embeddings=True)
-        query_np = query_emb.cpu().numpy().astype("float32")
-        D, I = self.index.search(query_np, top_k)
-
-        all_texts = self.df.iloc[I[0]]["Text Content"].tolist()
-
+        self.texts = self.df["Text Content"].tolist()
+
+        #  The stored flat index is the source of truth; approximate indexes are built from its vectors
+        flat_index = faiss.read_index(FAISS_INDEX_PATH)
+        self.vectors = index_vectors(flat_index)
+        self.index_settings = index_settings or index_settings_from_env()
+        if self.index_settings["index_type"] == "flat":
+            self.index = flat_index
+        else:
+            self.index = build_index(self.vectors, **self.index_settings)
+        print(f"🚀 RAG index: {self.index_settings['index_type']} over {self.index.ntotal} passages")
+
+    def _select(self, ids, max_total_words):
         selected = []
         total_words = 0
-        for text in all_texts:
+        for text in (self.texts[i] for i in ids if i >= 0):
             word_count = len(text.split())
             if total_words + word_count > max_total_words:
                 break
             selected.append(text)
             total_words += word_count
-
         return selected
 
+    def get_context(self, query: str, top_k: int = 3, max_total_words: int = 250) -> list:
+        return self.get_context_with_score(query, top_k, max_total_words)[0]
+
+    def get_context_with_score(self, query: str, top_k: int = 3, max_total_words: int = 250):
+        """Return (context passages, best inner-product similarity to the query)."""
+        return self.get_context_batch_with_scores([query], top_k, max_total_words)[0]
+
+    def get_context_batch(self, queries: list, top_k: int = 3, max_total_words: int = 250) -> list:
+        """Context passages for every query, with one encode pass and one FAISS search."""
+        return [texts for texts, _ in self.get_context_batch_with_scores(queries, top_k, max_total_words)]
+
+    def get_context_batch_with_scores(self, queries: list, top_k: int = 3, max_total_words: int = 250) -> list:
+        results = [([], 0.0)] * len(queries)
+        positions = [i for i, query in enumerate(queries) if query.strip()]
+        if not positions:
+            return results
+
+        query_np = self.model.encode(
+            [queries[i] for i in positions], convert_to_numpy=True, normalize_embeddings=True
+        ).astype("float32")
+        D, I = self.index.search(query_np, top_k)
+
+        for row, position in enumerate(positions):
+            results[position] = (self._select(I[row], max_total_words), float(D[row][0]))
+        return results
@@ -0,0 +1,221 @@
+# utils/explanation/biology_gate.py
+"""
+Local biology relevance gate for explanation requests.
+
+A question is scored by its nearest-neighbour similarity to syllabus passages in
+the RAG index and, optionally, by its margin between the syllabus centroid and a
+centroid of non-biology examples. Thresholds are calibrated from the syllabus
+itself: sentences of each passage (matched against the other passages) are the
+positives, NON_BIOLOGY_EXAMPLES are the negatives.
+
+BIOLOGY_GATE_MODE:
+    hybrid  (default) local decision; Gemini only for questions in the uncertain band
+    local   never call Gemini; uncertain questions are accepted
+    remote  always ask Gemini (previous behaviour)
+"""
+import os
+import re
+import time
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger("biology_gate")
+logger.setLevel(logging.INFO)
+
+ACCEPT, REJECT, UNCERTAIN = "accept", "reject", "uncertain"
+GATE_MODES = ("hybrid", "local", "remote")
+TOP_K = 3
+MAX_CALIBRATION_SENTENCES = 400
+# Share of positives that may fall below the accept threshold / negatives above the reject threshold
+POSITIVE_PERCENTILE = 10
+NEGATIVE_PERCENTILE = 95
+# After a failed calibration the gate stays disabled (UNCERTAIN) and retries with doubling backoff
+CALIBRATION_RETRY_SECONDS = 60
+MAX_CALIBRATION_RETRY_SECONDS = 3600
+
+NON_BIOLOGY_EXAMPLES = [
+    "What is the derivative of x squared?",
+    "Solve for x: 2x + 3 = 11",
+    "What is the capital city of France?",
+    "Who won the football world cup in 2018?",
+    "How do I reverse a linked list in Python?",
+    "What does HTTP status code 404 mean?",
+    "Explain the causes of the First World War.",
+    "Who wrote the novel Pride and Prejudice?",
+    "What is the speed of light in a vacuum?",
+    "Balance the equation for the combustion of methane.",
+    "What is Newton's second law of motion?",
+    "How do interest rates affect inflation?",
+    "What is the plural of the word mouse?",
+    "Which planet is closest to the sun?",
+    "How many players are on a cricket team?",
+    "What is the time complexity of binary search?",
+    "Translate 'good morning' into Spanish.",
+    "What is the area of a circle with radius 3?",
+    "Who painted the Mona Lisa?",
+    "What is the boiling point of ethanol?",
+    "How do I open a bank account?",
+    "What is the difference between a stock and a bond?",
+    "Write a poem about the ocean.",
+    "What are the rules of chess castling?",
+    "What voltage does a household socket supply?",
+    "Recommend a good movie to watch tonight.",
+    "What is the GDP of Sri Lanka?",
+    "How does a car engine work?",
+    "What is the meaning of the idiom 'break a leg'?",
+    "Which programming language is best for web development?",
+]
+
+
+def get_gate_mode():
+    mode = os.getenv("BIOLOGY_GATE_MODE", "hybrid").strip().lower()
+    return mode if mode in GATE_MODES else "hybrid"
+
+
+def _split_sentences(passage, min_words=6):
+    sentences = re.split(r"(?<=[.!?])\s+", str(passage))
+    return [s.strip() for s in sentences if len(s.split()) >= min_words]
+
+
+def _band(positive_scores, negative_scores):
+    """(reject_below, accept_at_or_above) from the calibration score distributions."""
+    positive_cut = float(np.percentile(positive_scores, POSITIVE_PERCENTILE))
+    negative_cut = float(np.percentile(negative_scores, NEGATIVE_PERCENTILE))
+    return min(positive_cut, negative_cut), max(positive_cut, negative_cut)
+
+
+class BiologyGate:
+    def __init__(self, encode, index=None, passages=(), passage_vectors=None, use_centroid=True, source=None):
+        """
+        encode:          list[str] -> normalized float32 matrix
+        index:           inner-product FAISS index over the passage embeddings
+        passages:        passage texts, in index order
+        passage_vectors: passage embeddings (reconstructed from the index if omitted)
+        source:          optional () -> (index, passages, passage_vectors), loaded at calibration
+        """
+        self.encode = encode
+        self.index = index
+        self.passages = list(passages)
+        self.passage_vectors = passage_vectors
+        self.use_centroid = use_centroid
+        self.source = source
+        self.thresholds = None
+        self._retry_at = 0.0
+        self._retry_delay = CALIBRATION_RETRY_SECONDS
+        self._lock = threading.Lock()
+
+    def _nearest(self, vectors, k=TOP_K):
+        scores, ids = self.index.search(np.ascontiguousarray(vectors, dtype=np.float32), k)
+        return scores, ids
+
+    def _centroid_margin(self, vectors):
+        return vectors @ self.biology_centroid - vectors @ self.other_centroid
+
+    def calibrate(self):
+        """
+        Derive thresholds from the syllabus; runs once, on first use or at warm-up.
+        Returns None while the gate is disabled after a failed attempt.
+        """
+        with self._lock:
+            if self.thresholds is not None:
+                return self.thresholds
+            if time.monotonic() < self._retry_at:
+                return None
+            try:
+                thresholds = self._calibrate()
+            except Exception as e:
+                self._retry_at = time.monotonic() + self._retry_delay
+                logger.error(f"❌ Biology gate calibration failed, gate disabled for {self._retry_delay}s: {e}")
+                self._retry_delay = min(self._retry_delay * 2, MAX_CALIBRATION_RETRY_SECONDS)
+                return None
+            self._retry_delay = CALIBRATION_RETRY_SECONDS
+            return thresholds
+
+    def _calibrate(self):
+        if self.index is None and self.source is not None:
+            index, passages, passage_vectors = self.source()
+            self.index, self.passages, self.passage_vectors = index, list(passages), passage_vectors
+
+        sentences, owners = [], []
+        for passage_id, passage in enumerate(self.passages):
+            for sentence in _split_sentences(passage):
+                sentences.append(sentence)
+                owners.append(passage_id)
+        if len(sentences) > MAX_CALIBRATION_SENTENCES:
+            picks = np.random.default_rng(0).choice(len(sentences), MAX_CALIBRATION_SENTENCES, replace=False)
+            sentences = [sentences[i] for i in picks]
+            owners = [owners[i] for i in picks]
+
+        positives = self.encode(sentences)
+        negatives = self.encode(NON_BIOLOGY_EXAMPLES)
+
+        # Score each sentence against the other passages, not the one it came from
+        scores, ids = self._nearest(positives, k=TOP_K + 1)
+        positive_nn = np.array([
+            next((s for s, i in zip(row_scores, row_ids) if i != owner), row_scores[-1])
+            for row_scores, row_ids, owner in zip(scores, ids, owners)
+        ])
+        negative_nn = self._nearest(negatives, k=1)[0][:, 0]
+        thresholds = {"nn": _band(positive_nn, negative_nn)}
+
+        if self.use_centroid:
+            if self.passage_vectors is None:
+                self.passage_vectors = self.index.reconstruct_n(0, self.index.ntotal)
+            biology_centroid = np.asarray(self.passage_vectors, dtype=np.float32).mean(axis=0)
+            other_centroid = negatives.mean(axis=0)
+            self.biology_centroid = biology_centroid / np.linalg.norm(biology_centroid)
+            self.other_centroid = other_centroid / np.linalg.norm(other_centroid)
+            thresholds["margin"] = _band(self._centroid_margin(positives), self._centroid_margin(negatives))
+
+        self.thresholds = thresholds
+        logger.info(f"🧪 Biology gate calibrated on {len(sentences)} syllabus sentences: {thresholds}")
+        return thresholds
+
+    def score(self, question):
+        """Local scores, or None while the gate is disabled."""
+        thresholds = self.calibrate()
+        if thresholds is None:
+            return None
+        vector = self.encode([question])
+        scores = {"nn": float(self._nearest(vector, k=1)[0][0, 0])}
+        if "margin" in thresholds:
+            scores["margin"] = float(self._centroid_margin(vector)[0])
+        return scores
+
+    def classify(self, question):
+        """ACCEPT / REJECT when the local scores are decisive, otherwise UNCERTAIN."""
+        scores = self.score(question)
+        if scores is None:
+            return UNCERTAIN
+        votes = []
+        for name, value in scores.items():
+            reject_below, accept_at = self.thresholds[name]
+            if value >= accept_at:
+                votes.append(ACCEPT)
+            elif value < reject_below:
+                votes.append(REJECT)
+            else:
+                votes.append(UNCERTAIN)
+
+        # The nearest-neighbour score decides; the centroid margin settles its uncertain band
+        decision = votes[0] if votes[0] != UNCERTAIN or len(votes) == 1 else votes[1]
+        logger.info(f"🧪 Biology gate: {decision} {scores}")
+        return decision
+
+    def is_biology(self, question, remote_check=None, mode=None):
+        mode = mode or get_gate_mode()
+        if mode == "remote" and remote_check is not None:
+            return remote_check(question)
+
+        try:
+            decision = self.classify(question)
+        except Exception as e:
+            logger.warning(f"⚠️ Local biology gate failed: {e}")
+            decision = UNCERTAIN
+
+        if decision != UNCERTAIN:
+            return decision == ACCEPT
+        if mode == "hybrid" and remote_check is not None:
+            return remote_check(question)
+        return True  # Same fail-open behaviour as the remote check
@@ -0,0 +1,183 @@
+# utils/explanation/explanation_cache.py
+"""
+Two-tier cache for MCQ explanations: an in-process LRU in front of the
+`explanation_cache` Mongo collection (expired by a TTL index on `expires_at`).
+
+Entries are keyed by a hash of the normalized question and options and record
+how the explanation was produced. Pre-warm with:
+    python -m utils.explanation.explanation_cache --source all
+"""
+import os
+import re
+import hashlib
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pymongo.errors import PyMongoError
+from database.database import explanation_cache_collection
+
+logger = logging.getLogger("explanation_cache")
+logger.setLevel(logging.INFO)
+
+CACHE_TTL_DAYS = int(os.getenv("EXPLANATION_CACHE_TTL_DAYS", "30"))
+LRU_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "1024"))
+RESULT_FIELDS = ("predicted_answer", "explanation")
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+def explanation_key(question: str, options: dict) -> str:
+    """Hash of the normalized question and its options (order of the dict does not matter)."""
+    parts = [_normalize(question)]
+    parts += [f"{str(letter).strip().upper()}:{_normalize(text)}" for letter, text in sorted(options.items())]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    def __init__(self, collection, max_size=LRU_SIZE, ttl_days=CACHE_TTL_DAYS):
+        self.collection = collection
+        self.max_size = max_size
+        self.ttl = timedelta(days=ttl_days)
+        self._entries = OrderedDict()  # key -> (result, expires_at)
+        self._lock = threading.Lock()
+
+    def _remember(self, key, result, expires_at):
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Cached result dict, or None. Checks the LRU first, then Mongo."""
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    return dict(entry[0])
+                del self._entries[key]
+
+        try:
+            doc = self.collection.find_one(
+                {"_id": key, "expires_at": {"$gt": now}},
+                {**{field: 1 for field in RESULT_FIELDS}, "expires_at": 1},
+            )
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Explanation cache read failed: {e}")
+            return None
+        if doc is None:
+            return None
+
+        result = {field: doc.get(field) for field in RESULT_FIELDS}
+        self._remember(key, result, doc["expires_at"])
+        return dict(result)
+
+    def put(self, key, question, options, result, provenance):
+        """Store a result with its provenance (e.g. {"source": "llama+gemini_review"})."""
+        now = datetime.utcnow()
+        expires_at = now + self.ttl
+        cached = {field: result.get(field) for field in RESULT_FIELDS}
+        self._remember(key, cached, expires_at)
+        try:
+            self.collection.update_one(
+                {"_id": key},
+                {
+                    "$set": {
+                        **cached,
+                        "question": question,
+                        "options": options,
+                        "provenance": provenance,
+                        "created_at": now,
+                        "expires_at": expires_at,
+                    }
+                },
+                upsert=True,
+            )
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Explanation cache write failed: {e}")
+
+    def update(self, key, fields):
+        """Patch a cached result in both tiers (e.g. after a later review)."""
+        cached = {field: fields[field] for field in RESULT_FIELDS if field in fields}
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = ({**entry[0], **cached}, entry[1])
+        try:
+            self.collection.update_one({"_id": key}, {"$set": fields})
+        except PyMongoError as e:
+            logger.warning(f"⚠️ Explanation cache update failed: {e}")
+
+    def contains(self, key):
+        return self.get(key) is not None
+
+    def clear_local(self):
+        with self._lock:
+            self._entries.clear()
+
+
+explanation_cache = ExplanationCache(explanation_cache_collection)
+
+
+def iter_dataset_questions(path="dataset/merged_mcq_dataset.csv"):
+    import pandas as pd
+
+    df = pd.read_csv(path, encoding="latin1").fillna("")
+    for _, row in df.iterrows():
+        options = {letter: str(row[f"Option {i}"]) for i, letter in enumerate("ABCDE", start=1)}
+        yield row["Question Text"], options
+
+
+def iter_pool_questions():
+    from database.database import fallback_questions
+
+    for doc in fallback_questions.find({}, {"question_text": 1, **{f"option{i}": 1 for i in range(1, 6)}}):
+        options = {letter: doc.get(f"option{i}", "") for i, letter in enumerate("ABCDE", start=1)}
+        yield doc["question_text"], options
+
+
+def prewarm(source="all", limit=None):
+    """Explain every not-yet-cached question from the dataset and/or verified pool."""
+    from utils.explanation.explanation_helper import explain_mcq
+
+    sources = []
+    if source in ("dataset", "all"):
+        sources.append(iter_dataset_questions())
+    if source in ("pool", "all"):
+        sources.append(iter_pool_questions())
+
+    seen, explained, failed = set(), 0, 0
+    for questions in sources:
+        for question, options in questions:
+            if limit is not None and explained >= limit:
+                return explained
+            key = explanation_key(question, options)
+            if key in seen or explanation_cache.contains(key):
+                continue
+            seen.add(key)
+            try:
+                explain_mcq(question, options, trigger="prewarm")
+                explained += 1
+                if explained % 50 == 0:
+                    logger.info(f"🔥 Pre-warmed {explained} explanations ({failed} failed)")
+            except Exception as e:
+                failed += 1
+                logger.warning(f"⚠️ Pre-warm failed for '{question[:60]}': {e}")
+
+    logger.info(f"✅ Pre-warm done: {explained} explained, {failed} failed")
+    return explained
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-warm the MCQ explanation cache.")
+    parser.add_argument("--source", choices=["dataset", "pool", "all"], default="all")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many new explanations")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    prewarm(args.source, args.limit)
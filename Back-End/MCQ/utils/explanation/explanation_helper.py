@@ -1,7 +1,16 @@
 # utils/explanation_helper.py
 import logging
-from utils.model_loader import llm
+from utils.model_loader import llm, registry
 from utils.explanation.RAG_biology_helper import RAGBiology
+from utils.explanation.explanation_cache import explanation_cache, explanation_key
+from utils.explanation.biology_gate import BiologyGate
+from utils.explanation.review_gate import (
+    REVIEW_ASYNC,
+    REVIEW_SYNC,
+    decide_review,
+    record_review_outcome,
+    review_executor,
+)
 import re
 import requests
 import os
@@ -10,7 +19,22 @@ import google.generativeai as genai
 logger = logging.getLogger("explanation_helper")
 logger.setLevel(logging.INFO)
 
-rag = RAGBiology()
+#  Built on first use (or warm-up) by the model registry
+rag = registry.register("rag", RAGBiology)
+
+
+def _encode_normalized(texts):
+    return rag.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True).astype("float32")
+
+
+def _build_biology_gate():
+    #  The syllabus index is loaded inside calibration, so a missing file disables the gate with backoff
+    gate = BiologyGate(_encode_normalized, source=lambda: (rag.index, rag.texts, rag.vectors))
+    gate.calibrate()
+    return gate
+
+
+biology_gate = registry.register("biology_gate", _build_biology_gate)
 
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 gemini_model = genai.GenerativeModel("gemini-1.5-flash")
@@ -87,22 +111,144 @@ Answer: X
 Explanation: ...
 """
 
-def explain_mcq(question: str, options: dict) -> dict:
+def get_cached_explanation(question: str, options: dict):
+    return explanation_cache.get(explanation_key(question, options))
+
+
+def explain_mcq(question: str, options: dict, trigger: str = "request") -> dict:
+    key = explanation_key(question, options)
+    cached = explanation_cache.get(key)
+    if cached is not None:
+        logger.info("💾 Explanation served from cache")
+        return cached
+
+    result, provenance = generate_explanation(question, options)
+    store_explanation(key, question, options, result, {**provenance, "trigger": trigger})
+    return result
+
+
+def explain_mcq_batch(items: list, trigger: str = "request") -> list:
+    """
+    Explain [(question, options), ...] in order. Cached items are returned as-is and
+    context for all the others is retrieved with one batched RAG call.
+    """
+    keys = [explanation_key(question, options) for question, options in items]
+    results = [explanation_cache.get(key) for key in keys]
+
+    pending = {}
+    for i, key in enumerate(keys):
+        if results[i] is None:
+            pending.setdefault(key, []).append(i)
+    first_positions = [positions[0] for positions in pending.values()]
+    contexts = rag.get_context_batch_with_scores(
+        [items[i][0] for i in first_positions], top_k=3, max_total_words=250
+    )
+
+    for i, (context, rag_similarity) in zip(first_positions, contexts):
+        question, options = items[i]
+        prompt = build_prompt_with_context_for_explanation(question, options, context)
+        raw_text = llm(prompt, max_tokens=400)["choices"][0]["text"].strip()
+        result, provenance = finish_explanation(question, options, raw_text, context, rag_similarity)
+        store_explanation(keys[i], question, options, result, {**provenance, "trigger": trigger})
+        for position in pending[keys[i]]:
+            results[position] = result
+    return results
+
+
+def store_explanation(key: str, question: str, options: dict, result: dict, provenance: dict):
+    """Cache a result, then start its background review if one was deferred."""
+    if not result.get("predicted_answer"):
+        return
+    explanation_cache.put(key, question, options, result, provenance)
+    if provenance.get("review") == REVIEW_ASYNC:
+        review_executor.submit(review_in_background, key, question, options, dict(result))
+
+
+def review_in_background(key: str, question: str, options: dict, result: dict):
+    reviewed = review_with_gemini(question, options, result["predicted_answer"], result["explanation"])
+    changed = record_review_outcome(REVIEW_ASYNC, result["predicted_answer"], reviewed["predicted_answer"])
+    if changed:
+        logger.info(f"🔁 Background review changed answer {result['predicted_answer']} → {reviewed['predicted_answer']}")
+    explanation_cache.update(key, {
+        "predicted_answer": reviewed["predicted_answer"],
+        "explanation": reviewed["explanation"],
+        "provenance.reviewed": True,
+        "provenance.corrected_by_review": changed,
+    })
+
+
+def generate_explanation(question: str, options: dict):
+    """Return (result, provenance) without consulting the cache."""
     logger.info("🔍 Generating explanation using context")
-    context = rag.get_context(question, top_k=3, max_total_words=250)
+    context, rag_similarity = rag.get_context_with_score(question, top_k=3, max_total_words=250)
     prompt = build_prompt_with_context_for_explanation(question, options, context)
 
     response = llm(prompt, max_tokens=400)
     raw_text = response["choices"][0]["text"].strip()
+    return finish_explanation(question, options, raw_text, context, rag_similarity)
 
+
+def finish_explanation(question: str, options: dict, raw_text: str, context: list, rag_similarity: float = 0.0):
+    """Parse the local model output, then fall back to Gemini or gate its review."""
     predicted_answer = extract_answer_from_response(raw_text, options)
     cleaned_explanation = clean_explanation_text(raw_text)
 
     if not predicted_answer or not is_explanation_valid(cleaned_explanation):
-        return fallback_to_gemini(question, options)
+        return fallback_to_gemini(question, options), {"source": "gemini_fallback"}
+
+    local_result = {"predicted_answer": predicted_answer, "explanation": cleaned_explanation}
+    provenance = {
+        "source": "llama",
+        "llama_answer": predicted_answer,
+        "context_passages": len(context),
+        "rag_similarity": round(rag_similarity, 4),
+        "review": decide_review(question, options, predicted_answer, raw_text, rag_similarity),
+    }
+    if provenance["review"] != REVIEW_SYNC:
+        # Skipped, or deferred to store_explanation's background review
+        return local_result, provenance
+
+    # Local answer contradicts a verified answer: Gemini reviews before returning
+    reviewed = review_with_gemini(question, options, predicted_answer, cleaned_explanation)
+    provenance["source"] = "llama+gemini_review"
+    provenance["corrected_by_review"] = record_review_outcome(
+        REVIEW_SYNC, predicted_answer, reviewed["predicted_answer"]
+    )
+    return reviewed, provenance
 
-    # Gemini reviews the answer + explanation; corrects if necessary
-    return review_with_gemini(question, options, predicted_answer, cleaned_explanation)
+
+def stream_explanation(question: str, options: dict):
+    """
+    Yield ("token", text) events as the local model generates, then one
+    ("final", result) event with the parsed answer and any review correction.
+    """
+    key = explanation_key(question, options)
+    cached = explanation_cache.get(key)
+    if cached is not None:
+        yield "token", cached.get("explanation") or ""
+        yield "final", {**cached, "cached": True, "corrected": False}
+        return
+
+    context, rag_similarity = rag.get_context_with_score(question, top_k=3, max_total_words=250)
+    prompt = build_prompt_with_context_for_explanation(question, options, context)
+
+    pieces = []
+    for chunk in llm(prompt, max_tokens=400, stream=True):
+        text = chunk["choices"][0]["text"]
+        if text:
+            pieces.append(text)
+            yield "token", text
+
+    result, provenance = finish_explanation(question, options, "".join(pieces).strip(), context, rag_similarity)
+    store_explanation(key, question, options, result, {**provenance, "trigger": "stream"})
+    corrected = provenance["source"] == "gemini_fallback" or provenance.get("corrected_by_review", False)
+    yield "final", {
+        **result,
+        "cached": False,
+        "corrected": corrected,
+        "source": provenance["source"],
+        "review": provenance.get("review"),
+    }
 
 
 def verify_answer_by_generation(
@@ -232,6 +378,11 @@ def is_inappropriate(question: str) -> bool:
     return any(word in question.lower() for word in banned_keywords)
 
 def is_biology_question(question: str) -> bool:
+    #  Local embedding gate; Gemini only for questions it is unsure about
+    return biology_gate.is_biology(question, remote_check=is_biology_question_remote)
+
+
+def is_biology_question_remote(question: str) -> bool:
     prompt = f"""
 Decide whether the following question is related to biology.
 
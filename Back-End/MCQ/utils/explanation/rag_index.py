@@ -0,0 +1,54 @@
+# utils/explanation/rag_index.py
+"""
+Inner-product FAISS indexes for RAG retrieval.
+
+RAG_INDEX_TYPE selects the search structure built over the stored passage vectors:
+    flat  exact search (default)
+    hnsw  graph search; RAG_HNSW_M (32), RAG_HNSW_EF_SEARCH (64)
+    ivf   inverted lists; RAG_IVF_NLIST (~sqrt of passages), RAG_IVF_NPROBE (8)
+Compare recall and latency with: python -m benchmarks.bench_rag_retrieval
+"""
+import os
+import numpy as np
+import faiss
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+
+
+def index_settings_from_env():
+    index_type = os.getenv("RAG_INDEX_TYPE", "flat").strip().lower()
+    return {
+        "index_type": index_type if index_type in INDEX_TYPES else "flat",
+        "hnsw_m": int(os.getenv("RAG_HNSW_M", "32")),
+        "ef_search": int(os.getenv("RAG_HNSW_EF_SEARCH", "64")),
+        "nlist": int(os.getenv("RAG_IVF_NLIST", "0")) or None,
+        "nprobe": int(os.getenv("RAG_IVF_NPROBE", "8")),
+    }
+
+
+def index_vectors(index):
+    """All stored vectors of a flat index, as a float32 matrix."""
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def build_index(vectors, index_type="flat", hnsw_m=32, ef_search=64, nlist=None, nprobe=8):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    dim = vectors.shape[1]
+
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = ef_search
+    elif index_type == "ivf":
+        # sqrt(n) lists, but at least 39 training points per list as FAISS recommends
+        nlist = nlist or max(1, min(int(np.sqrt(len(vectors))), len(vectors) // 39))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = min(nprobe, nlist)
+    elif index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+    else:
+        raise ValueError(f"Unknown RAG index type: {index_type}")
+
+    index.add(vectors)
+    return index
@@ -0,0 +1,116 @@
+# utils/explanation/review_gate.py
+"""
+Decides whether a local explanation needs a Gemini review, and how.
+
+    skipped_verified   local answer matches the verified answer in the fallback pool
+    skipped_confident  strong RAG context match and an unambiguous "Answer: X" line
+    sync               local answer contradicts a verified answer; review before returning
+    async              everything else; return the local answer now, review in the
+                       background and patch the cached result
+
+Thresholds (tune with GET /explanations/review_stats):
+    REVIEW_SKIP_RAG_SIMILARITY         best RAG inner-product similarity (default 0.6)
+    REVIEW_SKIP_EXTRACTION_CONFIDENCE  answer extraction confidence (default 0.9)
+"""
+import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pymongo.errors import PyMongoError
+from database.database import fallback_questions
+from utils.fallback_pool import OPTION_LETTERS, question_hash
+from utils.metrics import counter
+
+logger = logging.getLogger("review_gate")
+logger.setLevel(logging.INFO)
+
+RAG_SIMILARITY_THRESHOLD = float(os.getenv("REVIEW_SKIP_RAG_SIMILARITY", "0.6"))
+EXTRACTION_CONFIDENCE_THRESHOLD = float(os.getenv("REVIEW_SKIP_EXTRACTION_CONFIDENCE", "0.9"))
+
+SKIPPED_VERIFIED = "skipped_verified"
+SKIPPED_CONFIDENT = "skipped_confident"
+REVIEW_SYNC = "sync"
+REVIEW_ASYNC = "async"
+DECISIONS = (SKIPPED_VERIFIED, SKIPPED_CONFIDENT, REVIEW_SYNC, REVIEW_ASYNC)
+
+ANSWER_LINE_RE = re.compile(r"\bAnswer\s*[:\-]?\s*([A-E])\b", re.IGNORECASE)
+
+review_decisions_total = counter(
+    "explanation_review_decisions_total", "Gemini review decisions for local explanations", ["decision"]
+)
+review_disagreements_total = counter(
+    "explanation_review_disagreements_total", "Gemini reviews that changed the local answer", ["decision"]
+)
+
+review_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REVIEW_WORKERS", "2")), thread_name_prefix="gemini-review"
+)
+
+
+def answer_extraction_confidence(raw_text: str, options: dict) -> float:
+    """
+    1.0 for exactly one consistent "Answer: X" letter, 0.5 when several lines name
+    different letters, 0.3 when only a bare letter line was found, 0.0 otherwise.
+    """
+    letters = {m.group(1).upper() for m in ANSWER_LINE_RE.finditer(raw_text)} & set(options)
+    if len(letters) == 1:
+        return 1.0
+    if letters:
+        return 0.5
+    if any(line.strip().upper() in options and len(line.strip()) == 1 for line in raw_text.splitlines()):
+        return 0.3
+    return 0.0
+
+
+def lookup_verified_answer_text(question: str):
+    """Correct option text stored for this question in the verified pool, if any."""
+    try:
+        doc = fallback_questions.find_one({"question_hash": question_hash(question)})
+    except PyMongoError as e:
+        logger.warning(f"⚠️ Verified answer lookup failed: {e}")
+        return None
+    if not doc or doc.get("correct_answer") not in OPTION_LETTERS:
+        return None
+    return doc.get(f"option{OPTION_LETTERS.index(doc['correct_answer']) + 1}")
+
+
+def decide_review(question: str, options: dict, predicted_answer: str, raw_text: str, rag_similarity: float) -> str:
+    verified_text = lookup_verified_answer_text(question)
+    if verified_text is not None:
+        predicted_text = str(options.get(predicted_answer, "")).strip().lower()
+        decision = SKIPPED_VERIFIED if predicted_text == str(verified_text).strip().lower() else REVIEW_SYNC
+    elif (
+        rag_similarity >= RAG_SIMILARITY_THRESHOLD
+        and answer_extraction_confidence(raw_text, options) >= EXTRACTION_CONFIDENCE_THRESHOLD
+    ):
+        decision = SKIPPED_CONFIDENT
+    else:
+        decision = REVIEW_ASYNC
+
+    review_decisions_total.inc(decision=decision)
+    return decision
+
+
+def record_review_outcome(decision: str, original_answer: str, reviewed_answer: str) -> bool:
+    changed = reviewed_answer != original_answer
+    if changed:
+        review_disagreements_total.inc(decision=decision)
+    return changed
+
+
+def review_stats() -> dict:
+    decisions = {d: review_decisions_total.value(decision=d) for d in DECISIONS}
+    total = sum(decisions.values())
+    skipped = decisions[SKIPPED_VERIFIED] + decisions[SKIPPED_CONFIDENT]
+    reviewed = decisions[REVIEW_SYNC] + decisions[REVIEW_ASYNC]
+    disagreements = sum(review_disagreements_total.value(decision=d) for d in (REVIEW_SYNC, REVIEW_ASYNC))
+    return {
+        "decisions": decisions,
+        "disagreements": disagreements,
+        "skip_rate": round(skipped / total, 4) if total else 0.0,
+        "disagreement_rate": round(disagreements / reviewed, 4) if reviewed else 0.0,
+        "thresholds": {
+            "rag_similarity": RAG_SIMILARITY_THRESHOLD,
+            "extraction_confidence": EXTRACTION_CONFIDENCE_THRESHOLD,
+        },
+    }
@@ -0,0 +1,185 @@
+"""
+Curated fallback question pool.
+
+Holds dataset questions and verified generated questions in `fallback_questions`,
+indexed by difficulty/cluster with a random key so partial quizzes can be completed
+with on-level items in O(log n) instead of `$sample` over every stored quiz.
+
+Seed manually with:
+    python -m utils.fallback_pool
+"""
+import os
+import re
+import random
+import hashlib
+import logging
+import time
+import pandas as pd
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from database.database import fallback_questions, quizzes_collection
+from utils.question_store import hydrate_quiz
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+DATASET_PATH = "dataset/merged_mcq_dataset.csv"
+# Written by dataset/generate_embeddings.py; same rows plus a topic "Cluster" column
+CLUSTERED_DATASET_PATH = "dataset/question_dataset_with_clusters.csv"
+
+DIFFICULTIES = ("easy", "medium", "hard")
+OPTION_LETTERS = ("A", "B", "C", "D", "E")
+# How many of the user's latest quizzes count as "recently seen"
+RECENT_QUIZ_WINDOW = 5
+
+
+def question_hash(question_text):
+    """Stable key for a question: SHA-1 of the lower-cased, whitespace-collapsed text."""
+    normalized = re.sub(r"\s+", " ", str(question_text)).strip(" .?:").lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _pool_document(question_text, options, correct_letter, difficulty, cluster, source):
+    return {
+        "question_hash": question_hash(question_text),
+        "question_text": question_text,
+        **{f"option{i + 1}": options[i] for i in range(5)},
+        "correct_answer": correct_letter,
+        "difficulty": difficulty,
+        "cluster": cluster,
+        "source": source,
+        "rand": random.random(),
+        "added_at": time.time(),
+    }
+
+
+def _upsert_documents(documents):
+    """Insert documents whose question_hash is not in the pool yet. Returns the number inserted."""
+    if not documents:
+        return 0
+    operations = [
+        UpdateOne({"question_hash": doc["question_hash"]}, {"$setOnInsert": doc}, upsert=True)
+        for doc in documents
+    ]
+    result = fallback_questions.bulk_write(operations, ordered=False)
+    return result.upserted_count
+
+
+def seed_from_dataset(path=None):
+    """Load curated dataset questions into the pool. Returns the number of new questions."""
+    if path is None:
+        path = CLUSTERED_DATASET_PATH if os.path.exists(CLUSTERED_DATASET_PATH) else DATASET_PATH
+
+    df = pd.read_csv(path, encoding="latin1").fillna("")
+    documents = []
+    for _, row in df.iterrows():
+        difficulty = str(row.get("Difficulty Level", "")).strip().lower()
+        options = [str(row[f"Option {i}"]).strip() for i in range(1, 6)]
+        correct_text = str(row["Correct Answer"]).strip()
+        if difficulty not in DIFFICULTIES or correct_text not in options or not row["Question Text"]:
+            continue
+
+        cluster = row.get("Cluster")
+        documents.append(
+            _pool_document(
+                row["Question Text"].strip(),
+                options,
+                OPTION_LETTERS[options.index(correct_text)],
+                difficulty,
+                int(cluster) if cluster not in (None, "") else None,
+                "dataset",
+            )
+        )
+
+    inserted = _upsert_documents(documents)
+    logging.info(f"🌱 Seeded fallback pool from {path}: {inserted} new of {len(documents)} questions.")
+    return inserted
+
+
+def add_verified_questions(questions, source="generated"):
+    """Add verified quiz questions (quiz document format) to the pool."""
+    documents = [
+        _pool_document(
+            q["question_text"],
+            [q.get(f"option{i}", "") for i in range(1, 6)],
+            q["verified_answer"],
+            q.get("difficulty", "medium"),
+            q.get("cluster"),
+            source,
+        )
+        for q in questions
+        if q.get("is_verified")
+        and q.get("verified_answer") in OPTION_LETTERS
+        and q.get("difficulty") in DIFFICULTIES
+        and q.get("source") != "fallback_pool"
+    ]
+    return _upsert_documents(documents)
+
+
+def ensure_pool_seeded():
+    """Startup hook: seed the pool from the dataset when it is empty."""
+    try:
+        if fallback_questions.estimated_document_count() == 0:
+            seed_from_dataset()
+    except (PyMongoError, OSError) as e:
+        logging.error(f" Could not seed fallback pool: {e}")
+
+
+def get_recently_seen_hashes(user_id, quiz_limit=RECENT_QUIZ_WINDOW):
+    """Question hashes from the user's latest quizzes (served by the user_id/created_at index)."""
+    recent_quizzes = quizzes_collection.find(
+        {"user_id": user_id},
+        {"questions.question_text": 1, "question_refs.question_id": 1, "_id": 0},
+    ).sort("created_at", -1).limit(quiz_limit)
+    return {
+        question_hash(q["question_text"])
+        for quiz in recent_quizzes
+        for q in hydrate_quiz(quiz, partial=True).get("questions", [])
+        if "question_text" in q
+    }
+
+
+def _to_quiz_question(doc):
+    return {
+        "question_text": doc["question_text"],
+        **{f"option{i}": doc.get(f"option{i}", "N/A") for i in range(1, 6)},
+        "correct_answer": doc["correct_answer"],
+        "claimed_answer": doc["correct_answer"],
+        "verified_answer": doc["correct_answer"],
+        "is_verified": True,
+        "difficulty": doc["difficulty"],
+        "source": "fallback_pool",
+    }
+
+
+def sample_pool_questions(count, difficulty=None, exclude_hashes=(), cluster=None):
+    """
+    Draw up to `count` random pool questions using the indexed random key:
+    seek to a random point in (difficulty[, cluster], rand) and wrap around if needed.
+    """
+    if count <= 0:
+        return []
+
+    query = {}
+    if difficulty:
+        query["difficulty"] = difficulty
+    if cluster is not None:
+        query["cluster"] = cluster
+    if exclude_hashes:
+        query["question_hash"] = {"$nin": list(exclude_hashes)}
+
+    pivot = random.random()
+    docs = list(
+        fallback_questions.find({**query, "rand": {"$gte": pivot}}).sort("rand", 1).limit(count)
+    )
+    if len(docs) < count:
+        docs += list(
+            fallback_questions.find({**query, "rand": {"$lt": pivot}})
+            .sort("rand", 1)
+            .limit(count - len(docs))
+        )
+    return [_to_quiz_question(doc) for doc in docs]
+
+
+if __name__ == "__main__":
+    seed_from_dataset()
@@ -1,6 +1,5 @@
 import requests
 import logging
-import faiss
 import numpy as np
 import pandas as pd
 import time
@@ -15,19 +14,21 @@ from utils.quiz_generation_methods import (
     is_similar_to_past_quiz_questions,
     is_duplicate_faiss,
     clean_correct_answer,
+    encode_questions,
 )
 from routes.response_routes import estimate_student_ability
-from utils.model_loader import embedding_model, llm
+from utils.model_loader import embedding_model, llm, question_index, question_dataset
 from sklearn.metrics.pairwise import cosine_similarity
 from utils.verification import verify_mcq_with_llm
 from utils.answer_verifier import generate_mcq_with_gemini
+from utils.mcq_grammar import is_constrained_decoding_enabled, get_mcq_grammar
+from utils.metrics import counter, histogram
 
 load_dotenv()
 
-# Load FAISS index and dataset
-index = faiss.read_index("dataset/question_embeddings.index")
-embeddings_matrix = np.load("dataset/question_embeddings.npy")
-dataset = pd.read_csv("dataset/question_dataset_with_clusters.csv")
+#  FAISS index and dataset, loaded on first use by the model registry
+index = question_index
+dataset = question_dataset
 
 
 def build_llama2_chat_prompt(instruction: str) -> str:
@@ -36,6 +37,77 @@ def build_llama2_chat_prompt(instruction: str) -> str:
 
 mcq_cache = {}
 
+# Generation metrics, labelled by decoding mode ("constrained" or "free")
+llm_calls_total = counter("mcq_llm_calls_total", "Local LLM calls made to generate MCQs", ["mode"])
+questions_extracted_total = counter(
+    "mcq_questions_extracted_total", "MCQs parsed from local LLM output", ["mode"]
+)
+questions_accepted_total = counter(
+    "mcq_questions_accepted_total", "Locally generated MCQs accepted after validation", ["mode"]
+)
+llm_tokens_total = counter("mcq_llm_tokens_total", "Tokens streamed from the local LLM", ["mode"])
+
+# Per-stage timings and outcomes, labelled by generator ("standard" or "adaptive")
+generation_stage_seconds = histogram(
+    "mcq_generation_stage_seconds", "Time spent in each MCQ generation stage", ["generator", "stage"]
+)
+generation_attempts_total = counter(
+    "mcq_generation_attempts_total", "MCQ generation loop iterations", ["generator"]
+)
+questions_rejected_total = counter(
+    "mcq_questions_rejected_total", "Generated MCQs rejected before acceptance, by reason", ["generator", "reason"]
+)
+
+PLACEHOLDER_MARKERS = ("Question", "<Insert your question>", "Generate a")
+
+
+def get_generation_mode(question_count):
+    """Return (mode, extra llm kwargs) for generating `question_count` MCQs in one call."""
+    if is_constrained_decoding_enabled():
+        grammar = get_mcq_grammar(question_count)
+        if grammar is not None:
+            return "constrained", {"grammar": grammar}
+    return "free", {}
+
+
+def run_llm(prompt, generator, mode, **kwargs):
+    """
+    Stream a completion from the local LLM so prompt evaluation (time to the first
+    token) and token generation are timed separately. Returns a completion dict.
+    """
+    started = time.perf_counter()
+    first_token_at = None
+    parts = []
+    for chunk in llm(prompt, stream=True, **kwargs):
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+        choices = chunk.get("choices") or []
+        if choices:
+            parts.append(choices[0].get("text", ""))
+    finished = time.perf_counter()
+    first_token_at = first_token_at or finished
+
+    generation_stage_seconds.observe(first_token_at - started, generator=generator, stage="prompt_eval")
+    generation_stage_seconds.observe(finished - first_token_at, generator=generator, stage="token_generation")
+    llm_calls_total.inc(mode=mode)
+    llm_tokens_total.inc(len(parts), mode=mode)
+    return {"choices": [{"text": "".join(parts)}]} if parts else {"choices": []}
+
+
+def option_rejection_reason(options, correct_letters):
+    """First structural problem with a parsed MCQ's options or answer, or None."""
+    if len(options) != 5:
+        return "option_count"
+    if any(not opt.strip() for opt in options.values()):
+        return "empty_option"
+    if len(set(options.values())) < 5:
+        return "duplicate_options"
+    if not correct_letters:
+        return "missing_answer"
+    if any(letter not in options for letter in correct_letters):
+        return "invalid_answer"
+    return None
+
 
 # Method to generate MCQs with unique context
 def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
@@ -49,6 +121,7 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
         existing_questions = set()
 
     while retries < max_retries and len(valid_mcqs) < 3:
+        generation_attempts_total.inc(generator="standard")
         try:
             #  Check if dataset is empty before sampling
             if dataset.empty:
@@ -63,7 +136,8 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
                 continue
 
             random_question = sampled_question.iloc[0]["Question Text"]
-            context_questions = retrieve_context_questions(random_question, top_k=3)
+            with generation_stage_seconds.time(generator="standard", stage="context"):
+                context_questions = retrieve_context_questions(random_question, top_k=3)
 
             # Construct context-based prompt
             context_list = [
@@ -116,8 +190,15 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
                     retries += 1
                     continue
 
-                output = llm(
-                    prompt, max_tokens=adjusted_max_tokens, temperature=0.8, top_p=0.95
+                mode, grammar_kwargs = get_generation_mode(remaining)
+                output = run_llm(
+                    prompt,
+                    "standard",
+                    mode,
+                    max_tokens=adjusted_max_tokens,
+                    temperature=0.8,
+                    top_p=0.95,
+                    **grammar_kwargs,
                 )
                 if "choices" not in output or not output["choices"]:
                     logging.error(
@@ -135,7 +216,9 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
                 time.sleep(1)
                 continue
 
-            extracted_mcqs = extract_mcqs(prompt, raw_output)
+            with generation_stage_seconds.time(generator="standard", stage="extract"):
+                extracted_mcqs = extract_mcqs(prompt, raw_output)
+            questions_extracted_total.inc(len(extracted_mcqs), mode=mode)
 
             if not extracted_mcqs:
                 retries += 1
@@ -144,18 +227,6 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
 
             for question_data in extracted_mcqs:
                 question_text = question_data.get("question", "").strip()
-                # Duplicate checks
-                if (
-                    not question_text
-                    or is_duplicate_faiss(question_text, index, 0.85)
-                    or is_similar_to_same_quiz_questions(
-                        question_text, batch_generated_questions, threshold=0.85
-                    )
-                    or question_text in batch_generated_questions
-                    or question_text in existing_questions
-                ):
-                    continue
-
                 options = question_data.get("options", {})
                 correct_letters = clean_correct_answer(
                     question_data.get("correct_answer", "")
@@ -164,20 +235,27 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
                     correct_letters
                 )  # For consistent formatting
 
-                # Validation checks
-                if any(
-                    [
-                        "error" in question_data,
-                        "Question" in question_text,
-                        "<Insert your question>" in question_text,
-                        "Generate a" in question_text,
-                        len(options) != 5,
-                        any(not opt.strip() for opt in options.values()),
-                        len(set(options.values())) < 5,
-                        not correct_letters,
-                        any(letter not in options for letter in correct_letters),
-                    ]
-                ):
+                #  Cheap checks first; embedding-based duplicate checks only for well-formed questions
+                if not question_text:
+                    reason = "empty_question"
+                elif question_text in batch_generated_questions or question_text in existing_questions:
+                    reason = "repeated_in_quiz"
+                elif "error" in question_data or any(m in question_text for m in PLACEHOLDER_MARKERS):
+                    reason = "placeholder_text"
+                else:
+                    reason = option_rejection_reason(options, correct_letters)
+
+                if reason is None:
+                    with generation_stage_seconds.time(generator="standard", stage="dedup"):
+                        if is_duplicate_faiss(question_text, index, 0.85):
+                            reason = "duplicate_in_bank"
+                        elif is_similar_to_same_quiz_questions(
+                            question_text, batch_generated_questions, threshold=0.85
+                        ):
+                            reason = "similar_in_quiz"
+
+                if reason is not None:
+                    questions_rejected_total.inc(generator="standard", reason=reason)
                     continue
 
                 #  Add difficulty level
@@ -191,9 +269,10 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
                 claimed_answer = correct_letters[0] if correct_letters else None
 
                 # Perform answer verification
-                is_correct, verified, claimed = verify_mcq_with_llm(
-                    question_data["question"], options, claimed_answer
-                )
+                with generation_stage_seconds.time(generator="standard", stage="verify"):
+                    is_correct, verified, claimed = verify_mcq_with_llm(
+                        question_data["question"], options, claimed_answer
+                    )
 
                 question_data["claimed_answer"] = (
                     claimed  # Store original generated answer
@@ -213,11 +292,12 @@ def generate_mcq(difficulty, user_id, max_retries=3, existing_questions=None):
                     question_data["is_verified"] = False
 
                 #  Store in FAISS
-                new_vector = embedding_model.encode([question_text]).astype(np.float32)
-                index.add(new_vector)
+                with generation_stage_seconds.time(generator="standard", stage="index_add"):
+                    index.add(encode_questions([question_text]))
 
                 batch_generated_questions.add(question_text)
                 valid_mcqs.append(question_data)
+                questions_accepted_total.inc(mode=mode)
 
                 if len(valid_mcqs) >= 3:
                     break
@@ -248,6 +328,7 @@ def generate_mcq_based_on_performance(
     used_prompt = None  # to reuse in fallback
 
     while retries < max_retries and len(valid_mcqs) < 3:
+        generation_attempts_total.inc(generator="adaptive")
         try:
             logging.info(f"🔁 Retry {retries + 1}/{max_retries} — Generating {difficulty}-level MCQ for user {user_id} (Theta: {theta})")
 
@@ -263,7 +344,8 @@ def generate_mcq_based_on_performance(
                 continue
 
             random_question = sampled_question.iloc[0]["Question Text"]
-            context_questions = retrieve_context_questions(random_question, top_k=3)
+            with generation_stage_seconds.time(generator="adaptive", stage="context"):
+                context_questions = retrieve_context_questions(random_question, top_k=3)
 
             context_list = [
                 f"- {row['Question Text']} (Correct Answer: {row['Correct Answer']})"
@@ -309,7 +391,16 @@ def generate_mcq_based_on_performance(
                 retries += 1
                 continue
 
-            output = llm(prompt, max_tokens=adjusted_max_tokens, temperature=0.8, top_p=0.95)
+            mode, grammar_kwargs = get_generation_mode(remaining)
+            output = run_llm(
+                prompt,
+                "adaptive",
+                mode,
+                max_tokens=adjusted_max_tokens,
+                temperature=0.8,
+                top_p=0.95,
+                **grammar_kwargs,
+            )
             if "choices" not in output or not output["choices"]:
                 retries += 1
                 continue
@@ -317,7 +408,9 @@ def generate_mcq_based_on_performance(
             raw_output = output["choices"][0]["text"]
             logging.info(f"⚠ RAW LOCAL MODEL RESPONSE: {raw_output}")
 
-            extracted_mcqs = extract_mcqs(prompt, raw_output)
+            with generation_stage_seconds.time(generator="adaptive", stage="extract"):
+                extracted_mcqs = extract_mcqs(prompt, raw_output)
+            questions_extracted_total.inc(len(extracted_mcqs), mode=mode)
 
             if not extracted_mcqs:
                 retries += 1
@@ -332,34 +425,41 @@ def generate_mcq_based_on_performance(
                 claimed_answer = correct_letters[0] if correct_letters else None
                 mcq["correct_answer"] = ", ".join(correct_letters)
 
-                is_correct, verified, claimed = verify_mcq_with_llm(
-                    question, options, claimed_answer
-                )
+                #  Cheap checks first, then embedding-based ones; only survivors are sent to Gemini
+                if not question:
+                    reason = "empty_question"
+                elif question in batch_generated_questions or question in existing_questions:
+                    reason = "repeated_in_quiz"
+                else:
+                    reason = option_rejection_reason(options, correct_letters)
+
+                new_vector = None
+                if reason is None:
+                    with generation_stage_seconds.time(generator="adaptive", stage="dedup"):
+                        if is_duplicate_faiss(question, index, 0.85):
+                            reason = "duplicate_in_bank"
+                        elif is_similar_to_same_quiz_questions(question, batch_generated_questions, 0.85):
+                            reason = "similar_in_quiz"
+                        elif is_similar_to_past_quiz_questions(question, user_id, threshold=0.65):
+                            reason = "similar_to_past_quiz"
+                        elif past_embeddings is not None:
+                            new_vector = encode_questions([question])
+                            if max(cosine_similarity(new_vector, past_embeddings)[0]) >= 0.65:
+                                reason = "similar_to_past_quiz"
+
+                if reason is not None:
+                    questions_rejected_total.inc(generator="adaptive", reason=reason)
+                    continue
+
+                with generation_stage_seconds.time(generator="adaptive", stage="verify"):
+                    is_correct, verified, claimed = verify_mcq_with_llm(
+                        question, options, claimed_answer
+                    )
                 mcq["claimed_answer"] = claimed
                 mcq["correct_answer"] = verified if not is_correct and verified in options else claimed
                 mcq["verified_answer"] = verified if is_correct else None
                 mcq["is_verified"] = is_correct is not None
 
-                if any([
-                    is_similar_to_past_quiz_questions(question, user_id, threshold=0.65),
-                    not question,
-                    len(options) != 5,
-                    any(not v.strip() for v in options.values()),
-                    len(set(options.values())) < 5,
-                    not correct_letters,
-                    any(c not in options for c in correct_letters),
-                    is_duplicate_faiss(question, index, 0.85),
-                    is_similar_to_same_quiz_questions(question, batch_generated_questions, 0.85),
-                    question in batch_generated_questions,
-                    question in existing_questions,
-                ]):
-                    continue
-
-                if past_embeddings is not None:
-                    new_vec = embedding_model.encode([question]).astype(np.float32)
-                    if max(cosine_similarity(new_vec, past_embeddings)[0]) >= 0.65:
-                        continue
-
                 mcq.update({
                     "difficulty": difficulty,
                     "b": assign_difficulty_parameter(user_id, difficulty),
@@ -367,10 +467,11 @@ def generate_mcq_based_on_performance(
                     "c": 0.2,
                 })
 
-                new_vector = embedding_model.encode([question]).astype(np.float32)
-                index.add(new_vector)
+                with generation_stage_seconds.time(generator="adaptive", stage="index_add"):
+                    index.add(new_vector if new_vector is not None else encode_questions([question]))
                 valid_mcqs.append(mcq)
                 batch_generated_questions.add(question)
+                questions_accepted_total.inc(mode=mode)
                 added += 1
 
                 if len(valid_mcqs) >= 3:
@@ -386,8 +487,9 @@ def generate_mcq_based_on_performance(
 
     if len(valid_mcqs) < 3:
         try:
-            raw_output = generate_mcq_with_gemini(used_prompt)
-            extracted_mcqs = extract_mcqs(used_prompt, raw_output)
+            with generation_stage_seconds.time(generator="adaptive", stage="gemini_fallback"):
+                raw_output = generate_mcq_with_gemini(used_prompt)
+                extracted_mcqs = extract_mcqs(used_prompt, raw_output)
             for mcq in extracted_mcqs:
                 if len(valid_mcqs) >= 3:
                     break
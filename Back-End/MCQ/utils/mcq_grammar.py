@@ -0,0 +1,61 @@
+import os
+import logging
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Constrained decoding is opt-in: MCQ_CONSTRAINED_DECODING=true in .env
+_constrained_decoding = os.getenv("MCQ_CONSTRAINED_DECODING", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Shared rules: every question has five non-empty options and a single answer letter.
+# Text may not start with "<" so template echoes like "<Insert your question>" cannot be produced.
+_COMMON_RULES = r'''
+options ::= "A) " text "\n" "B) " text "\n" "C) " text "\n" "D) " text "\n" "E) " text "\n"
+answer ::= "Correct Answer: " [A-E] "\n"
+text ::= [A-Za-z0-9(\"'] [^\n<>]*
+'''
+
+
+def is_constrained_decoding_enabled():
+    return _constrained_decoding
+
+
+def set_constrained_decoding(enabled):
+    """Toggle grammar-constrained generation at runtime (e.g. from a shell or admin task)."""
+    global _constrained_decoding
+    _constrained_decoding = bool(enabled)
+    logging.info(f"🧩 Constrained MCQ decoding {'enabled' if _constrained_decoding else 'disabled'}")
+
+
+def build_mcq_gbnf(question_count):
+    """
+    GBNF grammar for exactly `question_count` MCQs in the prompt's format:
+
+        Question 1: <question>
+        A) ... E) <options>
+        Correct Answer: <A-E>
+
+    The output stays in the format `extract_mcqs` already parses.
+    """
+    if question_count < 1:
+        raise ValueError("question_count must be at least 1")
+
+    question_rules = [
+        f'question{k} ::= "Question {k}: " text "\\n" options answer'
+        for k in range(1, question_count + 1)
+    ]
+    root = "root ::= " + ' "\\n" '.join(f"question{k}" for k in range(1, question_count + 1))
+    return "\n".join([root, *question_rules]) + _COMMON_RULES
+
+
+@lru_cache(maxsize=8)
+def get_mcq_grammar(question_count):
+    """Compiled grammar for `question_count` questions, or None if llama_cpp rejects it."""
+    try:
+        from llama_cpp import LlamaGrammar
+
+        return LlamaGrammar.from_string(build_mcq_gbnf(question_count), verbose=False)
+    except Exception as e:
+        logging.error(f"⚠ Could not compile MCQ grammar, falling back to free generation: {e}")
+        return None
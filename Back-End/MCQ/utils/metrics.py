@@ -0,0 +1,168 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Process-wide metric registry: name -> metric
+_registry = {}
+_registry_lock = threading.Lock()
+
+# Prometheus text exposition format served by GET /metrics
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; wide enough for multi-minute local LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Return [(labels dict, value)] for every label combination seen so far."""
+        with self._lock:
+            return [(dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonic counter with optional labels, safe to update from worker threads."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram with optional labels. An observation is one bisect and
+    one locked list update, so it is cheap enough for per-stage timings.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)  # len(buckets) is the +Inf slot
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            state["counts"][slot] += 1
+            state["sum"] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock seconds spent in the `with` block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return sum(state["counts"]) if state else 0
+
+    def sum(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["sum"] if state else 0.0
+
+    def samples(self):
+        """Return [(labels dict, {"buckets": [(le, cumulative count)], "sum", "count"})]."""
+        with self._lock:
+            states = [(key, list(state["counts"]), state["sum"]) for key, state in self._values.items()]
+        samples = []
+        for key, counts, total in states:
+            cumulative, running = [], 0
+            for le, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                cumulative.append((le, running))
+            samples.append((dict(zip(self.labelnames, key)), {"buckets": cumulative, "sum": total, "count": running}))
+        return samples
+
+
+def _get_or_create(cls, name, documentation, labelnames, **kwargs):
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = cls(name, documentation, labelnames, **kwargs)
+        metric = _registry[name]
+    if not isinstance(metric, cls):
+        raise ValueError(f"{name} is already registered as a {metric.type}")
+    return metric
+
+
+def counter(name, documentation, labelnames=()):
+    """Get or create the counter registered under `name`."""
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    """Get or create the histogram registered under `name`."""
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def registered_metrics():
+    with _registry_lock:
+        return list(_registry.values())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus():
+    """Every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in sorted(registered_metrics(), key=lambda m: m.name):
+        lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for labels, value in metric.samples():
+            if metric.type != "histogram":
+                lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for le, count in value["buckets"]:
+                bucket_labels = {**labels, "le": _format_value(le)}
+                lines.append(f"{metric.name}_bucket{_format_labels(bucket_labels)} {count}")
+            lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+            lines.append(f"{metric.name}_count{_format_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
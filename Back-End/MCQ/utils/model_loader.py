@@ -1,11 +1,192 @@
-from sentence_transformers import SentenceTransformer
-from llama_cpp import Llama
+"""
+Lazy, thread-safe registry of models and artifacts.
 
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+Nothing heavy is loaded at import. Each component is loaded the first time it is
+used (or by POST /system/warmup), exactly once even under concurrent requests, and
+its load time and RSS growth are logged and reported by GET /system/ready.
 
-llm = Llama(
-    model_path="model/llama2-q8_0.gguf",
-    n_ctx=2048,
-    n_threads=4,
-    verbose=False
-)
+Module-level names (`embedding_model`, `llm`, ...) are proxies that forward attribute
+access and calls to the loaded object, so existing imports and test patches keep working.
+Tests that patch a module-level name (e.g. `utils.generate_question.llm`) never load it.
+"""
+import os
+import sys
+import time
+import logging
+import threading
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+LLM_MODEL_PATH = os.getenv("LLM_MODEL_PATH", "model/llama2-q8_0.gguf")
+QUESTION_INDEX_PATH = "dataset/question_embeddings.index"
+QUESTION_DATASET_PATH = "dataset/question_dataset_with_clusters.csv"
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource  # Not available on Windows
+    except ImportError:
+        return None
+    # Peak RSS: kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class LazyResource:
+    """Load-once proxy around a component; forwards attribute access and calls."""
+
+    def __init__(self, name, loader):
+        self._name = name
+        self._loader = loader
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._status = {"loaded": False, "seconds": None, "rss_mb_delta": None, "error": None}
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if self._loaded:
+                return self._value
+
+            rss_before = current_rss_mb()
+            started = time.perf_counter()
+            try:
+                value = self._loader()
+            except Exception as e:
+                self._status["error"] = str(e)
+                logging.error(f" Failed to load {self._name}: {e}")
+                raise
+            seconds = time.perf_counter() - started
+            rss_after = current_rss_mb()
+            rss_delta = round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None
+
+            self._value, self._loaded = value, True
+            self._status = {"loaded": True, "seconds": round(seconds, 3), "rss_mb_delta": rss_delta, "error": None}
+            logging.info(f"📦 Loaded {self._name} in {seconds:.2f}s (RSS +{rss_delta} MB)")
+            return value
+
+    def set(self, value):
+        """Install an already-built component instead of loading it (benchmarks, tests)."""
+        with self._lock:
+            self._value, self._loaded = value, True
+            self._status = {"loaded": True, "seconds": 0.0, "rss_mb_delta": None, "error": None}
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def status(self):
+        return dict(self._status)
+
+    def __getattr__(self, attr):
+        # Only reached for attributes not set on the proxy itself
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+    def __len__(self):
+        return len(self.get())
+
+    def __iter__(self):
+        return iter(self.get())
+
+    def __getitem__(self, key):
+        return self.get()[key]
+
+    def __repr__(self):
+        return f"<LazyResource {self._name} loaded={self._loaded}>"
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._resources = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        """Register a loader under `name` (idempotent) and return its lazy proxy."""
+        with self._lock:
+            if name not in self._resources:
+                self._resources[name] = LazyResource(name, loader)
+            return self._resources[name]
+
+    def provide(self, name, value):
+        """Use `value` for a registered component; raises KeyError for unknown names."""
+        self._resources[name].set(value)
+
+    def names(self):
+        with self._lock:
+            return list(self._resources)
+
+    def warmup(self, names=None):
+        """Load the given components (all by default); returns the readiness report."""
+        names = names or self.names()
+        unknown = [name for name in names if name not in self._resources]
+        if unknown:
+            raise KeyError(f"Unknown components: {', '.join(unknown)}")
+        for name in names:
+            try:
+                self._resources[name].get()
+            except Exception:
+                pass  # Recorded in the component status
+        return self.readiness()
+
+    def readiness(self):
+        with self._lock:
+            components = {name: resource.status() for name, resource in self._resources.items()}
+        return {
+            "ready": all(c["loaded"] for c in components.values()),
+            "rss_mb": round(current_rss_mb() or 0, 1),
+            "components": components,
+        }
+
+
+registry = ModelRegistry()
+
+
+def _load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+def _load_llm():
+    from llama_cpp import Llama
+
+    return Llama(
+        model_path=LLM_MODEL_PATH,
+        n_ctx=2048,
+        n_threads=4,
+        verbose=False
+    )
+
+
+def _load_question_index():
+    import faiss
+
+    return faiss.read_index(QUESTION_INDEX_PATH)
+
+
+def _load_question_dataset():
+    import pandas as pd
+
+    return pd.read_csv(QUESTION_DATASET_PATH)
+
+
+embedding_model = registry.register("embedding_model", _load_embedding_model)
+llm = registry.register("llm", _load_llm)
+#  Shared by generation and duplicate checks; generated questions are added to it at runtime
+question_index = registry.register("question_index", _load_question_index)
+question_dataset = registry.register("question_dataset", _load_question_dataset)
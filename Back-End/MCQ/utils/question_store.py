@@ -0,0 +1,211 @@
+# utils/question_store.py
+"""
+Shared question documents for quizzes.
+
+Question text and options live once in `questions`, keyed by a content hash in `_id`.
+Quizzes store `question_refs`: the ordered ids plus the per-quiz fields (answer keys,
+verification state, difficulty, source). Readers call `hydrate_quiz`, which fetches the
+shared documents in one `$in` query behind an in-process LRU. Shared documents never
+change once written, so cached entries never go stale.
+
+Quizzes stored before this module keep their embedded `questions` and are returned as is
+until they are moved over with:
+    python -m utils.question_store --migrate
+"""
+import os
+import time
+import hashlib
+import threading
+import logging
+import argparse
+from collections import OrderedDict
+from pymongo.errors import PyMongoError, BulkWriteError
+from database.database import questions_collection, quizzes_collection
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Fields shared by every quiz that contains the question; everything else is a per-quiz override
+SHARED_FIELDS = ("question_text", "option1", "option2", "option3", "option4", "option5")
+QUESTION_CACHE_SIZE = int(os.getenv("QUESTION_CACHE_SIZE", "5000"))
+
+
+class LRUCache:
+    """Thread-safe LRU for immutable shared question documents."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Cached values for `keys` as a dict; missing keys are left out."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        return found
+
+    def put_many(self, items):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+question_cache = LRUCache(QUESTION_CACHE_SIZE)
+
+
+def content_hash(question):
+    """SHA-1 over the question text and its five options."""
+    content = "\x1f".join(str(question.get(field, "")).strip() for field in SHARED_FIELDS)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def question_refs(questions):
+    """Ordered references for a quiz: the content hash plus every per-quiz field."""
+    return [
+        {"question_id": content_hash(q), **{k: v for k, v in q.items() if k not in SHARED_FIELDS}}
+        for q in questions
+    ]
+
+
+def store_questions(questions):
+    """Insert the shared part of any question not stored yet and return the quiz's references."""
+    refs = question_refs(questions)
+    shared = {
+        ref["question_id"]: {field: q.get(field, "") for field in SHARED_FIELDS}
+        for q, ref in zip(questions, refs)
+    }
+    #  Anything in the LRU is known to be stored; pooled questions usually are
+    unknown = shared.keys() - question_cache.get_many(shared).keys()
+    if unknown:
+        existing = {doc["_id"] for doc in questions_collection.find({"_id": {"$in": list(unknown)}}, {"_id": 1})}
+        new_docs = [{"_id": qid, **shared[qid], "created_at": time.time()} for qid in unknown - existing]
+        if new_docs:
+            try:
+                questions_collection.insert_many(new_docs, ordered=False)
+            except BulkWriteError as e:
+                #  Duplicate ids mean another quiz stored the same question first
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    raise
+        question_cache.put_many({qid: shared[qid] for qid in unknown})
+    return refs
+
+
+def normalize_quiz(quiz_data):
+    """Copy of a quiz document with embedded questions replaced by shared-store references."""
+    normalized = {k: v for k, v in quiz_data.items() if k != "questions"}
+    normalized["question_refs"] = store_questions(quiz_data.get("questions", []))
+    return normalized
+
+
+def fetch_shared(question_ids):
+    """Shared documents by id: cached ones from the LRU, the rest in a single `$in` query."""
+    wanted = set(question_ids)
+    found = question_cache.get_many(wanted)
+    missing = wanted - found.keys()
+    if missing:
+        fetched = {
+            doc["_id"]: {field: doc.get(field, "") for field in SHARED_FIELDS}
+            for doc in questions_collection.find({"_id": {"$in": list(missing)}})
+        }
+        question_cache.put_many(fetched)
+        found.update(fetched)
+    return found
+
+
+async def fetch_shared_async(question_ids, collection):
+    """`fetch_shared` for async routes, reading misses through an async `questions` collection."""
+    wanted = set(question_ids)
+    found = question_cache.get_many(wanted)
+    missing = wanted - found.keys()
+    if missing:
+        fetched = {
+            doc["_id"]: {field: doc.get(field, "") for field in SHARED_FIELDS}
+            async for doc in collection.find({"_id": {"$in": list(missing)}})
+        }
+        question_cache.put_many(fetched)
+        found.update(fetched)
+    return found
+
+
+class MissingQuestionError(LookupError):
+    """A quiz references shared questions that are not in the store."""
+
+
+def _merge_refs(refs, shared, partial=False):
+    missing = [ref["question_id"] for ref in refs if ref["question_id"] not in shared]
+    if missing and not partial:
+        #  A shorter quiz would shift answers onto the wrong questions
+        raise MissingQuestionError(f"Shared questions missing from the store: {', '.join(missing)}")
+    return [
+        {**shared[ref["question_id"]], **{k: v for k, v in ref.items() if k != "question_id"}}
+        for ref in refs
+        if ref["question_id"] in shared
+    ]
+
+
+def hydrate_questions(refs, partial=False):
+    """
+    Full question dicts, in quiz order, for a list of references. Raises MissingQuestionError
+    if any reference cannot be resolved, unless `partial` (read-only lookups) is set.
+    """
+    return _merge_refs(refs, fetch_shared(ref["question_id"] for ref in refs), partial)
+
+
+def hydrate_quiz(quiz, partial=False):
+    """Quiz with an embedded `questions` list, whichever way it was stored."""
+    if quiz and "question_refs" in quiz:
+        quiz["questions"] = hydrate_questions(quiz.pop("question_refs"), partial)
+    return quiz
+
+
+async def hydrate_quiz_async(quiz, collection):
+    """`hydrate_quiz` for async routes; `collection` is the async `questions` collection."""
+    if quiz and "question_refs" in quiz:
+        refs = quiz.pop("question_refs")
+        quiz["questions"] = _merge_refs(refs, await fetch_shared_async((ref["question_id"] for ref in refs), collection))
+    return quiz
+
+
+def migrate_embedded_quizzes(quizzes=quizzes_collection, batch_size=200):
+    """Move quizzes with embedded questions to shared-store references. Returns quizzes migrated."""
+    migrated = 0
+    cursor = quizzes.find({"questions": {"$exists": True}}, {"quiz_id": 1, "questions": 1}, batch_size=batch_size)
+    for quiz in cursor:
+        try:
+            refs = store_questions(quiz["questions"])
+            #  Guard on `questions` so a concurrent verifier write is not overwritten
+            result = quizzes.update_one(
+                {"_id": quiz["_id"], "questions": quiz["questions"]},
+                {"$set": {"question_refs": refs}, "$unset": {"questions": ""}},
+            )
+            migrated += result.modified_count
+        except PyMongoError as e:
+            logging.warning(f"⚠ Skipping quiz {quiz.get('quiz_id')}: {e}")
+    logging.info(f"✅ Moved {migrated} quizzes to the shared question store.")
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the shared question store.")
+    parser.add_argument("--migrate", action="store_true", help="Convert quizzes with embedded questions")
+    args = parser.parse_args()
+    if args.migrate:
+        migrate_embedded_quizzes()
+    else:
+        parser.print_help()
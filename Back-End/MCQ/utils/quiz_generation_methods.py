@@ -1,14 +1,15 @@
 import random
 from routes.response_routes import estimate_student_ability
 import logging
-import faiss
 import numpy as np
 import pandas as pd
 import re
-from bson import ObjectId
-from database.database import quizzes_collection
-from utils.model_loader import embedding_model
+from database.database import quizzes_collection, responses_collection
+from utils.fallback_pool import question_hash, get_recently_seen_hashes, sample_pool_questions
+from utils.question_store import hydrate_quiz
+from utils.model_loader import embedding_model, question_index, question_dataset
 from sklearn.metrics.pairwise import cosine_similarity
+from utils.metrics import histogram
 
 # Track seen questions to avoid duplicates
 seen_questions = set()
@@ -16,15 +17,24 @@ seen_questions = set()
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# Load FAISS index and dataset
-index = faiss.read_index("dataset/question_embeddings.index")
-embeddings_matrix = np.load("dataset/question_embeddings.npy")
-dataset = pd.read_csv("dataset/question_dataset_with_clusters.csv")
+#  FAISS index and dataset, loaded on first use by the model registry
+index = question_index
+dataset = question_dataset
+
+encode_seconds = histogram(
+    "mcq_embedding_encode_seconds", "SentenceTransformer encoding time during MCQ generation and dedup"
+)
+
+
+def encode_questions(texts):
+    """Encode question texts as float32 vectors, timing the call."""
+    with encode_seconds.time():
+        return embedding_model.encode(texts).astype(np.float32)
 
 # Method to retrieve diverse context questions to generate new questions
 def retrieve_context_questions(query_text, top_k=3):
     """Retrieve diverse MCQs from different clusters and difficulty levels for better generation context."""
-    query_vector = embedding_model.encode([query_text]).astype(np.float32)
+    query_vector = encode_questions([query_text])
 
     if index.ntotal == 0:
         logging.warning("⚠ FAISS index is empty! No previous questions available.")
@@ -91,10 +101,10 @@ def is_similar_to_same_quiz_questions(new_question, existing_questions, threshol
         return False  # No previous questions to compare with
     
     # Encode the new question
-    new_vector = embedding_model.encode([new_question]).astype(np.float32)
+    new_vector = encode_questions([new_question])
 
     # Encode existing questions
-    existing_vectors = embedding_model.encode(list(existing_questions)).astype(np.float32)
+    existing_vectors = encode_questions(list(existing_questions))
 
     # Compute cosine similarity
     similarity_scores = cosine_similarity(new_vector, existing_vectors)[0]
@@ -118,10 +128,10 @@ def is_similar_to_past_quiz_questions(new_question, user_id, threshold=0.65):
         return False  #  If no past questions exist, return False (not similar)
 
     # Generate embeddings for the new question
-    new_vector = embedding_model.encode([new_question]).astype(np.float32).reshape(1, -1)
+    new_vector = encode_questions([new_question]).reshape(1, -1)
 
     # Generate embeddings for past questions (only if questions exist)
-    past_vectors = embedding_model.encode(seen_questions).astype(np.float32) if seen_questions else np.array([])
+    past_vectors = encode_questions(seen_questions) if seen_questions else np.array([])
     
     # Handle case where there are no past vectors
     if past_vectors.shape[0] == 0:
@@ -144,32 +154,32 @@ def is_similar_to_past_quiz_questions(new_question, user_id, threshold=0.65):
 # Method to get IRT-based difficulty distribution for a user
 def get_irt_based_difficulty_distribution(user_id, total_questions):
     """Dynamically adjusts quiz difficulty based on user performance trend and API success rate."""
-    theta = estimate_student_ability(user_id) or 0.0  # Default if None
-    
-    # 🔹 Fetch recent quiz performance (last 3 quizzes)
-    recent_quizzes = list(quizzes_collection.find(
-        {"user_id": ObjectId(user_id)},
-        {"difficulty_distribution": 1, "questions": 1}
-    ).sort("created_at", -1).limit(3))
+    # 🔹 Per-difficulty correctness over the user's last 3 submissions, counted in MongoDB.
+    # Responses store user_id as a string, and (user_id, submitted_at) is indexed.
+    pipeline = [
+        {"$match": {"user_id": str(user_id)}},
+        {"$sort": {"submitted_at": -1}},
+        {"$limit": 3},
+        {"$project": {"_id": 0, "responses.difficulty": 1, "responses.is_correct": 1}},
+        {"$unwind": "$responses"},
+        {
+            "$group": {
+                "_id": {"$ifNull": ["$responses.difficulty", "medium"]},
+                "total": {"$sum": 1},
+                "correct": {"$sum": {"$cond": ["$responses.is_correct", 1, 0]}},
+            }
+        },
+    ]
+    counts = {row["_id"]: row for row in responses_collection.aggregate(pipeline)}
 
     # Track how many correct answers per difficulty in recent quizzes
-    correct_easy = correct_medium = correct_hard = 0
-    total_easy = total_medium = total_hard = 1  # Avoid division by zero
-    
-    for quiz in recent_quizzes:
-        for question in quiz["questions"]:
-            difficulty = question.get("difficulty", "medium")
-            is_correct = question.get("user_answered_correctly", False)
-            
-            if difficulty == "easy":
-                total_easy += 1
-                correct_easy += int(is_correct)
-            elif difficulty == "medium":
-                total_medium += 1
-                correct_medium += int(is_correct)
-            elif difficulty == "hard":
-                total_hard += 1
-                correct_hard += int(is_correct)
+    correct_easy = counts.get("easy", {}).get("correct", 0)
+    correct_medium = counts.get("medium", {}).get("correct", 0)
+    correct_hard = counts.get("hard", {}).get("correct", 0)
+    # Start totals at 1 to avoid division by zero
+    total_easy = 1 + counts.get("easy", {}).get("total", 0)
+    total_medium = 1 + counts.get("medium", {}).get("total", 0)
+    total_hard = 1 + counts.get("hard", {}).get("total", 0)
 
     # Compute accuracy per difficulty level
     easy_accuracy = correct_easy / total_easy
@@ -219,61 +229,46 @@ def get_seen_questions(user_id, limit=1):
     # Fetch only the last `limit` quizzes (sorted by newest first)
     past_quizzes = list(quizzes_collection.find(
         {"user_id": user_id},
-        {"questions.question_text": 1, "_id": 0}
+        {"questions.question_text": 1, "question_refs.question_id": 1, "_id": 0}
     ).sort("created_at", -1).limit(limit))  # Fetch only recent quizzes
 
     logging.info(f"🔍 Found {len(past_quizzes)} recent quizzes for user {user_id}")
 
     for quiz in past_quizzes:
-        for question in quiz.get("questions", []):  # Use `.get()` to avoid KeyErrors
+        for question in hydrate_quiz(quiz, partial=True).get("questions", []):  # Use `.get()` to avoid KeyErrors
             if "question_text" in question:
                 seen_questions.append(question["question_text"])  # Maintain order
 
     return seen_questions
 
-# fetch random questions from database to use it if model hasn't generated proper questions
-def fetch_questions_from_db(count=1):
+# fetch curated questions to use if model hasn't generated proper questions
+def fetch_questions_from_db(count=1, difficulty=None, user_id=None, exclude_texts=()):
     """
-    Fetch random MCQs from the database as a backup when API-generated MCQs fail.
+    Fetch backup MCQs from the curated fallback pool when generated MCQs fall short.
+    Prefers questions at `difficulty`, skips the user's recently seen questions and
+    `exclude_texts`, and tops up from other difficulties if the level runs dry.
     """
     try:
-        pipeline = [{"$sample": {"size": count}}]  # Random sampling in MongoDB
-        questions = list(quizzes_collection.aggregate(pipeline))
-
-        if not questions:
-            return []
-
-        formatted_questions = []
-        for question in questions:
-            for q in question.get("questions", []):  # Get questions from stored quizzes
-                formatted_questions.append({
-                    "question_text": q.get("question_text", "N/A"),
-                    "option1": q.get("option1", "N/A"),
-                    "option2": q.get("option2", "N/A"),
-                    "option3": q.get("option3", "N/A"),
-                    "option4": q.get("option4", "N/A"),
-                    "option5": q.get("option5", "N/A"),
-                    "correct_answer": q.get("correct_answer", "N/A"),
-                    "difficulty": q.get("difficulty", "medium"),
-                })
-                if len(formatted_questions) >= count:
-                    break  # Stop when required count is met
-
-        if not isinstance(formatted_questions, list):
-            logging.error(f" Database returned invalid format: {formatted_questions}")
-            return []
-
-        return formatted_questions
+        excluded = {question_hash(text) for text in exclude_texts}
+        if user_id:
+            excluded |= get_recently_seen_hashes(user_id)
+
+        questions = sample_pool_questions(count, difficulty=difficulty, exclude_hashes=excluded)
+        if difficulty and len(questions) < count:
+            excluded |= {question_hash(q["question_text"]) for q in questions}
+            questions += sample_pool_questions(count - len(questions), exclude_hashes=excluded)
+
+        return questions
 
     except Exception as e:
         logging.error(f" Error fetching backup MCQs from DB: {e}")
         return []
-    
+
 def is_duplicate_faiss(new_question, index, threshold=0.85):
     """Check if a newly generated question is too similar to stored FAISS index questions."""
 
     # Encode the new question into a vector
-    new_vector = embedding_model.encode([new_question]).astype(np.float32)
+    new_vector = encode_questions([new_question])
 
     # Search for the most similar questions in FAISS
     D, I = index.search(new_vector, k=5)  # Retrieve top 5 similar questions
@@ -1,14 +1,63 @@
 import re
 
+# Chat-template tokens the local model sometimes echoes back
+CHAT_TOKENS_RE = re.compile(r"</?s>|</?INST>|><INST>", re.IGNORECASE)
+
+# Leading "1." / "Question 2:" numbering (case-sensitive, as stripped from question text)
+NUMBER_PREFIX_RE = re.compile(r"^(?:Question\s*)?\d+[\.\:\)]\s*")
+
+# Lines that open a new MCQ block and wait for the question on the next line:
+# "Example:", "Easy 1:", "2)", "1:" or "Question 1:"
+SECTION_START_RE = re.compile(
+    r"(?:(?:Example|Easy|Medium|Hard)?\s*\d*[\:\)]|(?:Question\s*)?\d+[\.\:\)])\s*$",
+    re.IGNORECASE,
+)
+
+# One anchored pass per line; alternatives are tried in priority order and the
+# outer named group tells which rule fired.
+LINE_RE = re.compile(
+    r"(?P<inline_question>Question\s*[:\-]?\s*(?P<inline_text>.+))"  # "Question: What is...?"
+    r"|(?P<numbered_question>(?:Question\s*)?\d+[\.\:\)]\s*(?P<numbered_text>.+))"  # "1. What is...?"
+    r"|(?P<heading>###\s*Question\s*\d+)"  # "### Question X"
+    r"|(?P<intro>The .* level multiple-choice .* question .* is[:\-]?\s*(?P<intro_text>.+)?$)"
+    r"|(?P<bullet>\-\s*(?P<bullet_text>.+))"  # "- What is...?"
+    r"|(?P<option>(?P<option_letter>[A-E])[\)\.\:\-]?\s+(?P<option_text>.+))"  # "A) text"
+    r"|(?P<numbered_option>\(?(?P<option_number>[1-5])\)?[\.\:\-]?\s+(?P<numbered_option_text>.+))"
+    r"|(?P<answer>(?:Correct\s*)?Answer\s*[:\-]?\s*\(?(?P<answer_value>[A-E1-5])\)?(?:[\)\.\:\-]?\s+.*)?$)",
+    re.IGNORECASE,
+)
+
+# Used to tell bullet questions and backtracked lines apart from option lines
+OPTION_PREFIX_RE = re.compile(r"^[A-Ea-e][\)\.\:\-]?\s+")
+
+NUMBER_TO_LETTER = {"1": "A", "2": "B", "3": "C", "4": "D", "5": "E"}
+
+
+def _new_mcq(question=None):
+    return {"question": question, "options": {}, "correct_answer": None}
+
+
+def _is_backtrack_candidate(line):
+    """A line an orphaned option block can take its question from."""
+    return not OPTION_PREFIX_RE.match(line) and not line.lower().startswith("correct answer")
+
+
 def extract_mcqs(prompt, raw_output):
+    """
+    Parse raw model output into MCQs of the form
+    {"question": str, "options": {"A".."E": str}, "correct_answer": "A".."E"}.
+    Each line is classified once with precompiled patterns; only complete
+    questions (text, five options and a matching answer) are returned.
+    """
     raw_output = raw_output.replace(prompt, "").strip()
-    raw_output = re.sub(r"</?s>|</?INST>|><INST>", "", raw_output, flags=re.IGNORECASE)
-
-    lines = [line.strip() for line in raw_output.split("\n") if line.strip()]
+    raw_output = CHAT_TOKENS_RE.sub("", raw_output)
 
     mcqs = []
-    current_mcq = {"question": None, "options": {}, "correct_answer": None}
+    current_mcq = _new_mcq()
     waiting_for_question = False
+    # Most recent earlier line an option block without a question falls back to
+    backtrack_line = None
+    previous_line = None
 
     def flush():
         if (
@@ -16,105 +65,81 @@ def extract_mcqs(prompt, raw_output):
             and len(current_mcq["options"]) == 5
             and current_mcq["correct_answer"] in current_mcq["options"]
         ):
-            current_mcq["question"] = re.sub(
-                r"^(?:Question\s*)?\d+[\.\:\)]\s*", "", current_mcq["question"]
-            ).strip(" .:")
+            current_mcq["question"] = NUMBER_PREFIX_RE.sub("", current_mcq["question"]).strip(" .:")
             mcqs.append(current_mcq.copy())
 
-    for i, line in enumerate(lines):
-        # Section headers like "Example:", "Easy 1:", etc.
-        if re.match(r"^(Example|Easy|Medium|Hard)?\s*\d*[\:\)]\s*$", line, re.IGNORECASE) or line.lower() in ["example:", "example"]:
-            flush()
-            current_mcq = {"question": None, "options": {}, "correct_answer": None}
-            waiting_for_question = True
+    for line in raw_output.split("\n"):
+        line = line.strip()
+        if not line:
             continue
 
-        # Lines like "1:" or "Question 1:"
-        if re.match(r"^(?:Question\s*)?\d+[\.\:\)]\s*$", line, re.IGNORECASE):
+        if previous_line is not None and _is_backtrack_candidate(previous_line):
+            backtrack_line = previous_line
+        previous_line = line
+
+        # Section headers like "Example:", "Easy 1:", "1:" or "Question 1:"
+        if SECTION_START_RE.match(line) or line.lower() == "example":
             flush()
-            current_mcq = {"question": None, "options": {}, "correct_answer": None}
+            current_mcq = _new_mcq()
             waiting_for_question = True
             continue
 
         # Waiting for the question after a header
         if waiting_for_question:
-            question = re.sub(r"^(?:Question\s*)?\d+[\.\:\)]\s*", "", line).rstrip(" .:")
-
+            question = NUMBER_PREFIX_RE.sub("", line).rstrip(" .:")
             if question:
                 current_mcq["question"] = question
                 waiting_for_question = False
             continue
 
-        # Inline: "Question 1: What is...?"
-        q_match = re.match(r"^Question\s*[:\-]?\s*(.+)", line, re.IGNORECASE)
-        if not q_match:
-            q_match = re.match(r"^(?:Question\s*)?\d+[\.\:\)]\s*(.+)", line, re.IGNORECASE)
-        if q_match:
-            flush()
-            question = re.sub(r"^(?:Question\s*)?\d+[\.\:\)]\s*", "", q_match.group(1)).rstrip(" .:")
-            current_mcq = {"question": question, "options": {}, "correct_answer": None}
+        match = LINE_RE.match(line)
+        if not match:
             continue
-        
-        # New format: "### Question X"
-        if re.match(r"^###\s*Question\s*\d+", line, re.IGNORECASE):
+        kind = match.lastgroup
+
+        if kind in ("inline_question", "numbered_question"):
             flush()
-            current_mcq = {"question": None, "options": {}, "correct_answer": None}
+            text = match.group("inline_text") or match.group("numbered_text")
+            current_mcq = _new_mcq(NUMBER_PREFIX_RE.sub("", text).rstrip(" .:"))
+
+        elif kind == "heading":
+            flush()
+            current_mcq = _new_mcq()
             waiting_for_question = True
-            continue
-        
-        match_easy_intro = re.match(r"^The .* level multiple-choice .* question .* is[:\-]?\s*(.+)?$", line, re.IGNORECASE)
-        if match_easy_intro:
+
+        elif kind == "intro":
             flush()
-            current_mcq = {"question": None, "options": {}, "correct_answer": None}
-            possible_question = match_easy_intro.group(1)
+            current_mcq = _new_mcq()
+            possible_question = match.group("intro_text")
             if possible_question:
                 current_mcq["question"] = possible_question.strip(" .:")
             else:
                 waiting_for_question = True  # Wait for next line if question is not in same line
-            continue
 
-        # Bullet-style questions: "- What is...?"
-        bullet_q_match = re.match(r"^\-\s*(.+)", line)
-        if bullet_q_match and not current_mcq["question"]:
-            text = bullet_q_match.group(1).strip(" ?:")
-            if not re.match(r"^[A-Ea-e][\)\.\:\-]?\s+", text):
+        elif kind == "bullet":
+            # Bullet-style questions: "- What is...?" (bullets that look like options are ignored)
+            text = match.group("bullet_text").strip(" ?:")
+            if not current_mcq["question"] and not OPTION_PREFIX_RE.match(text):
                 flush()
-                question = re.sub(r"^(?:Question\s*)?\d+[\.\:\)]\s*", "", text).strip(" .:")
-                current_mcq = {"question": question, "options": {}, "correct_answer": None}
-                continue
-
-        # Option A–E: "A) text"
-        opt_match = re.match(r"^([A-Ea-e])[\)\.\:\-]?\s+(.+)", line)
-        if opt_match:
-            if not current_mcq["question"]:
-                # Backtrack to find question
-                for j in range(i - 1, -1, -1):
-                    prev = lines[j]
-                    if not re.match(r"^[A-Ea-e][\)\.\:\-]?\s+", prev) and not prev.lower().startswith("correct answer"):
-                        question = re.sub(r"^(?:Question\s*)?\d+[\.\:\)]\s*", "", prev).strip(" .:")
-                        if question:
-                            current_mcq["question"] = question
-                        break
-            current_mcq["options"][opt_match.group(1).upper()] = opt_match.group(2).strip()
-            continue
+                current_mcq = _new_mcq(NUMBER_PREFIX_RE.sub("", text).strip(" .:"))
 
-        # Numbered options: "(1)", "1.", "1)", etc.
-        num_opt_match = re.match(r"^\(?([1-5])\)?[\.\:\-]?\s+(.+)", line)
-        if num_opt_match:
-            number_to_letter = {"1": "A", "2": "B", "3": "C", "4": "D", "5": "E"}
-            letter = number_to_letter.get(num_opt_match.group(1))
-            if letter:
-                current_mcq["options"][letter] = num_opt_match.group(2).strip()
-            continue
+        elif kind == "option":
+            if not current_mcq["question"] and backtrack_line is not None:
+                question = NUMBER_PREFIX_RE.sub("", backtrack_line).strip(" .:")
+                if question:
+                    current_mcq["question"] = question
+            current_mcq["options"][match.group("option_letter").upper()] = match.group("option_text").strip()
+
+        elif kind == "numbered_option":
+            letter = NUMBER_TO_LETTER[match.group("option_number")]
+            current_mcq["options"][letter] = match.group("numbered_option_text").strip()
 
-        # Answers: "Correct Answer: C" or "Correct Answer: (3)"
-        ans_match = re.match(r"^(?:Correct\s*)?Answer\s*[:\-]?\s*\(?([A-Ea-e1-5])\)?(?:[\)\.\:\-]?\s+.*)?$", line, re.IGNORECASE)
-        if ans_match:
-            val = ans_match.group(1).upper()
-            if val in "12345":
-                val = chr(64 + int(val))  # Convert 1–5 to A–E
+        elif kind == "answer":
+            # Answers: "Correct Answer: C" or "Correct Answer: (3)"
+            val = match.group("answer_value").upper()
+            if val in NUMBER_TO_LETTER:
+                val = NUMBER_TO_LETTER[val]
             current_mcq["correct_answer"] = val
-            continue
 
     flush()
     return mcqs
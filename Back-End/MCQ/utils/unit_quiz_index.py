@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+
+def _as_numpy(vector):
+    """Accept torch tensors or array-likes from the embedding store."""
+    if hasattr(vector, "detach"):
+        vector = vector.detach().cpu().numpy()
+    return np.asarray(vector, dtype=np.float32)
+
+
+class UnitEmbeddingIndex:
+    """
+    Normalized float32 question embeddings grouped by unit.
+
+    Rows are ordered so every unit occupies one contiguous block; `unit_matrix(unit)`
+    is a zero-copy view of that block and `row_ids` maps matrix rows back to
+    `unit_df` positions.
+    """
+
+    def __init__(self, unit_df, embeddings):
+        if len(unit_df) != len(embeddings):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(unit_df)} questions")
+
+        units = unit_df["Assigned_Unit"].to_numpy()
+        self.row_ids = np.argsort(units, kind="stable")
+
+        if isinstance(embeddings, np.ndarray) and embeddings.ndim == 2:
+            # Memory-mapped artifact: the reorder below is the only copy
+            matrix = embeddings[self.row_ids].astype(np.float32, copy=False)
+        else:
+            matrix = np.vstack([_as_numpy(e) for e in embeddings]).astype(np.float32)[self.row_ids]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = np.ascontiguousarray(matrix / np.clip(norms, 1e-12, None))
+
+        self.units = units[self.row_ids]
+        # unit_df position -> matrix row
+        self.positions = np.empty(len(self.row_ids), dtype=np.int64)
+        self.positions[self.row_ids] = np.arange(len(self.row_ids))
+        self.question_texts = pd.Series(unit_df["Question Text"].to_numpy()[self.row_ids])
+        self.unit_slices = {}
+        unit_names, starts, counts = np.unique(self.units, return_index=True, return_counts=True)
+        for unit, start, n in zip(unit_names, starts, counts):
+            self.unit_slices[unit] = slice(int(start), int(start + n))
+
+    def unit_matrix(self, unit):
+        return self.matrix[self.unit_slices[unit]]
+
+    def unit_row_ids(self, unit):
+        return self.row_ids[self.unit_slices[unit]]
+
+    def most_similar(self, target_vectors, count, excluded_units=(), used_texts=(), excluded_row_ids=()):
+        """
+        Return up to `count` unit_df row ids, best first, ranked by max cosine similarity
+        to any target vector. One matrix multiply scores every row; excluded units and
+        used questions (by text or row id) are masked out and the top-k is taken with argpartition.
+        """
+        if count <= 0 or len(target_vectors) == 0:
+            return []
+
+        targets = np.atleast_2d(_as_numpy(target_vectors))
+        targets = targets / np.clip(np.linalg.norm(targets, axis=1, keepdims=True), 1e-12, None)
+        scores = (self.matrix @ targets.T).max(axis=1)
+
+        for unit in excluded_units:
+            if unit in self.unit_slices:
+                scores[self.unit_slices[unit]] = -np.inf
+        if used_texts:
+            scores[self.question_texts.isin(used_texts).to_numpy()] = -np.inf
+        if excluded_row_ids:
+            scores[self.positions[np.fromiter(excluded_row_ids, dtype=np.int64)]] = -np.inf
+
+        available = int(np.isfinite(scores).sum())
+        k = min(count, available)
+        if k == 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self.row_ids[top].tolist()
+
+
+class StratifiedUnitSampler:
+    """
+    Draws unit quiz questions round-robin across strata (topic clusters) without
+    replacement. Row ids per unit and stratum are grouped once at startup; each
+    draw shuffles those small arrays and walks them in a single pass, skipping
+    excluded ids via a boolean mask and repeated question texts.
+    """
+
+    def __init__(self, unit_df, stratum_column="Cluster", fallback_column="Difficulty Level"):
+        # The unit-tagged dataset has no topic clusters yet; stratify by difficulty instead
+        column = stratum_column if stratum_column in unit_df.columns else fallback_column
+        if column not in unit_df.columns:
+            column = None
+
+        self.size = len(unit_df)
+        self.question_texts = unit_df["Question Text"].to_numpy()
+        self.strata = {}
+        group_keys = ["Assigned_Unit", column] if column else ["Assigned_Unit"]
+        for key, row_ids in unit_df.groupby(group_keys, sort=True).indices.items():
+            unit = key[0] if isinstance(key, tuple) else key
+            self.strata.setdefault(unit, []).append(np.asarray(row_ids))
+
+        self.text_to_row_ids = {}
+        for row_id, text in enumerate(self.question_texts):
+            self.text_to_row_ids.setdefault(text, []).append(row_id)
+
+    def has_unit(self, unit):
+        return unit in self.strata
+
+    def row_ids_for_texts(self, texts):
+        return {row_id for text in texts for row_id in self.text_to_row_ids.get(text, ())}
+
+    def with_duplicate_texts(self, row_ids):
+        """Expand row ids to every row sharing one of their question texts."""
+        return self.row_ids_for_texts(
+            {self.question_texts[row_id] for row_id in row_ids if 0 <= row_id < self.size}
+        )
+
+    def sample(self, unit, count, excluded_ids=(), rng=None):
+        """Return up to `count` distinct unit_df row ids for `unit`, spread across strata."""
+        if count <= 0 or unit not in self.strata:
+            return []
+
+        rng = rng or np.random.default_rng()
+        excluded = np.zeros(self.size, dtype=bool)
+        if excluded_ids:
+            excluded[np.fromiter(excluded_ids, dtype=np.int64)] = True
+
+        queues = [rng.permutation(ids) for ids in self.strata[unit]]
+        queues = [queues[i] for i in rng.permutation(len(queues))]
+        positions = [0] * len(queues)
+        taken_texts = set()
+        sampled = []
+
+        active = list(range(len(queues)))
+        while active and len(sampled) < count:
+            still_active = []
+            for q in active:
+                queue = queues[q]
+                # Advance this stratum to its next usable question
+                while positions[q] < len(queue):
+                    row_id = int(queue[positions[q]])
+                    positions[q] += 1
+                    text = self.question_texts[row_id]
+                    if excluded[row_id] or text in taken_texts:
+                        continue
+                    sampled.append(row_id)
+                    taken_texts.add(text)
+                    break
+                if positions[q] < len(queue):
+                    still_active.append(q)
+                if len(sampled) >= count:
+                    break
+            active = still_active
+
+        return sampled
@@ -1,8 +1,17 @@
 import os
-from fastapi import HTTPException, Header
+import copy
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Header, Depends
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from dotenv import load_dotenv
+from database.database import users_collection
+from database.async_database import async_collection
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,6 +24,57 @@ ALGORITHM = os.getenv("ALGORITHM")
 if not SECRET_KEY or not ALGORITHM:
     raise ValueError("SECRET_KEY or ALGORITHM is missing in the .env file!")
 
+# Decoded tokens are reused until they expire (at most TOKEN_CACHE_MAX_SECONDS for tokens without "exp")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_MAX_SECONDS = int(os.getenv("TOKEN_CACHE_MAX_SECONDS", "900"))
+# Only users that exist are cached; keep the TTL short since the documents carry performance data
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "5000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "15"))
+
+
+class TTLCache:
+    """Small thread-safe LRU whose entries carry their own expiry (epoch seconds)."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, expires_at):
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TTLCache(TOKEN_CACHE_SIZE)
+user_cache = TTLCache(USER_CACHE_SIZE)
+
 
 def verify_access_token(token: str):
     try:
@@ -25,7 +85,29 @@ def verify_access_token(token: str):
         return user_id
     except JWTError:
         raise HTTPException(status_code=401, detail="Token expired or invalid")
-    
+
+
+def decode_token_cached(token: str):
+    """User ID of a valid token; the signature is only checked the first time a token is seen."""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    user_id = token_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    expires_at = time.time() + TOKEN_CACHE_MAX_SECONDS
+    if isinstance(payload.get("exp"), (int, float)):
+        expires_at = min(expires_at, payload["exp"])
+    token_cache.put(key, user_id, expires_at)
+    return user_id
+
 
 def get_current_user(authorization: str = Header(None)):
     """Extract token from Authorization header and verify JWT."""
@@ -36,12 +118,77 @@ def get_current_user(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Invalid token format")
 
     token = authorization.replace("Bearer ", "")  # Remove "Bearer " prefix
+    return decode_token_cached(token)  #  Return user ID for dependency injection
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return user_id  #  Return user ID for dependency injection
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
\ No newline at end of file
+
+def load_user(user_id: str):
+    """User document by ID (cached for USER_CACHE_TTL_SECONDS), or None if it does not exist."""
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = users_collection.find_one({"_id": ObjectId(user_id)})
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid user ID.")
+        if user is None:
+            return None
+        user_cache.put(user_id, user, time.time() + USER_CACHE_TTL_SECONDS)
+    #  Handlers may modify what they get back; the cached copy stays intact
+    return copy.deepcopy(user)
+
+
+async def get_current_user_async(authorization: str = Header(None)):
+    """`get_current_user` for async routes; decoding is cached CPU work, so it stays on the event loop."""
+    return get_current_user(authorization)
+
+
+async def load_user_async(user_id: str):
+    """`load_user` for async routes, sharing the same cache."""
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = await async_collection("users").find_one({"_id": ObjectId(user_id)})
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid user ID.")
+        if user is None:
+            return None
+        user_cache.put(user_id, user, time.time() + USER_CACHE_TTL_SECONDS)
+    return copy.deepcopy(user)
+
+
+def invalidate_user(user_id: str):
+    """Drop a cached user document after writing to it."""
+    user_cache.pop(str(user_id))
+
+
+def user_document_dependency(not_found_detail: str = "User not found."):
+    """
+    Dependency for routes with a `user_id` path parameter: 404 if the user does not
+    exist, 403 if the token belongs to someone else, otherwise the user document.
+    """
+    def get_user_document(user_id: str, current_user: str = Depends(get_current_user)):
+        user = load_user(user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        if current_user != user_id:
+            raise HTTPException(status_code=403, detail="Unauthorized access")
+        return user
+
+    return get_user_document
+
+
+def async_user_document_dependency(not_found_detail: str = "User not found."):
+    """`user_document_dependency` for async routes: no threadpool slot for the auth or the user read."""
+    async def get_user_document_async(user_id: str, current_user: str = Depends(get_current_user_async)):
+        user = await load_user_async(user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        if current_user != user_id:
+            raise HTTPException(status_code=403, detail="Unauthorized access")
+        return user
+
+    return get_user_document_async
+
+
+get_user_document = user_document_dependency()
+get_registered_user = user_document_dependency("User not found. Please register before generating a quiz.")
+get_user_document_async = async_user_document_dependency()
@@ -2,6 +2,7 @@ import google.generativeai as genai
 import logging
 import os
 import time
+from utils.metrics import counter, histogram
 
 # Load Gemini API key from env
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")  # Set this in your .env
@@ -9,6 +10,26 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")  # Set this in your .env
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel("gemini-1.5-flash")
 
+# Outcomes: agree, disagree, unparsed (no option letter in the reply), error
+verifier_results_total = counter(
+    "mcq_verifier_results_total", "Gemini answer verifications, by outcome", ["outcome"]
+)
+verifier_seconds = histogram(
+    "mcq_verifier_seconds", "Gemini answer verification latency, including rate-limit backoff", ["outcome"]
+)
+verifier_rate_limited_total = counter(
+    "mcq_verifier_rate_limited_total", "Gemini verifications that hit the rate limit and backed off"
+)
+
+
+def _record(started, predicted_letter, claimed_answer):
+    if predicted_letter is None:
+        outcome = "unparsed"
+    else:
+        outcome = "agree" if predicted_letter == claimed_answer else "disagree"
+    verifier_results_total.inc(outcome=outcome)
+    verifier_seconds.observe(time.perf_counter() - started, outcome=outcome)
+
 
 def verify_mcq_with_llm(question, options, claimed_answer):
     prompt = f"""Question: {question}
@@ -20,6 +41,7 @@ D) {options.get("D", "")}
 E) {options.get("E", "")}
 Which option is correct? Just reply with a single letter: A, B, C, D, or E."""
 
+    started = time.perf_counter()
     try:
         response = model.generate_content(prompt)
         prediction = response.text.strip().upper()
@@ -27,6 +49,7 @@ Which option is correct? Just reply with a single letter: A, B, C, D, or E."""
             prediction[0] if prediction and prediction[0] in options else None
         )
         is_correct = predicted_letter == claimed_answer
+        _record(started, predicted_letter, claimed_answer)
         return is_correct, predicted_letter, claimed_answer
 
     except Exception as e:
@@ -36,6 +59,7 @@ Which option is correct? Just reply with a single letter: A, B, C, D, or E."""
         # Check for 429 error and apply backoff
         if "429" in error_msg or "rate limit" in error_msg.lower():
             logging.warning("⚠ Rate limit hit. Retrying after 60 seconds...")
+            verifier_rate_limited_total.inc()
             time.sleep(60)
             try:
                 # Retry once
@@ -45,10 +69,12 @@ Which option is correct? Just reply with a single letter: A, B, C, D, or E."""
                     prediction[0] if prediction and prediction[0] in options else None
                 )
                 is_correct = predicted_letter == claimed_answer
+                _record(started, predicted_letter, claimed_answer)
                 return is_correct, predicted_letter, claimed_answer
             except Exception as retry_err:
                 logging.error(f"[Gemini Retry] Failed again: {retry_err}")
-                return None, None, claimed_answer
 
-        # Fallback if other type of error
+        # Fallback if other type of error (or the retry failed)
+        verifier_results_total.inc(outcome="error")
+        verifier_seconds.observe(time.perf_counter() - started, outcome="error")
         return None, None, claimed_answer